@@ -5,6 +5,9 @@
 
 set -e  # Exit on error
 
+# Share one Plex library crawl across every step of the pipeline
+export plex_crawl_session="${plex_crawl_session:-full-update-$(date +%s)}"
+
 echo "Starting full update..."
 
 # Run TV station updates
@@ -5,5 +5,6 @@
 # Common flags:
 #   -l, --log-only  Only write to log files, do not print to stdout
 #   --force         Force regeneration, ignoring freshness checks
+#   --full-stats    Enumerate every episode for watched counts instead of using Plex aggregates
 
 python3 src/main.py medialibrary "$@"
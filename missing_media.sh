@@ -5,5 +5,6 @@
 # Common flags:
 #   -l, --log-only  Only write to log files, do not print to stdout
 #   --force         Force regeneration, ignoring freshness checks
+#   --offline       Answer OMDB lookups from the local mirror only (see prefetch.sh)
 
 python3 src/main.py missingmedia "$@"
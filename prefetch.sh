@@ -0,0 +1,9 @@
+#!/bin/bash
+
+# Wrapper to warm the local OMDB mirror within the daily quota.
+# Run it during quiet hours so missing_media.sh and folders.sh can use --offline.
+# All arguments are passed through to the Python entrypoint.
+# Common flags:
+#   -l, --log-only  Only write to log files, do not print to stdout
+
+python3 src/main.py prefetch "$@"
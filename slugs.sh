@@ -1,4 +1,4 @@
 #!/bin/bash
 
-# $1 is the log-only flag (-l)
-python3 src/main.py slugs $1
+# Arguments are passed through, e.g. --format jsonl --output logs/slugs.jsonl --slug-index
+python3 src/main.py slugs "$@"
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""
+Keyed on-disk cache store.
+
+Entries live in an SQLite database at cache/media_cache.db. Each entry is addressed by a
+namespace and a key, holds a JSON value and records its own last_updated time, so:
+- reads only touch the requested entry, making startup cost independent of the cache size
+- every put is committed on its own, so an interrupted run keeps everything fetched so far
+
+The connection is shared between threads and guarded by a lock.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# Store file at project root, next to the other caches
+STORE_FILE = Path(__file__).parent.parent / 'cache' / 'media_cache.db'
+
+_lock = threading.Lock()
+_connection = None
+
+def get_connection():
+	"""
+	Opens the store on first use, creating the entries table if needed.
+	"""
+	global _connection
+	if _connection is None:
+		STORE_FILE.parent.mkdir(exist_ok=True)
+		connection = sqlite3.connect(str(STORE_FILE), check_same_thread=False, isolation_level=None)
+		connection.execute('PRAGMA journal_mode=WAL')
+		connection.execute(
+			'CREATE TABLE IF NOT EXISTS entries ('
+			'namespace TEXT NOT NULL, '
+			'key TEXT NOT NULL, '
+			'value TEXT NOT NULL, '
+			'last_updated REAL NOT NULL, '
+			'PRIMARY KEY (namespace, key))'
+		)
+		_connection = connection
+	return _connection
+
+def get(namespace, key):
+	"""
+	Reads one entry.
+
+	Returns:
+		A (value, last_updated) tuple, or None if the entry does not exist
+	"""
+	with _lock:
+		row = get_connection().execute(
+			'SELECT value, last_updated FROM entries WHERE namespace = ? AND key = ?',
+			(namespace, key)
+		).fetchone()
+	if row is None:
+		return None
+	return json.loads(row[0]), row[1]
+
+def put(namespace, key, value, last_updated=None):
+	"""
+	Writes one entry and commits it immediately. last_updated defaults to now.
+	"""
+	put_many([(namespace, key, value, last_updated)])
+
+def put_many(entries):
+	"""
+	Writes several (namespace, key, value, last_updated) entries in a single transaction.
+	"""
+	now = time.time()
+	rows = [
+		(namespace, key, json.dumps(value, ensure_ascii=False), last_updated if last_updated is not None else now)
+		for namespace, key, value, last_updated in entries
+	]
+	with _lock:
+		connection = get_connection()
+		connection.execute('BEGIN')
+		try:
+			connection.executemany('INSERT OR REPLACE INTO entries (namespace, key, value, last_updated) VALUES (?, ?, ?, ?)', rows)
+			connection.execute('COMMIT')
+		except sqlite3.Error:
+			connection.execute('ROLLBACK')
+			raise
+
+def delete(namespace, key):
+	"""
+	Removes one entry if it exists.
+	"""
+	with _lock:
+		get_connection().execute('DELETE FROM entries WHERE namespace = ? AND key = ?', (namespace, key))
+
+def count(namespace):
+	"""
+	Returns the number of entries in a namespace.
+	"""
+	with _lock:
+		return get_connection().execute('SELECT COUNT(*) FROM entries WHERE namespace = ?', (namespace,)).fetchone()[0]
+
+def close():
+	"""
+	Closes the store. The next call reopens it.
+	"""
+	global _connection
+	with _lock:
+		if _connection is not None:
+			_connection.close()
+			_connection = None
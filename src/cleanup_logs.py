@@ -3,84 +3,81 @@
 """
 Log Cleanup Script
 
-This script cleans up the cron.log file by keeping only the last 3 days of activity.
-It reads the cron.log file, filters entries from the last 3 days, and writes them back.
+This script cleans up the logs directory:
+- runs.jsonl, the structured run log (see run_log.py), is rotated if it is due and rotated run logs
+  older than RUN_LOG_RETENTION_DAYS are deleted as whole files, so nothing is parsed.
+- cron.log holds the untimestamped output cron captures, so it is rotated the same way: each clean
+  renames it to cron-<timestamp>.log, and rotated files last written more than 3 days ago are deleted.
+  Output from the last 3 days is always kept, and no file is read or copied.
 
 Requirements:
 - Python 3.x
 - Required Python packages:
   - os
-  - time
   - pathlib
 
 Usage:
 - Run the script: python cleanup_logs.py
-- The script will keep only the last 3 days of entries in cron.log
+- The script will keep the last 3 days of cron output and the recent run logs
 """
 
 import os
 import time
 from pathlib import Path
-from datetime import datetime, timedelta
+
+import run_log
+
+# Days of cron.log output to keep
+RETENTION_DAYS = 3
+
+CRON_LOG_NAME = 'cron.log'
+ROTATED_CRON_PREFIX = 'cron-'
+
+def rotate_cron_log(logs_dir):
+	"""
+	Renames a non-empty cron.log to cron-<timestamp>.log. Cron opens the log for every job, so the next job starts a new file.
+
+	Returns:
+		The rotated file's path, or None if there was nothing to rotate
+	"""
+	cron_log = logs_dir / CRON_LOG_NAME
+	try:
+		if cron_log.stat().st_size == 0:
+			return None
+	except FileNotFoundError:
+		return None
+
+	rotated = run_log.get_rotated_path(logs_dir, ROTATED_CRON_PREFIX, '.log')
+	os.replace(cron_log, rotated)
+	return rotated
 
 def clean_cron_log(logs_dir):
 	"""
-	Keeps only the last 3 days of entries in cron.log file.
-	For lines without timestamps, uses the last known timestamp or next known timestamp.
+	Rotates cron.log and deletes rotated cron logs last written more than RETENTION_DAYS days ago.
+	A rotated file is only deleted once everything in it is older than the retention window.
+
+	Returns:
+		The number of rotated files deleted
 	"""
-	cron_log = logs_dir / 'cron.log'
-	if not cron_log.exists():
-		return
-
-	# Calculate timestamp for 3 days ago
-	three_days_ago = datetime.now() - timedelta(days=3)
-	
-	# Read all lines from cron.log
-	with open(cron_log, 'r') as f:
-		lines = f.readlines()
-	
-	# First pass: collect all timestamps and their line numbers
-	timestamp_map = {}  # Maps line numbers to their timestamps
-	last_timestamp = None
-	
-	for i, line in enumerate(lines):
-		try:
-			# Extract timestamp from line [YYYY-MM-DD HH:MM:SS]
-			timestamp_str = line[1:20]  # Extract the timestamp portion
-			line_time = datetime.strptime(timestamp_str, '%Y-%m-%d %H:%M:%S')
-			timestamp_map[i] = line_time
-			last_timestamp = line_time
-		except (ValueError, IndexError):
-			# If line doesn't have a timestamp, use the last known timestamp
-			if last_timestamp is not None:
-				timestamp_map[i] = last_timestamp
-	
-	# Second pass: for lines without timestamps, look forward for the next timestamp
-	next_timestamp = None
-	for i in range(len(lines) - 1, -1, -1):
-		if i in timestamp_map:
-			next_timestamp = timestamp_map[i]
-		elif next_timestamp is not None:
-			timestamp_map[i] = next_timestamp
-	
-	# Filter lines based on their timestamps
-	recent_lines = []
-	for i, line in enumerate(lines):
-		line_time = timestamp_map.get(i)
-		if line_time is None or line_time >= three_days_ago:
-			recent_lines.append(line)
-	
-	# Write filtered lines back to cron.log
-	with open(cron_log, 'w') as f:
-		f.writelines(recent_lines)
+	rotate_cron_log(logs_dir)
+	cutoff = time.time() - RETENTION_DAYS * 86400
+	deleted = 0
+	for rotated in logs_dir.glob(f'{ROTATED_CRON_PREFIX}*.log'):
+		if rotated.stat().st_mtime < cutoff:
+			rotated.unlink()
+			deleted += 1
+	return deleted
 
 def run_cleanup_logs(file_dir):
 	"""
-	Main function that orchestrates the cron.log cleanup.
+	Main function that orchestrates the run log and cron.log cleanup.
 	"""
 	# Adjust paths to use file_location
 	logs_dir = file_dir / 'logs'
 	logs_dir.mkdir(exist_ok=True)
-	
-	# Clean up cron.log file
+
+	# Rotate the structured run log and drop old rotations
+	run_log.clean_run_logs(logs_dir)
+
+	# Rotate cron.log and drop old rotations
 	clean_cron_log(logs_dir)
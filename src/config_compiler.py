@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+
+"""
+local_config.json validation and precompilation.
+
+tvstation.py runs once per station, and every run used to re-read local_config.json, re-parse
+the rewatch durations inside its loops and scan the metadata list for every movie and series.
+This module resolves the file once into typed values:
+- rewatch delays as days, both the defaults and each metadata entry's rewatchDelayDays
+- metadata indexed by slug (the first entry for a slug wins, as before)
+- restrictedPlayMonths validated, with lowercase month names and slugs and every month present;
+  build_restricted_slug_matcher() turns them into one pattern of the slugs blocked this month
+- comfortShows and franchises as slugs
+
+The result is written to cache/compiled_config.json together with a hash of local_config.json.
+load_compiled_config() reuses it while the hash matches and recompiles it otherwise, so editing
+the file never needs a manual step.
+
+The "config compile" action also reports problems: invalid durations, invalid months and, when
+cache/slug_index.jsonl exists (see slug_list.py --slug-index), slugs that are not in the library.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+
+from slug_list import load_indexed_slugs
+from utils import create_slug
+
+# Compiled config at project root, next to the other caches
+COMPILED_CONFIG_FILE = Path(__file__).parent.parent / 'cache' / 'compiled_config.json'
+
+# Bump when the compiled layout changes so older compiled files are rebuilt
+COMPILED_CONFIG_VERSION = 1
+
+VALID_MONTHS = (
+	"january", "february", "march", "april", "may", "june",
+	"july", "august", "september", "october", "november", "december"
+)
+
+DURATION_PATTERN = re.compile(r'^(\d+)\s+(day|days|month|months|year|years)$')
+DAYS_PER_UNIT = {'day': 1, 'days': 1, 'month': 30, 'months': 30, 'year': 365, 'years': 365}
+
+# Used when a duration cannot be parsed
+DEFAULT_DURATION_DAYS = 365
+
+DEFAULT_REWATCH_DELAY = {'movies': '180 days', 'tv': '90 days'}
+
+def parse_duration_to_days(duration):
+	"""
+	Parse a duration string or integer into days.
+
+	Args:
+		duration: Either an integer representing days, or a string in the format "{number} {unit}"
+			where unit is one of: day, days, month, months, year, years
+
+	Returns:
+		A tuple of (number of days, None), or (DEFAULT_DURATION_DAYS, error message) if the duration is invalid
+	"""
+	if isinstance(duration, int) and not isinstance(duration, bool):
+		return duration, None
+
+	match = DURATION_PATTERN.match(duration.lower()) if isinstance(duration, str) else None
+	if not match:
+		return DEFAULT_DURATION_DAYS, f"Invalid duration format: {duration}. Using default of 1 year."
+
+	return int(match.group(1)) * DAYS_PER_UNIT[match.group(2)], None
+
+def get_file_hash(path):
+	"""
+	Returns the SHA-256 hash of a file's bytes, or None if it cannot be read.
+	"""
+	try:
+		with open(path, 'rb') as f:
+			return hashlib.sha256(f.read()).hexdigest()
+	except IOError:
+		return None
+
+def compile_restricted_play_months(restricted_play_months, problems):
+	"""
+	Validates restrictedPlayMonths: month names and slugs in lowercase, slugs as lists and every month present.
+	"""
+	compiled_months = {month: [] for month in VALID_MONTHS}
+	if not isinstance(restricted_play_months, dict):
+		problems.append("restrictedPlayMonths must be an object of month names to slug lists")
+		return compiled_months
+
+	for month, slugs in restricted_play_months.items():
+		month_lower = month.lower()
+		if month_lower not in compiled_months:
+			problems.append(f"Invalid month '{month}' in restrictedPlayMonths. Skipping...")
+			continue
+		if not isinstance(slugs, list):
+			problems.append(f"restrictedPlayMonths entry '{month}' is not a list. Skipping...")
+			continue
+		compiled_months[month_lower] = [str(slug).lower() for slug in slugs]
+	return compiled_months
+
+def compile_comfort_slugs(comfort_entries):
+	"""
+	Resolves comfortShows (strings or objects with slug/title) to slugs, deduplicated in order.
+	"""
+	comfort_slugs = []
+	for entry in comfort_entries:
+		if isinstance(entry, str):
+			comfort_slugs.append(entry.strip().lower())
+		elif isinstance(entry, dict):
+			slug_val = entry.get('slug')
+			if slug_val:
+				comfort_slugs.append(str(slug_val).strip().lower())
+				continue
+			title_val = entry.get('title')
+			if title_val:
+				comfort_slugs.append(create_slug(title_val))
+
+	return list(dict.fromkeys(slug for slug in comfort_slugs if slug))
+
+def compile_config(local_config, known_slugs=None):
+	"""
+	Resolves a parsed local_config.json into typed values.
+
+	Args:
+		local_config: The parsed local_config.json
+		known_slugs: (Optional) Every slug in the library, to report config entries that match nothing
+
+	Returns:
+		A tuple of (compiled config, list of problem messages)
+	"""
+	problems = []
+
+	default_rewatch_delay = dict(DEFAULT_REWATCH_DELAY, **local_config.get('defaultRewatchDelay', {}))
+	default_rewatch_delay_days = {}
+	for media_type in ('movies', 'tv'):
+		days, error = parse_duration_to_days(default_rewatch_delay[media_type])
+		if error:
+			problems.append(f"defaultRewatchDelay.{media_type}: {error}")
+		default_rewatch_delay_days[media_type] = days
+
+	metadata = local_config.get('metadata', [])
+	metadata_by_slug = {}
+	for item in metadata:
+		slug = item.get('slug')
+		if not slug or slug in metadata_by_slug:
+			continue
+		compiled_item = dict(item)
+		if 'rewatchDelay' in item:
+			compiled_item['rewatchDelayDays'], error = parse_duration_to_days(item['rewatchDelay'])
+			if error:
+				problems.append(f"metadata '{slug}' rewatchDelay: {error}")
+		metadata_by_slug[slug] = compiled_item
+
+	compiled = {
+		'default_rewatch_delay_days': default_rewatch_delay_days,
+		'excluded_slugs': local_config.get('excludedSlugs', []),
+		'metadata': metadata,
+		'metadata_by_slug': metadata_by_slug,
+		'restricted_play_months': compile_restricted_play_months(local_config.get('restrictedPlayMonths', {}), problems),
+		'tv_show_limit': local_config.get('tvShowLimit', 0),
+		'known_franchises': [create_slug(f) for f in local_config.get('franchises', [])],
+		'comfort_slugs': compile_comfort_slugs(local_config.get('comfortShows', []))
+	}
+
+	if known_slugs is not None:
+		referenced_slugs = (
+			('excludedSlugs', compiled['excluded_slugs']),
+			('comfortShows', compiled['comfort_slugs']),
+			('metadata', list(metadata_by_slug))
+		)
+		for section, slugs in referenced_slugs:
+			for slug in slugs:
+				if slug not in known_slugs:
+					problems.append(f"Unknown slug '{slug}' in {section}")
+
+	return compiled, problems
+
+def build_restricted_slug_matcher(restricted_play_months, current_month):
+	"""
+	Compiles the partial slugs restricted to any month other than the current one into a single pattern,
+	so checking whether a slug is blocked this month is one regex search.
+
+	Args:
+		restricted_play_months: The compiled restrictedPlayMonths (lowercase months and slugs)
+		current_month: The full name of the current month
+
+	Returns:
+		A compiled pattern, or None if nothing is blocked this month
+	"""
+	current_month = current_month.lower()
+	blocked_slugs = {
+		slug
+		for month, slugs in restricted_play_months.items() if month != current_month
+		for slug in slugs if slug
+	}
+	if not blocked_slugs:
+		return None
+	# Longest first so overlapping partial slugs do not shadow each other
+	return re.compile('|'.join(re.escape(slug) for slug in sorted(blocked_slugs, key=len, reverse=True)))
+
+def write_compiled_config(compiled, problems, source_hash):
+	"""
+	Writes the compiled config with the hash of the local_config.json it was compiled from.
+	"""
+	COMPILED_CONFIG_FILE.parent.mkdir(exist_ok=True)
+	tmp_file = COMPILED_CONFIG_FILE.with_suffix('.tmp')
+	try:
+		with open(tmp_file, 'w', encoding='utf-8') as f:
+			json.dump({
+				'version': COMPILED_CONFIG_VERSION,
+				'source_hash': source_hash,
+				'problems': problems,
+				'config': compiled
+			}, f, ensure_ascii=False)
+		os.replace(tmp_file, COMPILED_CONFIG_FILE)
+	except IOError:
+		pass
+
+def read_local_config(local_config_file):
+	"""
+	Reads local_config.json, returning an empty config if it is missing.
+	"""
+	try:
+		with open(local_config_file, 'r') as f:
+			return json.load(f)
+	except FileNotFoundError:
+		return {}
+
+def load_compiled_config(local_config_file):
+	"""
+	Returns the compiled config for local_config.json, compiling it first if the file changed since the last compile.
+
+	Returns:
+		A tuple of (compiled config, list of problem messages)
+	"""
+	source_hash = get_file_hash(local_config_file)
+	try:
+		with open(COMPILED_CONFIG_FILE, 'r', encoding='utf-8') as f:
+			cached = json.load(f)
+		if cached.get('version') == COMPILED_CONFIG_VERSION and cached.get('source_hash') == source_hash:
+			return cached['config'], cached.get('problems', [])
+	except (IOError, json.JSONDecodeError, KeyError):
+		pass
+
+	compiled, problems = compile_config(read_local_config(local_config_file))
+	if source_hash is not None:
+		write_compiled_config(compiled, problems, source_hash)
+	return compiled, problems
+
+def run_config_compile(args, file_location):
+	"""
+	Validates local_config.json, reports its problems and writes the compiled config.
+	"""
+	local_config_file = file_location / 'local_config.json'
+	if not local_config_file.exists():
+		print(f"Error: {local_config_file} not found.")
+		return False
+
+	try:
+		local_config = read_local_config(local_config_file)
+	except json.JSONDecodeError as e:
+		print(f"Error: {local_config_file} is not valid JSON: {e}")
+		return False
+
+	known_slugs = load_indexed_slugs()
+	compiled, problems = compile_config(local_config, known_slugs)
+	write_compiled_config(compiled, problems, get_file_hash(local_config_file))
+
+	if known_slugs is None:
+		print("Slugs were not checked against the library; run the slugs action with --slug-index first.")
+	for problem in problems:
+		print(f"Warning: {problem}")
+	print(f"Compiled {local_config_file} to {COMPILED_CONFIG_FILE} with {len(problems)} problem(s).")
+	return not problems
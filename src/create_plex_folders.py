@@ -15,9 +15,13 @@ Key features:
 - Creates movie folders in format "Movie Title (Year)" 
 - Creates TV show folders in format "Show Title Year-EndYear"
 - Handles exact title matching and fuzzy matching
-- Avoids creating duplicate folders
+- Avoids creating duplicate folders, skipping repeated wishlist lines and titles already on disk
+- Looks titles up concurrently and creates each folder as soon as its lookup completes
 - Debug mode to preview folder creation
-- Rate limiting for API calls
+- Rate limiting and response caching for API calls via omdb_client
+- Offline mode (--offline) that only uses the local OMDB mirror
+- A progress journal (cache/wishlist_journal.jsonl) so an interrupted run resumes where it stopped,
+  retrying only the lines that failed
 
 Required environment variables:
 - omdb_api_key: API key for OMDB API access
@@ -28,13 +32,21 @@ Required files:
 - tv_wishlist.txt: List of TV shows to create folders for
 """
 
+import json
 import os
-import re
 import sys
 from pathlib import Path
-import requests
-import time
-import difflib
+
+import omdb_client
+import title_matcher
+
+# Lowest title_matcher score accepted for a search result that is not an exact match.
+# Movies need a closer match so that sequels and alternate cuts are not picked.
+SHOW_MATCH_CUTOFF = 0.5
+MOVIE_MATCH_CUTOFF = 0.7
+
+# Progress journal at project root, next to the other caches, so an interrupted run can resume
+JOURNAL_FILE = Path(__file__).parent.parent / 'cache' / 'wishlist_journal.jsonl'
 
 # Global variables
 PLEX_GLOBALS = {}
@@ -58,43 +70,48 @@ def set_plex_globals():
 		'TV_SHOWS_PATH': plex_tv_folder,
 		'MOVIES_PATH': plex_movies_folder,
 		'OMDB_API_KEY': os.getenv("omdb_api_key"),
-		'OMDB_API_URL': os.getenv("omdb_api_url"),
 		'MOVIE_WISHLIST_FILE': "movie_wishlist.txt",
 		'TV_WISHLIST_FILE': "tv_wishlist.txt"
 	}
 
-def normalize_title(title: str) -> str:
-	"""Normalize a title by removing non-alphanumeric characters and converting to lowercase"""
-	# Convert to lowercase first
-	title = title.lower()
-	
-	# Replace hyphens and apostrophes with spaces to preserve word boundaries
-	title = title.replace('-', ' ').replace("'", ' ')
-	
-	# Remove all other non-alphanumeric characters
-	normalized = re.sub(r'[^a-z0-9\s]', '', title)
-	
-	# Replace multiple spaces with a single space
-	normalized = re.sub(r'\s+', ' ', normalized)
-	
-	# Trim leading/trailing spaces
-	return normalized.strip()
+def build_folder_index(folder_names) -> dict:
+	"""Index folder names by their normalized title without years, for lookups before any OMDB call"""
+	folder_index = {}
+	for name in folder_names:
+		folder_index.setdefault(title_matcher.normalize_title(title_matcher.strip_years(name)), []).append((name, title_matcher.get_start_year(name)))
+	return folder_index
+
+def find_existing_folder(item: str, folder_index: dict):
+	"""
+	Find the folder a wishlist line refers to, or None.
+	When the line gives a year, only a folder from that year matches, so remakes are still created.
+	"""
+	candidates = folder_index.get(title_matcher.normalize_title(title_matcher.strip_years(item)))
+	if not candidates:
+		return None
+	year = title_matcher.get_start_year(item)
+	for name, folder_year in candidates:
+		if year is None or folder_year == year:
+			return name
+	return None
+
+def get_search_index(search_results: dict) -> dict:
+	"""Prepare the OMDB search results for title matching"""
+	return title_matcher.build_index(
+		title_matcher.prepare_candidate(result["Title"], result.get("Year")) for result in search_results["Search"]
+	)
+
+def get_show_info(show_name: str, messages: list = None) -> dict:
+	"""Get show information from OMDB API, printing progress or appending it to messages"""
+	report = messages.append if messages is not None else print
 
-def get_show_info(show_name: str) -> dict:
-	"""Get show information from OMDB API"""
 	# Strip years from show name (e.g., "Show Name 2006-2013" or "Show Name 2006-" -> "Show Name")
-	clean_show_name = re.sub(r'\s+\d{4}(-\d{4})?(-\s*)?$', '', show_name)
+	clean_show_name = title_matcher.strip_years(show_name)
 	
 	# First search for the show to get the exact title
-	search_params = {
-		"apikey": PLEX_GLOBALS['OMDB_API_KEY'],
-		"s": clean_show_name,
-		"type": "series"
-	}
-	search_response = requests.get(PLEX_GLOBALS['OMDB_API_URL'], params=search_params)
-	search_results = search_response.json()
+	search_results = omdb_client.query({"s": clean_show_name, "type": "series"})
 	
-	print(f"Search results for '{clean_show_name}': {search_results.get('Response', 'Unknown')}")
+	report(f"Search results for '{clean_show_name}': {search_results.get('Response', 'Unknown')}")
 	
 	if search_results.get("Response") == "False" or "Error" in search_results:
 		return search_results
@@ -103,59 +120,47 @@ def get_show_info(show_name: str) -> dict:
 		return {"Response": "False", "Error": "No results found"}
 	
 	# Display all search results
-	print("\nSearch results:")
+	report("\nSearch results:")
 	for i, result in enumerate(search_results["Search"], 1):
-		print(f"{i}. {result['Title']} ({result.get('Year', 'N/A')})")
-	print()
+		report(f"{i}. {result['Title']} ({result.get('Year', 'N/A')})")
+	report("")
 	
-	# Normalize the input title
-	normalized_input = normalize_title(clean_show_name)
+	search_index = get_search_index(search_results)
+	year = title_matcher.get_start_year(show_name)
 	
 	# Try to find an exact match first (ignoring non-alphanumeric characters and case)
-	exact_matches = [result for result in search_results["Search"] 
-	                 if normalize_title(result["Title"]) == normalized_input]
+	exact_match = title_matcher.find_exact_match(clean_show_name, search_index, year)
 	
-	if exact_matches:
+	if exact_match:
 		# Use the exact match
-		exact_title = exact_matches[0]["Title"]
-		print(f"Found exact title match: '{exact_title}'")
+		exact_title = exact_match["title"]
+		report(f"Found exact title match: '{exact_title}'")
 	else:
-		# Use difflib to find the closest match
-		choices = [result["Title"] for result in search_results["Search"]]
-		closest_match = difflib.get_close_matches(clean_show_name, choices, n=1, cutoff=0.6)
+		# Use the title matcher to find the closest match
+		closest_match = title_matcher.find_best_match(clean_show_name, search_index, SHOW_MATCH_CUTOFF, year)
 		
 		if closest_match:
-			exact_title = closest_match[0]
-			print(f"Found closest title match using difflib: '{exact_title}'")
+			exact_title = closest_match["title"]
+			report(f"Found closest title match: '{exact_title}'")
 		else:
 			# Fall back to the first result if no good match found
 			exact_title = search_results["Search"][0]["Title"]
-			print(f"Found closest title match: '{exact_title}'")
+			report(f"Found closest title match: '{exact_title}'")
 	
 	# Now get the show info using the exact title
-	params = {
-		"apikey": PLEX_GLOBALS['OMDB_API_KEY'],
-		"t": exact_title,
-		"type": "series"
-	}
-	response = requests.get(PLEX_GLOBALS['OMDB_API_URL'], params=params)
-	return response.json()
+	return omdb_client.query({"t": exact_title, "type": "series"})
+
+def get_movie_info(movie_name: str, messages: list = None) -> dict:
+	"""Get movie information from OMDB API, printing progress or appending it to messages"""
+	report = messages.append if messages is not None else print
 
-def get_movie_info(movie_name: str) -> dict:
-	"""Get movie information from OMDB API"""
 	# Strip years from movie name (e.g., "Movie Name 2006" -> "Movie Name")
-	clean_movie_name = re.sub(r'\s+\d{4}(-\d{4})?(-\s*)?$', '', movie_name)
+	clean_movie_name = title_matcher.strip_years(movie_name)
 	
 	# First search for the movie to get the exact title
-	search_params = {
-		"apikey": PLEX_GLOBALS['OMDB_API_KEY'],
-		"s": clean_movie_name,
-		"type": "movie"
-	}
-	search_response = requests.get(PLEX_GLOBALS['OMDB_API_URL'], params=search_params)
-	search_results = search_response.json()
+	search_results = omdb_client.query({"s": clean_movie_name, "type": "movie"})
 	
-	print(f"Search results for '{clean_movie_name}': {search_results.get('Response', 'Unknown')}")
+	report(f"Search results for '{clean_movie_name}': {search_results.get('Response', 'Unknown')}")
 	
 	if search_results.get("Response") == "False" or "Error" in search_results:
 		return search_results
@@ -164,75 +169,66 @@ def get_movie_info(movie_name: str) -> dict:
 		return {"Response": "False", "Error": "No results found"}
 	
 	# Display all search results
-	print("\nSearch results:")
+	report("\nSearch results:")
 	for i, result in enumerate(search_results["Search"], 1):
-		print(f"{i}. {result['Title']} ({result.get('Year', 'N/A')})")
-	print()
+		report(f"{i}. {result['Title']} ({result.get('Year', 'N/A')})")
+	report("")
 	
-	# Normalize the input title
-	normalized_input = normalize_title(clean_movie_name)
+	search_index = get_search_index(search_results)
+	year = title_matcher.get_start_year(movie_name)
 	
 	# Try to find an exact match first (ignoring non-alphanumeric characters and case)
-	exact_matches = [result for result in search_results["Search"] 
-					if normalize_title(result["Title"]) == normalized_input]
+	exact_match = title_matcher.find_exact_match(clean_movie_name, search_index, year)
 	
-	if exact_matches:
+	if exact_match:
 		# Use the exact match
-		exact_title = exact_matches[0]["Title"]
-		print(f"Found exact title match: '{exact_title}'")
+		exact_title = exact_match["title"]
+		report(f"Found exact title match: '{exact_title}'")
 	else:
-		# Use difflib to find the closest match, but with a higher cutoff to avoid matching with sequels
-		choices = [result["Title"] for result in search_results["Search"]]
-		closest_match = difflib.get_close_matches(clean_movie_name, choices, n=1, cutoff=0.8)
+		# Use the title matcher to find the closest match, with a higher cutoff to avoid matching with sequels
+		closest_match = title_matcher.find_best_match(clean_movie_name, search_index, MOVIE_MATCH_CUTOFF, year)
 		
 		if closest_match:
 			# Additional check to prevent matching with sequels or alternate cuts
-			matched_title = closest_match[0]
-			normalized_matched = normalize_title(matched_title)
-			normalized_input_words = set(normalized_input.split())
-			normalized_matched_words = set(normalized_matched.split())
-			
-			# Check if the matched title contains additional words that aren't in the input
-			extra_words = normalized_matched_words - normalized_input_words
-			if extra_words and any(word.isdigit() for word in extra_words):
-				# If there are extra words and they contain numbers (like "2" or "3"), don't use this match
-				print(f"Rejecting match '{matched_title}' as it appears to be a sequel or alternate cut")
+			matched_title = closest_match["title"]
+			if title_matcher.is_sequel(title_matcher.prepare_candidate(clean_movie_name), closest_match):
+				# The matched title adds numbers (like "2" or "III") that aren't in the input, don't use this match
+				report(f"Rejecting match '{matched_title}' as it appears to be a sequel or alternate cut")
 				# Try to find a match without sequel numbers
-				non_sequel_matches = [title for title in choices 
-								        if not any(word.isdigit()
-						                for word in set(normalize_title(title).split()) - normalized_input_words)]
-				if non_sequel_matches:
-					exact_title = non_sequel_matches[0]
-					print(f"Found non-sequel match: '{exact_title}'")
+				non_sequel_match = title_matcher.find_best_match(clean_movie_name, search_index, 0, year, reject_sequels=True)
+				if non_sequel_match:
+					exact_title = non_sequel_match["title"]
+					report(f"Found non-sequel match: '{exact_title}'")
 				else:
 					# Fall back to the first result if no good match found
 					exact_title = search_results["Search"][0]["Title"]
-					print(f"Found closest title match: '{exact_title}'")
+					report(f"Found closest title match: '{exact_title}'")
 			else:
 				exact_title = matched_title
-				print(f"Found closest title match using difflib: '{exact_title}'")
+				report(f"Found closest title match: '{exact_title}'")
 		else:
 			# Fall back to the first result if no good match found
 			exact_title = search_results["Search"][0]["Title"]
-			print(f"Found closest title match: '{exact_title}'")
+			report(f"Found closest title match: '{exact_title}'")
 	
 	# Now get the movie info using the exact title
-	params = {
-		"apikey": PLEX_GLOBALS['OMDB_API_KEY'],
-		"t": exact_title,
-		"type": "movie"
-	}
-	response = requests.get(PLEX_GLOBALS['OMDB_API_URL'], params=params)
-	return response.json()
+	return omdb_client.query({"t": exact_title, "type": "movie"})
+
+def get_resolution(messages: list, info: dict = None, folder_name: str = None) -> dict:
+	"""Build the result of a wishlist lookup: the folder name and OMDB match, or the error, with the lookup messages"""
+	if folder_name is None:
+		return {'folder_name': None, 'match': None, 'error': info.get('Error', 'Unknown error'), 'messages': messages}
+	match = {key: info.get(key) for key in ('Title', 'Year', 'imdbID')}
+	return {'folder_name': folder_name, 'match': match, 'error': None, 'messages': messages}
 
-def create_tv_show_folder(show_name: str, debug: bool = False) -> tuple:
-	"""Create a TV show folder in the Plex TV Shows directory or return the folder path if in debug mode"""
-	# Get show info from OMDB
-	show_info = get_show_info(show_name)
+def resolve_tv_show(show_name: str) -> dict:
+	"""Look up a TV show and return its folder name (None if not found) with the lookup messages"""
+	messages = []
+	show_info = get_show_info(show_name, messages)
 	
 	if show_info.get("Response") == "False" or "Error" in show_info:
-		print(f"Error: Could not find TV show '{show_name}': {show_info.get('Error', 'Unknown error')}")
-		return None, False
+		messages.append(f"Error: Could not find TV show '{show_name}': {show_info.get('Error', 'Unknown error')}")
+		return get_resolution(messages, show_info)
 		
 	# Extract show title and years
 	show_title = show_info.get("Title", show_name)
@@ -241,114 +237,178 @@ def create_tv_show_folder(show_name: str, debug: bool = False) -> tuple:
 	
 	# Format folder name
 	if end_year and end_year != "N/A":
-		folder_name = f"{show_title} {start_year}-{end_year}"
-	else:
-		folder_name = f"{show_title} {start_year}"
-		
-	# Create folder path
-	folder_path = PLEX_GLOBALS['TV_SHOWS_PATH'] / folder_name
-	
-	# Check if folder already exists
-	if folder_path.exists():
-		print(f"TV show folder already exists: {folder_path}")
-		return folder_path, True
-		
-	# Create folder or just return the path in debug mode
-	if debug:
-		print(f"[DEBUG] Would create TV show folder: {folder_path}")
-		return folder_path, True
-	else:
-		try:
-			folder_path.mkdir(parents=True, exist_ok=True)
-			print(f"Created TV show folder: {folder_path}")
-			return folder_path, True
-		except Exception as e:
-			print(f"Error creating TV show folder: {e}")
-			return folder_path, False
-
-def create_movie_folder(movie_name: str, debug: bool = False) -> tuple:
-	"""Create a movie folder in the Plex Movies directory or return the folder path if in debug mode"""
-	# Get movie info from OMDB
-	movie_info = get_movie_info(movie_name)
+		return get_resolution(messages, show_info, f"{show_title} {start_year}-{end_year}")
+	return get_resolution(messages, show_info, f"{show_title} {start_year}")
+
+def resolve_movie(movie_name: str) -> dict:
+	"""Look up a movie and return its folder name (None if not found) with the lookup messages"""
+	messages = []
+	movie_info = get_movie_info(movie_name, messages)
 	
 	if movie_info.get("Response") == "False" or "Error" in movie_info:
-		print(f"Error: Could not find movie '{movie_name}': {movie_info.get('Error', 'Unknown error')}")
-		return None, False
+		messages.append(f"Error: Could not find movie '{movie_name}': {movie_info.get('Error', 'Unknown error')}")
+		return get_resolution(messages, movie_info)
 		
 	# Extract movie title and year
 	movie_title = movie_info.get("Title", movie_name)
 	year = movie_info.get("Year", "")
+	return get_resolution(messages, movie_info, f"{movie_title} {year}")
+
+def load_journal() -> dict:
+	"""
+	Load the wishlist journal, keyed by (kind, wishlist line).
+	Later lines of the file override earlier ones, so entries can simply be appended.
+	"""
+	journal = {}
+	if not JOURNAL_FILE.exists():
+		return journal
+	with open(JOURNAL_FILE, 'r', encoding='utf-8') as f:
+		for line in f:
+			try:
+				entry = json.loads(line)
+				journal[(entry['kind'], entry['line'])] = entry
+			except (json.JSONDecodeError, KeyError, TypeError):
+				# A run that died mid-write can leave a partial last line
+				continue
+	return journal
+
+def append_journal_entry(journal: dict, entry: dict):
+	"""Record the outcome of one wishlist line, appending it to the journal file straight away"""
+	journal[(entry['kind'], entry['line'])] = entry
+	JOURNAL_FILE.parent.mkdir(exist_ok=True)
+	with open(JOURNAL_FILE, 'a', encoding='utf-8') as f:
+		f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+def save_journal(journal: dict):
+	"""Rewrite the journal with one line per entry, dropping the superseded ones"""
+	JOURNAL_FILE.parent.mkdir(exist_ok=True)
+	tmp_file = JOURNAL_FILE.with_suffix('.tmp')
+	with open(tmp_file, 'w', encoding='utf-8') as f:
+		for entry in journal.values():
+			f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+	os.replace(tmp_file, JOURNAL_FILE)
+
+def list_folder_names(media_path: Path) -> set:
+	"""List the folder names in a Plex media directory with a single directory scan"""
+	if not media_path.is_dir():
+		return set()
+	with os.scandir(media_path) as entries:
+		return {entry.name for entry in entries if entry.is_dir()}
+
+def create_media_folder(folder_path: Path, label: str, existing_names: set, debug: bool = False) -> bool:
+	"""Create a media folder unless it is already listed, or only report it in debug mode"""
+	if folder_path.name in existing_names:
+		print(f"{label[0].upper()}{label[1:]} folder already exists: {folder_path}")
+		return True
+	existing_names.add(folder_path.name)
 	
-	# Format folder name
-	folder_name = f"{movie_title} {year}"
-		
-	# Create folder path
-	folder_path = PLEX_GLOBALS['MOVIES_PATH'] / folder_name
+	if debug:
+		print(f"[DEBUG] Would create {label} folder: {folder_path}")
+		return True
+	try:
+		folder_path.mkdir(parents=True, exist_ok=True)
+		print(f"Created {label} folder: {folder_path}")
+		return True
+	except Exception as e:
+		print(f"Error creating {label} folder: {e}")
+		return False
+
+def read_wishlist(wishlist_file) -> list:
+	"""Read the non-empty lines of a wishlist file, keeping only the first of any repeated titles"""
+	items = {}
+	with open(wishlist_file, 'r') as f:
+		for line in f:
+			line = ' '.join(line.split())
+			if line:
+				items.setdefault(line.lower(), line)
+	return list(items.values())
+
+def process_wishlist(wishlist_path: Path, label: str, resolve, media_path: Path, journal: dict, debug: bool = False) -> list:
+	"""
+	Create the folders for one wishlist file.
+
+	Lines whose normalized title (years stripped) matches a folder already on disk are skipped
+	without an OMDB lookup, so rerunning an already processed wishlist makes no requests. Lines the
+	journal records as done reuse their recorded folder name. The other lines, including the ones that
+	failed before, are looked up concurrently and each folder is created as soon as its lookup completes.
+	Journal entries for lines no longer in the wishlist, for example edited lines, are dropped.
+	"""
+	# Folder paths in the order they were found, without repeats
+	folders = {}
+	items = read_wishlist(wishlist_path)
+	if not items:
+		print(f"Warning: '{wishlist_path.name}' is empty.")
+		return []
+	
+	# One listing of the media directory answers every existence check
+	existing_names = list_folder_names(media_path)
+	folder_index = build_folder_index(existing_names)
+	
+	# Forget the lines that were edited or removed since the last run
+	for key in [key for key in journal if key[0] == label and key[1] not in items]:
+		del journal[key]
+	
+	pending_items = []
+	for item in items:
+		existing_name = find_existing_folder(item, folder_index)
+		entry = journal.get((label, item))
+		if existing_name:
+			print(f"{label[0].upper()}{label[1:]} folder already exists: {media_path / existing_name}")
+			folders[media_path / existing_name] = None
+		elif entry and entry['status'] == 'done':
+			if create_media_folder(Path(entry['folder']), label, existing_names, debug):
+				folders[Path(entry['folder'])] = None
+		else:
+			pending_items.append(item)
+	print(f"Found {len(items)} {label}s to process, {len(pending_items)} need an OMDB lookup.")
 	
-	# Check if folder already exists
-	if folder_path.exists():
-		print(f"Movie folder already exists: {folder_path}")
-		return folder_path, True
+	for item, resolution in omdb_client.imap_concurrent(resolve, pending_items):
+		print(f"\nProcessing {label}: {item}")
+		for message in resolution['messages']:
+			print(message)
 		
-	# Create folder or just return the path in debug mode
-	if debug:
-		print(f"[DEBUG] Would create movie folder: {folder_path}")
-		return folder_path, True
-	else:
-		try:
-			folder_path.mkdir(parents=True, exist_ok=True)
-			print(f"Created movie folder: {folder_path}")
-			return folder_path, True
-		except Exception as e:
-			print(f"Error creating movie folder: {e}")
-			return folder_path, False
+		folder_path = media_path / resolution['folder_name'] if resolution['folder_name'] else None
+		created = folder_path is not None and create_media_folder(folder_path, label, existing_names, debug)
+		if created:
+			folders[folder_path] = None
+		
+		# Debug runs create nothing, so they leave the journal alone
+		if not debug:
+			append_journal_entry(journal, {
+				'kind': label,
+				'line': item,
+				'status': 'done' if created else 'failed',
+				'match': resolution['match'],
+				'folder': str(folder_path) if created else None,
+				'error': resolution['error']
+			})
+	
+	return list(folders)
 
 def process_wishlist_files(file_location, debug: bool = False) -> tuple:
 	"""Process the movie and TV show wishlist files"""
 	movie_folders = []
 	tv_folders = []
+	journal = load_journal()
 	
 	# Process movie wishlist
-	if os.path.exists(file_location / PLEX_GLOBALS['MOVIE_WISHLIST_FILE']):
+	movie_wishlist = file_location / PLEX_GLOBALS['MOVIE_WISHLIST_FILE']
+	if movie_wishlist.exists():
 		print(f"\nProcessing movie wishlist from '{PLEX_GLOBALS['MOVIE_WISHLIST_FILE']}'...")
-		with open(file_location / PLEX_GLOBALS['MOVIE_WISHLIST_FILE'], 'r') as f:
-			movie_items = [line.strip() for line in f if line.strip()]
-			
-		if not movie_items:
-			print(f"Warning: '{PLEX_GLOBALS['MOVIE_WISHLIST_FILE']}' is empty.")
-		else:
-			print(f"Found {len(movie_items)} movies to process.")
-			
-			for movie_name in movie_items:
-				print(f"\nProcessing movie: {movie_name}")
-				folder_path, success = create_movie_folder(movie_name, debug)
-				if success and folder_path:
-					movie_folders.append(folder_path)
-				# Add a small delay to avoid hitting API rate limits
-				time.sleep(1)
+		movie_folders = process_wishlist(movie_wishlist, "movie", resolve_movie, PLEX_GLOBALS['MOVIES_PATH'], journal, debug)
 	else:
 		print(f"Warning: Movie wishlist file '{PLEX_GLOBALS['MOVIE_WISHLIST_FILE']}' not found.")
 	
 	# Process TV show wishlist
-	if os.path.exists(file_location / PLEX_GLOBALS['TV_WISHLIST_FILE']):
+	tv_wishlist = file_location / PLEX_GLOBALS['TV_WISHLIST_FILE']
+	if tv_wishlist.exists():
 		print(f"\nProcessing TV show wishlist from '{PLEX_GLOBALS['TV_WISHLIST_FILE']}'...")
-		with open(file_location / PLEX_GLOBALS['TV_WISHLIST_FILE'], 'r') as f:
-			tv_items = [line.strip() for line in f if line.strip()]
-			
-		if not tv_items:
-			print(f"Warning: '{PLEX_GLOBALS['TV_WISHLIST_FILE']}' is empty.")
-		else:
-			print(f"Found {len(tv_items)} TV shows to process.")
-			
-			for show_name in tv_items:
-				print(f"\nProcessing TV show: {show_name}")
-				folder_path, success = create_tv_show_folder(show_name, debug)
-				if success and folder_path:
-					tv_folders.append(folder_path)
-				# Add a small delay to avoid hitting API rate limits
-				time.sleep(1)
+		tv_folders = process_wishlist(tv_wishlist, "TV show", resolve_tv_show, PLEX_GLOBALS['TV_SHOWS_PATH'], journal, debug)
 	else:
 		print(f"Warning: TV show wishlist file '{PLEX_GLOBALS['TV_WISHLIST_FILE']}' not found.")
+	
+	if not debug:
+		save_journal(journal)
 		
 	return movie_folders, tv_folders
 
@@ -361,8 +421,12 @@ def run_create_plex_folders(args, file_location):
 	PLEX_GLOBALS['LOG_FILE'] = logs_dir / 'plex_folders.log'
 	
 	
-	# Check if OMDB API key is available
-	if not PLEX_GLOBALS['OMDB_API_KEY']:
+	# Only answer OMDB lookups from the local mirror if requested
+	if getattr(args, 'offline', False):
+		omdb_client.set_offline()
+	
+	# Check if OMDB API key is available; offline runs do not need one
+	if not PLEX_GLOBALS['OMDB_API_KEY'] and not omdb_client.is_offline():
 		print("Error: OMDB API key not found. Please set the 'omdb_api_key' environment variable.")
 		return
 		
@@ -393,4 +457,7 @@ def run_create_plex_folders(args, file_location):
 	else:
 		print("  None")
 		
+	if omdb_client.is_offline() and omdb_client.MIRROR_REPORT['missing']:
+		print(f"\n{len(omdb_client.MIRROR_REPORT['missing'])} lookups were not in the offline OMDB mirror. Run the prefetch action to fetch them.")
+
 	print("\nProcessing complete!")
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+"""
+Local media library scanner.
+
+Walks the TV and movie folders with a single os.scandir pass per directory. Show folders are
+scanned concurrently, and episode numbers are parsed from the filenames during the scan, so
+callers get a compact index of season -> episode numbers instead of filenames.
+
+Recognized episode filenames:
+- "S01E01", "s01.e01", "1x01", "Episode 1", "Ep 01" and a leading "E01"
+- multi-episode files, either listed ("S01E01E02") or as a range ("S01E01-E03", "S01E01-03")
+- absolute numbering without a season marker ("057 - Title", "Show - 057 - Title"), kept apart per
+  show and only used when most of the show's files have no episode marker. Numbers anywhere else in
+  a filename ("Catch 22", "x264") are never taken as episode numbers.
+"Season N" folders and a "Specials" folder (season 0) are indexed.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+# Video files that count as episodes or movies
+VIDEO_EXTENSION = '.mkv'
+
+# Number of show folders scanned at the same time
+MAX_SCAN_WORKERS = 8
+
+SEASON_FOLDER_PATTERN = re.compile(r"Season (\d+)|(Specials)$")
+
+# An episode marker ("S01E01", "1x01", "Episode 1" or "E01") followed by any further episodes of a
+# multi-episode file. "x264" and "x265" are video codecs, not episodes.
+EPISODE_PATTERN = re.compile(
+	r"(?<![a-z0-9])(?:s\d{1,3}[ ._]?e|\d{1,2}x(?!26[45](?![0-9]))|ep(?:isode)?[ ._]*|e)(?P<first>\d{1,4})"
+	r"(?P<more>(?:[ ._-]*e\d{1,4}|-\d{1,4}(?![0-9a-z]))*)",
+	re.IGNORECASE
+)
+EPISODE_PART_PATTERN = re.compile(r"(-?)[ ._]*e?(\d+)", re.IGNORECASE)
+
+# An absolute episode number in a filename without an episode marker: a number between " - "
+# separators ("Show - 057 - Title", "Show - 057"), or else a leading number ("057 - Title")
+ABSOLUTE_SEPARATED_PATTERN = re.compile(r" - (\d{1,4})(?: - |$)")
+ABSOLUTE_LEADING_PATTERN = re.compile(r"^(\d{1,4})(?![0-9a-z])", re.IGNORECASE)
+
+# Ranges wider than this are treated as two separate episodes rather than expanded
+MAX_EPISODE_RANGE = 20
+
+def parse_episode_numbers(stem):
+	"""
+	Extracts the episode numbers from an episode filename without its extension.
+
+	Returns:
+		A tuple of (list of episode numbers, True if they are absolute episode numbers).
+		The list is empty if the filename does not contain an episode number.
+	"""
+	match = EPISODE_PATTERN.search(stem)
+	if match:
+		episode_numbers = [int(match.group('first'))]
+		for is_range, number in EPISODE_PART_PATTERN.findall(match.group('more')):
+			number = int(number)
+			previous = episode_numbers[-1]
+			if is_range and previous < number <= previous + MAX_EPISODE_RANGE:
+				episode_numbers.extend(range(previous + 1, number + 1))
+			else:
+				episode_numbers.append(number)
+		return episode_numbers, False
+
+	# Skip four digit numbers that look like years
+	for pattern in (ABSOLUTE_SEPARATED_PATTERN, ABSOLUTE_LEADING_PATTERN):
+		for number in pattern.findall(stem):
+			if len(number) == 4 and number[:2] in ('19', '20'):
+				continue
+			return [int(number)], True
+	return [], False
+
+def scan_season(season_path):
+	"""
+	Scans a season folder.
+
+	Returns:
+		A tuple of (set of episode numbers, set of absolute episode numbers, number of video files,
+		number of video files with an episode marker)
+	"""
+	episode_numbers = set()
+	absolute_numbers = set()
+	file_count = 0
+	marked_count = 0
+	with os.scandir(season_path) as entries:
+		for entry in entries:
+			if not entry.name.endswith(VIDEO_EXTENSION) or not entry.is_file():
+				continue
+			file_count += 1
+			numbers, is_absolute = parse_episode_numbers(entry.name[:-len(VIDEO_EXTENSION)])
+			(absolute_numbers if is_absolute else episode_numbers).update(numbers)
+			if numbers and not is_absolute:
+				marked_count += 1
+	return episode_numbers, absolute_numbers, file_count, marked_count
+
+def scan_show(show_path):
+	"""
+	Scans a show folder and each of its season folders.
+
+	Returns:
+		The show's entry in the local library index, a dictionary with:
+		- seasons: season numbers as keys and sets of episode numbers as values
+		- absolute: the set of absolute episode numbers found in any season folder, left empty
+		  unless most of the show's video files have no episode marker
+		- fingerprint: a sorted list of [season folder, mtime, video file count]
+	"""
+	show = {'seasons': {}, 'absolute': set(), 'fingerprint': []}
+	file_count = 0
+	marked_count = 0
+	with os.scandir(show_path) as entries:
+		for entry in entries:
+			match = SEASON_FOLDER_PATTERN.match(entry.name)
+			if not match or not entry.is_dir():
+				continue
+			season_num = int(match.group(1)) if match.group(1) else 0
+			episode_numbers, absolute_numbers, season_file_count, season_marked_count = scan_season(entry.path)
+			show['seasons'][season_num] = episode_numbers
+			show['absolute'].update(absolute_numbers)
+			show['fingerprint'].append([entry.name, entry.stat().st_mtime_ns, season_file_count])
+			file_count += season_file_count
+			marked_count += season_marked_count
+	show['fingerprint'].sort()
+
+	# In a show named with episode markers, a bare number is part of a title rather than an absolute episode
+	if marked_count * 2 >= file_count:
+		show['absolute'] = set()
+	return show
+
+def scan_shows(tv_path):
+	"""
+	Scans every show folder in the TV folder, several shows at a time.
+
+	Returns:
+		The local library index, a dictionary with show folder names as keys and scan_show results as values
+	"""
+	with os.scandir(tv_path) as entries:
+		show_entries = [entry for entry in entries if entry.is_dir()]
+
+	with ThreadPoolExecutor(max_workers=MAX_SCAN_WORKERS) as executor:
+		results = list(executor.map(lambda entry: scan_show(entry.path), show_entries))
+
+	return {entry.name: show for entry, show in zip(show_entries, results)}
+
+def scan_movies(movies_path):
+	"""
+	Scans every movie folder in a single pass and reports the folders without a movie file.
+
+	Returns:
+		A list of (movie folder name, issue) tuples, where issue is "Empty folder" or "No MKV files found"
+	"""
+	issues = []
+	with os.scandir(movies_path) as entries:
+		movie_entries = [entry for entry in entries if entry.is_dir()]
+
+	for movie_entry in movie_entries:
+		is_empty = True
+		has_video = False
+		with os.scandir(movie_entry.path) as entries:
+			for entry in entries:
+				is_empty = False
+				if entry.name.lower().endswith(VIDEO_EXTENSION):
+					has_video = True
+					break
+
+		if is_empty:
+			issues.append((movie_entry.name, "Empty folder"))
+		elif not has_video:
+			issues.append((movie_entry.name, "No MKV files found"))
+	return issues
@@ -10,6 +10,8 @@ from slug_list import run_slug_list
 from plex_library_report import run_plex_report
 from cleanup_logs import run_cleanup_logs
 from create_plex_folders import run_create_plex_folders
+from omdb_prefetch import run_omdb_prefetch
+from config_compiler import run_config_compile
 
 # Load environment variables
 load_dotenv()
@@ -23,8 +25,14 @@ def main():
 	parser.add_argument('-f', '--franchise', default='', help='Franchise to filter by (e.g., star-wars, marvel)')
 	parser.add_argument('-r', '--reset', action='store_true', help='Reset watched status for all media (or filtered by franchise/genre)')
 	parser.add_argument('--force', action='store_true', help='Force regeneration of reports, ignoring freshness checks where applicable')
+	parser.add_argument('--offline', action='store_true', help='Answer OMDB lookups from the local mirror only, without network requests')
+	parser.add_argument('--full-stats', action='store_true', help='Count watched episodes by enumerating every episode instead of using Plex aggregates')
+	parser.add_argument('--format', choices=['text', 'jsonl', 'csv'], default='text', help='Output format of the slugs action')
+	parser.add_argument('--output', help='File to write the slugs action output to instead of stdout')
+	parser.add_argument('--slug-index', action='store_true', help='Also write the slug index that tvstation loads (slugs action)')
 	parser.add_argument('action', nargs='?', default='tvstation',
-		help="Action to perform: 'tvstation', 'slugs', 'medialibrary', 'missingmedia', 'clean', 'folders'")
+		help="Action to perform: 'tvstation', 'slugs', 'medialibrary', 'missingmedia', 'clean', 'folders', 'prefetch', 'config'")
+	parser.add_argument('subcommand', nargs='?', help="Subcommand of the config action: 'compile'")
 	parser.add_argument('-d', '--debug', action='store_true', help='Enable debug mode for folder creation')
 
 	args = parser.parse_args()
@@ -34,15 +42,23 @@ def main():
 	if args.action == 'tvstation':
 		run_tvstation(args, file_dir)
 	elif args.action == 'slugs':
-		run_slug_list(file_dir)
+		run_slug_list(args, file_dir)
 	elif args.action == 'medialibrary':
-		run_plex_report(file_dir, force=args.force)
+		run_plex_report(file_dir, force=args.force, full_stats=args.full_stats)
 	elif args.action == 'missingmedia':
 		run_media_library_analyzer(args, file_dir)
 	elif args.action == 'clean':
 		run_cleanup_logs(file_dir)
 	elif args.action == 'folders':
 		run_create_plex_folders(args, file_dir)
+	elif args.action == 'prefetch':
+		run_omdb_prefetch(args, file_dir)
+	elif args.action == 'config':
+		if args.subcommand != 'compile':
+			print(f"Unknown config subcommand: {args.subcommand}")
+			sys.exit(1)
+		if not run_config_compile(args, file_dir):
+			sys.exit(1)
 	else:
 		print(f"Unknown action: {args.action}")
 		sys.exit(1)
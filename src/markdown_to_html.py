@@ -1,13 +1,25 @@
 #!/usr/bin/env python3
 """
 Convert markdown files to HTML for the static website.
+
+The build is incremental. web/build-manifest.json records, for every page, a hash of the markdown
+section it is rendered from and a hash of the HTML that was written. A page is only rendered when
+its section (or this script, which holds the page template) changed, and only written when the new
+HTML differs from the file on disk, so runs without changes write nothing and web/ diffs stay minimal.
 """
 
+import hashlib
+import json
 import re
 import sys
 import os
 from pathlib import Path
 
+MANIFEST_NAME = 'build-manifest.json'
+
+# Bump when the manifest layout changes so every page is rebuilt once
+MANIFEST_VERSION = 1
+
 
 def escape_html(text):
 	"""Escape HTML special characters."""
@@ -38,7 +50,8 @@ def parse_table(lines):
 		return None, lines
 	
 	table_lines = []
-	remaining_lines = lines
+	# Stays empty when the table runs to the end of the document
+	remaining_lines = []
 	
 	# Collect all table rows
 	for i, line in enumerate(lines):
@@ -701,6 +714,93 @@ def split_library_media(md_content):
 	return '\n'.join(movies_content), '\n'.join(tv_content), '\n'.join(movies_wishlist_content), '\n'.join(tv_wishlist_content)
 
 
+def get_hash(data):
+	"""Return the SHA-256 hex digest of a string or bytes."""
+	if isinstance(data, str):
+		data = data.encode('utf-8')
+	return hashlib.sha256(data).hexdigest()
+
+
+def load_manifest(web_dir):
+	"""
+	Load the build manifest, starting a new one if it is missing, from an older layout
+	or from a different version of this script.
+	"""
+	with open(__file__, 'rb') as f:
+		renderer_hash = get_hash(f.read())
+	
+	try:
+		with open(web_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+			manifest = json.load(f)
+		if manifest.get('version') == MANIFEST_VERSION and manifest.get('renderer_hash') == renderer_hash:
+			manifest['changed'] = False
+			return manifest
+	except (IOError, json.JSONDecodeError):
+		pass
+	
+	return {'version': MANIFEST_VERSION, 'renderer_hash': renderer_hash, 'pages': {}, 'changed': True}
+
+
+def save_manifest(web_dir, manifest):
+	"""Write the build manifest if any page entry changed."""
+	if not manifest.pop('changed'):
+		return
+	tmp_file = web_dir / f'{MANIFEST_NAME}.tmp'
+	with open(tmp_file, 'w', encoding='utf-8') as f:
+		json.dump(manifest, f, indent=2, sort_keys=True)
+		f.write('\n')
+	os.replace(tmp_file, web_dir / MANIFEST_NAME)
+
+
+def build_page(web_dir, manifest, filename, title, source, current_page, render=markdown_to_html):
+	"""
+	Render a page from its source section and write it, unless nothing changed.
+	
+	Args:
+		web_dir: The web directory
+		manifest: The build manifest from load_manifest
+		filename: The page file name, e.g. 'movies.html'
+		title: The page title
+		source: The markdown section (or HTML content, see render) the page is built from
+		current_page: The navigation entry to mark active
+		render: Converts the source to the page content; markdown_to_html by default
+	
+	Returns:
+		True if the page file was written
+	"""
+	page_file = web_dir / filename
+	source_hash = get_hash(f'{title}\0{current_page}\0{source}')
+	entry = manifest['pages'].get(filename)
+	
+	# Same section as the last build and the output is still there: skip rendering entirely
+	if entry and entry['source_hash'] == source_hash and page_file.exists():
+		print(f"Unchanged {filename}")
+		return False
+	
+	html_bytes = generate_html_page(title, render(source), current_page).encode('utf-8')
+	output_hash = get_hash(html_bytes)
+	manifest['pages'][filename] = {'source_hash': source_hash, 'output_hash': output_hash}
+	manifest['changed'] = True
+	
+	# Re-rendered but identical to what was last written (or, without an entry, to the file on disk): leave it untouched
+	if page_file.exists():
+		if entry:
+			unchanged = entry['output_hash'] == output_hash
+		else:
+			with open(page_file, 'rb') as f:
+				unchanged = f.read() == html_bytes
+		if unchanged:
+			print(f"Unchanged {filename}")
+			return False
+	
+	tmp_file = page_file.with_name(f'{filename}.tmp')
+	with open(tmp_file, 'wb') as f:
+		f.write(html_bytes)
+	os.replace(tmp_file, page_file)
+	print(f"Generated {filename}")
+	return True
+
+
 def main():
 	"""Main function to convert markdown files to HTML."""
 	script_dir = Path(__file__).parent
@@ -710,6 +810,7 @@ def main():
 	
 	# Create web directory if it doesn't exist
 	web_dir.mkdir(exist_ok=True)
+	manifest = load_manifest(web_dir)
 	
 	# Convert library-media.md into separate movies and TV pages
 	library_media_md = logs_dir / 'library-media.md'
@@ -722,19 +823,11 @@ def main():
 		
 		# Generate movies page
 		if movies_md:
-			html_content = markdown_to_html(movies_md)
-			html_page = generate_html_page('Movies', html_content, 'movies')
-			with open(web_dir / 'movies.html', 'w', encoding='utf-8') as f:
-				f.write(html_page)
-			print(f"Generated movies.html")
+			build_page(web_dir, manifest, 'movies.html', 'Movies', movies_md, 'movies')
 		
 		# Generate TV page
 		if tv_md:
-			html_content = markdown_to_html(tv_md)
-			html_page = generate_html_page('TV Shows', html_content, 'tv')
-			with open(web_dir / 'tv.html', 'w', encoding='utf-8') as f:
-				f.write(html_page)
-			print(f"Generated tv.html")
+			build_page(web_dir, manifest, 'tv.html', 'TV Shows', tv_md, 'tv')
 		
 		# Generate movie wishlist page (always create, even if empty)
 		if not movies_wishlist_md or not movies_wishlist_md.strip():
@@ -747,11 +840,7 @@ This page shows movies that are represented by empty folders (zero file size).
 
 No movies in wishlist - all movies have been downloaded!
 '''
-		html_content = markdown_to_html(movies_wishlist_md)
-		html_page = generate_html_page('Movie Wishlist', html_content, 'movie-wishlist')
-		with open(web_dir / 'movie-wishlist.html', 'w', encoding='utf-8') as f:
-			f.write(html_page)
-		print(f"Generated movie-wishlist.html")
+		build_page(web_dir, manifest, 'movie-wishlist.html', 'Movie Wishlist', movies_wishlist_md, 'movie-wishlist')
 		
 		# Generate TV wishlist page (always create, even if empty)
 		if not tv_wishlist_md or not tv_wishlist_md.strip():
@@ -764,11 +853,7 @@ This page shows TV shows that are represented by empty folders (zero file size).
 
 No TV shows in wishlist - all TV shows have been downloaded!
 '''
-		html_content = markdown_to_html(tv_wishlist_md)
-		html_page = generate_html_page('TV Wishlist', html_content, 'tv-wishlist')
-		with open(web_dir / 'tv-wishlist.html', 'w', encoding='utf-8') as f:
-			f.write(html_page)
-		print(f"Generated tv-wishlist.html")
+		build_page(web_dir, manifest, 'tv-wishlist.html', 'TV Wishlist', tv_wishlist_md, 'tv-wishlist')
 	else:
 		print(f"Warning: {library_media_md} not found", file=sys.stderr)
 	
@@ -777,11 +862,7 @@ No TV shows in wishlist - all TV shows have been downloaded!
 	if missing_episodes_md.exists():
 		with open(missing_episodes_md, 'r', encoding='utf-8') as f:
 			md_content = f.read()
-		html_content = markdown_to_html(md_content)
-		html_page = generate_html_page('Missing Episodes', html_content, 'missing-episodes')
-		with open(web_dir / 'missing-episodes.html', 'w', encoding='utf-8') as f:
-			f.write(html_page)
-		print(f"Generated missing-episodes.html")
+		build_page(web_dir, manifest, 'missing-episodes.html', 'Missing Episodes', md_content, 'missing-episodes')
 	else:
 		print(f"Warning: {missing_episodes_md} not found", file=sys.stderr)
 	
@@ -795,11 +876,9 @@ No TV shows in wishlist - all TV shows have been downloaded!
 	<li><a href="tv-wishlist.html">TV Wishlist</a> - TV shows you want to get (empty folders)</li>
 	<li><a href="missing-episodes.html">Missing Episodes</a> - View missing TV episodes and movies</li>
 </ul>'''
-	index_html = generate_html_page('Home', index_content, 'index')
-	with open(web_dir / 'index.html', 'w', encoding='utf-8') as f:
-		f.write(index_html)
-	print(f"Generated index.html")
-
+	build_page(web_dir, manifest, 'index.html', 'Home', index_content, 'index', render=lambda content: content)
+	
+	save_manifest(web_dir, manifest)
 
 if __name__ == '__main__':
 	main()
@@ -38,13 +38,17 @@ Usage:
 import os
 import re
 from pathlib import Path
-import requests
 from tabulate import tabulate
-from typing import Dict, List, Set, Tuple
+from typing import Dict, List, Optional, Tuple
 import datetime
 import time
 import json
 
+import cache_store
+import library_scanner
+import omdb_client
+import run_log
+
 # Global variables
 log_only = False
 
@@ -52,14 +56,28 @@ log_only = False
 PLEX_GLOBALS = {
 	'TV_SHOWS_PATH': None,
 	'MOVIES_PATH': None,
-	'OMDB_API_KEY': None,
-	'OMDB_API_URL': None,
 	'logs_dir': None,
 	'cache_file': None
 }
 
-# Global cache dictionary
-SHOW_CACHE = {}
+# Cache store namespaces for show info and per-season episode lists
+SHOW_INFO_NAMESPACE = 'show_info'
+SEASON_NAMESPACE = 'season_info'
+
+# Cache store namespace for each show's persisted missing-episode analysis
+ANALYSIS_NAMESPACE = 'show_analysis'
+
+# Bumped whenever analyze_show or the episode parser changes, so stored results are recomputed
+ANALYSIS_VERSION = 4
+
+# Cache TTLs in days. None means the entry never expires.
+SHOW_INFO_TTL_DAYS = 7
+ENDED_SHOW_INFO_TTL_DAYS = 180
+AIRING_SEASON_TTL_DAYS = 3
+DEFAULT_SEASON_TTL_DAYS = 30
+
+# A season whose last episode aired this many days ago is not expected to change
+SETTLED_SEASON_AGE_DAYS = 180
 
 # Global flag to track if OMDB API has returned an error (e.g., rate limit reached)
 OMDB_API_ERROR = False
@@ -77,61 +95,107 @@ def initialize_plex_globals():
 
 	PLEX_GLOBALS['TV_SHOWS_PATH'] = Path(plex_tv_folder)
 	PLEX_GLOBALS['MOVIES_PATH'] = Path(plex_movies_folder)
-	PLEX_GLOBALS['OMDB_API_KEY'] = os.getenv('omdb_api_key')
-	PLEX_GLOBALS['OMDB_API_URL'] = os.getenv('omdb_api_url')
 
 def load_show_cache():
 	"""
-	Load show cache from JSON file.
+	Open the show cache store, importing the legacy media_cache.json on first use.
 	"""
-	global SHOW_CACHE
-	if PLEX_GLOBALS['cache_file'] and PLEX_GLOBALS['cache_file'].exists():
-		try:
-			with open(PLEX_GLOBALS['cache_file'], 'r', encoding='utf-8') as f:
-				SHOW_CACHE = json.load(f)
-			print_message(f"Loaded {len(SHOW_CACHE)} shows from cache")
-		except (json.JSONDecodeError, IOError) as e:
-			print_message(f"Error loading cache: {e}")
-			SHOW_CACHE = {}
-	else:
-		SHOW_CACHE = {}
+	if cache_store.get('meta', 'legacy_show_cache_imported') is None:
+		import_legacy_show_cache()
+	print_message(f"Show cache holds {cache_store.count(SHOW_INFO_NAMESPACE)} shows")
 
-def save_show_cache():
+def import_legacy_show_cache():
 	"""
-	Save show cache to JSON file.
+	Import the legacy monolithic JSON cache into the cache store.
+	
+	Every imported entry keeps the last_updated time of its show. The import runs once,
+	then the JSON file is deleted so a stale copy is not left behind.
 	"""
-	if PLEX_GLOBALS['cache_file']:
+	legacy_cache = {}
+	legacy_file = PLEX_GLOBALS['cache_file']
+	if legacy_file and legacy_file.exists():
 		try:
-			with open(PLEX_GLOBALS['cache_file'], 'w', encoding='utf-8') as f:
-				json.dump(SHOW_CACHE, f, indent=2, ensure_ascii=False)
-			print_message(f"Saved {len(SHOW_CACHE)} shows to cache")
-		except IOError as e:
-			print_message(f"Error saving cache: {e}")
-
-def is_cache_fresh(show_name: str) -> bool:
+			with open(legacy_file, 'r', encoding='utf-8') as f:
+				legacy_cache = json.load(f)
+		except (json.JSONDecodeError, IOError) as e:
+			print_message(f"Error loading legacy cache: {e}")
+	
+	entries = []
+	for cache_key, cached_data in legacy_cache.items():
+		try:
+			last_updated = datetime.datetime.fromisoformat(cached_data['last_updated']).timestamp()
+		except (ValueError, KeyError, TypeError):
+			last_updated = 0
+		if 'show_info' in cached_data:
+			entries.append((SHOW_INFO_NAMESPACE, cache_key, cached_data['show_info'], last_updated))
+		for season_key, episode_info in cached_data.get('episodes', {}).items():
+			entries.append((SEASON_NAMESPACE, f"{cache_key}/{season_key}", episode_info, last_updated))
+	
+	# Record the import in the same transaction so it is never half done
+	entries.append(('meta', 'legacy_show_cache_imported', True, None))
+	cache_store.put_many(entries)
+	if legacy_cache:
+		print_message(f"Imported {len(legacy_cache)} shows from {legacy_file}")
+	if legacy_file and legacy_file.exists():
+		legacy_file.unlink()
+
+def is_cache_fresh(last_updated: float, ttl_days) -> bool:
 	"""
-	Check if cached show information is fresh (less than a week old).
+	Check if a cache entry is still within its TTL.
 	
 	Args:
-		show_name: The name of the show to check
+		last_updated: The time the entry was written, as a Unix timestamp
+		ttl_days: The entry's TTL in days, or None if it never expires
 		
 	Returns:
 		True if cache is fresh, False otherwise
 	"""
-	if show_name not in SHOW_CACHE:
-		return False
+	if ttl_days is None:
+		return True
+	return time.time() - last_updated < ttl_days * 86400
+
+def is_show_ended(show_info: dict) -> bool:
+	"""
+	Check if OMDB show info describes a series that has finished airing.
 	
-	cache_entry = SHOW_CACHE[show_name]
-	if 'last_updated' not in cache_entry:
-		return False
+	OMDB reports ended series with a closed year range such as "2005–2013",
+	and some responses carry an explicit EndYear.
+	"""
+	end_year = show_info.get("EndYear", "")
+	if end_year and end_year != "N/A":
+		return True
+	return re.search(r'\d{4}\s*[–-]\s*\d{4}', show_info.get("Year", "")) is not None
+
+def get_show_info_ttl_days(show_info: dict):
+	"""
+	Get the TTL for cached show info. Ended shows rarely change, so they are kept longer.
+	"""
+	return ENDED_SHOW_INFO_TTL_DAYS if is_show_ended(show_info) else SHOW_INFO_TTL_DAYS
+
+def get_season_ttl_days(episode_info: dict, show_info: dict = None):
+	"""
+	Get the TTL for a cached season episode list based on its air status.
 	
-	try:
-		last_updated = datetime.datetime.fromisoformat(cache_entry['last_updated'])
-		now = datetime.datetime.now()
-		age = now - last_updated
-		return age.days < 30
-	except (ValueError, KeyError):
-		return False
+	Seasons of ended shows, and seasons whose episodes all aired long ago, never expire.
+	Seasons with an episode that aired recently or has not aired yet are refreshed often.
+	Anything else, such as a season without release dates, uses the default TTL.
+	"""
+	if show_info and is_show_ended(show_info):
+		return None
+	
+	released_dates = []
+	for episode in episode_info.get("Episodes", []):
+		try:
+			released_dates.append(datetime.date.fromisoformat(episode.get("Released", "")))
+		except ValueError:
+			continue
+	if not released_dates:
+		return DEFAULT_SEASON_TTL_DAYS
+	
+	days_since_last_release = (datetime.date.today() - max(released_dates)).days
+	if days_since_last_release >= SETTLED_SEASON_AGE_DAYS:
+		return None
+	return AIRING_SEASON_TTL_DAYS
 
 def get_cache_key(show_name: str) -> str:
 	"""
@@ -146,12 +210,34 @@ def get_cache_key(show_name: str) -> str:
 	"""
 	return re.sub(r'\s+\d{4}(-\d{4})?(-\s*)?$', '', show_name)
 
-def get_show_info(show_name: str) -> dict:
+def get_resolved_imdb_id(show_name: str):
+	"""
+	Get the IMDB id a show name was resolved to by an earlier OMDB search.
+	
+	The id is cached per show so that season lookups and show info refreshes can query
+	OMDB by id instead of repeating the title search.
+	
+	Args:
+		show_name: The name of the show
+		
+	Returns:
+		The IMDB id, or None if the show has not been resolved yet
+	"""
+	cached = cache_store.get(SHOW_INFO_NAMESPACE, get_cache_key(show_name))
+	return cached[0].get('imdbID') if cached is not None else None
+
+def get_stale_reason() -> str:
+	"""
+	Describe why a stale cache entry is being used instead of a fresh lookup.
+	"""
+	return "offline" if omdb_client.is_offline() else "API error encountered"
+
+def get_show_info(show_name: str, messages: list = None) -> dict:
 	"""
 	Get show information from OMDB API or cache.
 	
 	This function first checks the cache for fresh show information. If the cache
-	is fresh (less than a week old), it returns the cached data. Otherwise, it
+	is fresh (see get_show_info_ttl_days), it returns the cached data. Otherwise, it
 	queries the OMDB API to get detailed information about a TV show and updates
 	the cache.
 	
@@ -159,108 +245,97 @@ def get_show_info(show_name: str) -> dict:
 	
 	Args:
 		show_name: The name of the show to search for
+		messages: (Optional) A list to append progress messages to instead of printing them
 		
 	Returns:
 		A dictionary containing the show information from OMDB API or cache
 	"""
 	global OMDB_API_ERROR
+	report = messages.append if messages is not None else print_message
 	cache_key = get_cache_key(show_name)
 	
 	# Check cache first
-	if cache_key in SHOW_CACHE:
-		cached_data = SHOW_CACHE[cache_key]
-		if 'show_info' in cached_data:
-			# Use cache if fresh, or if API error has occurred (use stale cache)
-			if is_cache_fresh(cache_key) or OMDB_API_ERROR:
-				if OMDB_API_ERROR:
-					print_message(f"Using cached show info for '{show_name}' (API error encountered, using stale cache)")
-				else:
-					print_message(f"Using cached show info for '{show_name}'")
-				return cached_data['show_info']
+	cached = cache_store.get(SHOW_INFO_NAMESPACE, cache_key)
+	if cached is not None:
+		# Use cache if fresh, or if API error has occurred or we are offline (use stale cache)
+		is_fresh = is_cache_fresh(cached[1], get_show_info_ttl_days(cached[0]))
+		if is_fresh or OMDB_API_ERROR or omdb_client.is_offline():
+			if not is_fresh:
+				report(f"Using cached show info for '{show_name}' ({get_stale_reason()}, using stale cache)")
+			else:
+				report(f"Using cached show info for '{show_name}'")
+			return cached[0]
 	
 	# If API error has occurred, don't make more API calls
 	if OMDB_API_ERROR:
-		if cache_key in SHOW_CACHE and 'show_info' in SHOW_CACHE[cache_key]:
-			print_message(f"Using cached show info for '{show_name}' (API error encountered, using stale cache)")
-			return SHOW_CACHE[cache_key]['show_info']
-		else:
-			return {"Response": "False", "Error": "API error encountered and no cache available"}
+		return {"Response": "False", "Error": "API error encountered and no cache available"}
 	
 	# Cache miss or stale - fetch from API
-	print_message(f"Fetching show info from API for '{show_name}'")
-	clean_show_name = re.sub(r'\s+\d{4}(-\d{4})?(-\s*)?$', '', show_name)
-	
-	# First search for the show to get the exact title
-	search_params = {
-		"apikey": PLEX_GLOBALS['OMDB_API_KEY'],
-		"s": clean_show_name,
-		"type": "series"
-	}
-	search_response = requests.get(PLEX_GLOBALS['OMDB_API_URL'], params=search_params)
-	search_results = search_response.json()
+	report(f"Fetching show info from API for '{show_name}'")
 	
-	print_message(f"Search results for '{clean_show_name}': {search_results.get('Response', 'Unknown')}")
-	
-	if search_results.get("Response") == "False" or "Error" in search_results:
-		# Set error flag to stop future API calls
-		OMDB_API_ERROR = True
-		print_message(f"OMDB API error encountered. Stopping API calls and using cache only: {search_results.get('Error', 'Unknown error')}")
-		# Check if we have stale cache to use
-		if cache_key in SHOW_CACHE and 'show_info' in SHOW_CACHE[cache_key]:
-			print_message(f"Using stale cached show info for '{show_name}' due to API error")
-			return SHOW_CACHE[cache_key]['show_info']
-		return search_results
+	# Resolve the show's IMDB id, searching by title only if it has never been resolved
+	imdb_id = get_resolved_imdb_id(show_name)
+	if imdb_id is None:
+		clean_show_name = re.sub(r'\s+\d{4}(-\d{4})?(-\s*)?$', '', show_name)
+		search_results = omdb_client.query({"s": clean_show_name, "type": "series"})
 		
-	if not search_results.get("Search"):
-		error_result = {"Response": "False", "Error": "No results found"}
-		OMDB_API_ERROR = True
-		print_message(f"OMDB API error encountered. Stopping API calls and using cache only: No results found")
-		# Check if we have stale cache to use
-		if cache_key in SHOW_CACHE and 'show_info' in SHOW_CACHE[cache_key]:
-			print_message(f"Using stale cached show info for '{show_name}' due to API error")
-			return SHOW_CACHE[cache_key]['show_info']
-		return error_result
+		report(f"Search results for '{clean_show_name}': {search_results.get('Response', 'Unknown')}")
 		
-	# Get the first result's exact title
-	exact_title = search_results["Search"][0]["Title"]
-	print_message(f"Found exact title: '{exact_title}'")
-	
-	# Now get the show info using the exact title
-	params = {
-		"apikey": PLEX_GLOBALS['OMDB_API_KEY'],
-		"t": exact_title,
-		"type": "series"
-	}
-	response = requests.get(PLEX_GLOBALS['OMDB_API_URL'], params=params)
-	show_info = response.json()
+		if search_results.get("Response") == "False" or "Error" in search_results:
+			# Only quota, key or network errors stop future API calls; a show that is not found does not
+			if omdb_client.is_fatal_error(search_results):
+				OMDB_API_ERROR = True
+				report(f"OMDB API error encountered. Stopping API calls and using cache only: {search_results.get('Error', 'Unknown error')}")
+			else:
+				report(f"OMDB search failed for '{clean_show_name}': {search_results.get('Error', 'Unknown error')}")
+			# Check if we have stale cache to use
+			if cached is not None:
+				report(f"Using stale cached show info for '{show_name}' due to API error")
+				return cached[0]
+			return search_results
+			
+		if not search_results.get("Search"):
+			error_result = {"Response": "False", "Error": "No results found"}
+			report(f"OMDB search failed for '{clean_show_name}': No results found")
+			# Check if we have stale cache to use
+			if cached is not None:
+				report(f"Using stale cached show info for '{show_name}' due to API error")
+				return cached[0]
+			return error_result
+			
+		# Use the first result's IMDB id so every later lookup refers to the same show
+		imdb_id = search_results["Search"][0]["imdbID"]
+		report(f"Found exact title: '{search_results['Search'][0]['Title']}' ({imdb_id})")
+	
+	# Now get the show info using the IMDB id. An expired entry must be refetched, not answered by the
+	# OMDB response cache, which would hand back a response as old as the entry itself
+	show_info = omdb_client.query({"i": imdb_id, "type": "series"}, max_age_days=0 if cached is not None else None)
 	
 	# Check for errors in the show info response
 	if show_info.get("Response") == "False" or "Error" in show_info:
-		# Set error flag to stop future API calls
-		OMDB_API_ERROR = True
-		print_message(f"OMDB API error encountered. Stopping API calls and using cache only: {show_info.get('Error', 'Unknown error')}")
-		print_message(f"Skipping cache update for '{show_name}' due to error: {show_info.get('Error', 'Unknown error')}")
+		if omdb_client.is_fatal_error(show_info):
+			OMDB_API_ERROR = True
+			report(f"OMDB API error encountered. Stopping API calls and using cache only: {show_info.get('Error', 'Unknown error')}")
+		report(f"Skipping cache update for '{show_name}' due to error: {show_info.get('Error', 'Unknown error')}")
 		# Check if we have stale cache to use
-		if cache_key in SHOW_CACHE and 'show_info' in SHOW_CACHE[cache_key]:
-			print_message(f"Using stale cached show info for '{show_name}' due to API error")
-			return SHOW_CACHE[cache_key]['show_info']
+		if cached is not None:
+			report(f"Using stale cached show info for '{show_name}' due to API error")
+			return cached[0]
 		return show_info
 	
 	# Only update cache if the response is successful (no errors)
 	if show_info.get("Response") == "True" and "Error" not in show_info:
-		if cache_key not in SHOW_CACHE:
-			SHOW_CACHE[cache_key] = {'episodes': {}}
-		SHOW_CACHE[cache_key]['show_info'] = show_info
-		SHOW_CACHE[cache_key]['last_updated'] = datetime.datetime.now().isoformat()
+		show_info.setdefault('imdbID', imdb_id)
+		cache_store.put(SHOW_INFO_NAMESPACE, cache_key, show_info)
 	
 	return show_info
 
-def get_episode_info(show_name: str, season: int) -> dict:
+def get_episode_info(show_name: str, season: int, messages: list = None) -> dict:
 	"""
 	Get episode information for a specific season from OMDB API or cache.
 	
 	This function first checks the cache for fresh episode information. If the cache
-	is fresh (less than a week old), it returns the cached data. Otherwise, it
+	is fresh (see get_season_ttl_days), it returns the cached data. Otherwise, it
 	queries the OMDB API to get detailed information about all episodes in a specific
 	season of a TV show and updates the cache.
 	
@@ -269,233 +344,290 @@ def get_episode_info(show_name: str, season: int) -> dict:
 	Args:
 		show_name: The name of the show
 		season: The season number to get information for
+		messages: (Optional) A list to append progress messages to instead of printing them
 		
 	Returns:
 		A dictionary containing the episode information from OMDB API or cache
 	"""
 	global OMDB_API_ERROR
+	report = messages.append if messages is not None else print_message
 	cache_key = get_cache_key(show_name)
-	season_key = f"season_{season}"
+	season_key = f"{cache_key}/season_{season}"
 	
 	# Check cache first
-	if cache_key in SHOW_CACHE:
-		cached_data = SHOW_CACHE[cache_key]
-		if 'episodes' in cached_data and season_key in cached_data['episodes']:
-			# Use cache if fresh, or if API error has occurred (use stale cache)
-			if is_cache_fresh(cache_key) or OMDB_API_ERROR:
-				if OMDB_API_ERROR:
-					print_message(f"Using cached episode info for '{show_name}' Season {season} (API error encountered, using stale cache)")
-				else:
-					print_message(f"Using cached episode info for '{show_name}' Season {season}")
-				return cached_data['episodes'][season_key]
+	cached = cache_store.get(SEASON_NAMESPACE, season_key)
+	if cached is not None:
+		# Use cache if fresh, or if API error has occurred or we are offline (use stale cache)
+		cached_show = cache_store.get(SHOW_INFO_NAMESPACE, cache_key)
+		ttl_days = get_season_ttl_days(cached[0], cached_show[0] if cached_show is not None else None)
+		is_fresh = is_cache_fresh(cached[1], ttl_days)
+		if is_fresh or OMDB_API_ERROR or omdb_client.is_offline():
+			if not is_fresh:
+				report(f"Using cached episode info for '{show_name}' Season {season} ({get_stale_reason()}, using stale cache)")
+			else:
+				report(f"Using cached episode info for '{show_name}' Season {season}")
+			return cached[0]
 	
 	# If API error has occurred, don't make more API calls
 	if OMDB_API_ERROR:
-		if cache_key in SHOW_CACHE and 'episodes' in SHOW_CACHE[cache_key] and season_key in SHOW_CACHE[cache_key]['episodes']:
-			print_message(f"Using cached episode info for '{show_name}' Season {season} (API error encountered, using stale cache)")
-			return SHOW_CACHE[cache_key]['episodes'][season_key]
-		else:
-			return {"Response": "False", "Error": "API error encountered and no cache available"}
+		return {"Response": "False", "Error": "API error encountered and no cache available"}
 	
 	# Cache miss or stale - fetch from API
-	print_message(f"Fetching episode info from API for '{show_name}' Season {season}")
-	clean_show_name = re.sub(r'\s+\d{4}(-\d{4})?(-\s*)?$', '', show_name)
-	
-	# First search for the show to get the exact title
-	search_params = {
-		"apikey": PLEX_GLOBALS['OMDB_API_KEY'],
-		"s": clean_show_name,
-		"type": "series"
-	}
-	search_response = requests.get(PLEX_GLOBALS['OMDB_API_URL'], params=search_params)
-	search_results = search_response.json()
-	
-	if search_results.get("Response") == "False" or "Error" in search_results:
-		# Set error flag to stop future API calls
-		OMDB_API_ERROR = True
-		print_message(f"OMDB API error encountered. Stopping API calls and using cache only: {search_results.get('Error', 'Unknown error')}")
-		# Check if we have stale cache to use
-		if cache_key in SHOW_CACHE and 'episodes' in SHOW_CACHE[cache_key] and season_key in SHOW_CACHE[cache_key]['episodes']:
-			print_message(f"Using stale cached episode info for '{show_name}' Season {season} due to API error")
-			return SHOW_CACHE[cache_key]['episodes'][season_key]
-		return search_results
-		
-	if not search_results.get("Search"):
-		error_result = {"Response": "False", "Error": "No results found"}
-		OMDB_API_ERROR = True
-		print_message(f"OMDB API error encountered. Stopping API calls and using cache only: No results found")
+	report(f"Fetching episode info from API for '{show_name}' Season {season}")
+	
+	# Look the season up by the show's resolved IMDB id, resolving it first if needed
+	imdb_id = get_resolved_imdb_id(show_name)
+	if imdb_id is None:
+		show_info = get_show_info(show_name, messages)
+		imdb_id = show_info.get('imdbID') if show_info.get("Response") == "True" else None
+	if imdb_id is None:
 		# Check if we have stale cache to use
-		if cache_key in SHOW_CACHE and 'episodes' in SHOW_CACHE[cache_key] and season_key in SHOW_CACHE[cache_key]['episodes']:
-			print_message(f"Using stale cached episode info for '{show_name}' Season {season} due to API error")
-			return SHOW_CACHE[cache_key]['episodes'][season_key]
-		return error_result
-		
-	# Get the first result's exact title
-	exact_title = search_results["Search"][0]["Title"]
-	
-	# Now get the episode info using the exact title
-	params = {
-		"apikey": PLEX_GLOBALS['OMDB_API_KEY'],
-		"t": exact_title,
-		"type": "series",
-		"Season": season
-	}
-	response = requests.get(PLEX_GLOBALS['OMDB_API_URL'], params=params)
-	episode_info = response.json()
+		if cached is not None:
+			report(f"Using stale cached episode info for '{show_name}' Season {season} since the show could not be resolved")
+			return cached[0]
+		return {"Response": "False", "Error": "Could not resolve show"}
+	
+	# An expired season is refetched rather than served from the OMDB response cache (see get_show_info)
+	episode_info = omdb_client.query({"i": imdb_id, "Season": season}, max_age_days=0 if cached is not None else None)
 	
 	# Check for errors in the episode info response
 	if episode_info.get("Response") == "False" or "Error" in episode_info:
-		# Set error flag to stop future API calls
-		OMDB_API_ERROR = True
-		print_message(f"OMDB API error encountered. Stopping API calls and using cache only: {episode_info.get('Error', 'Unknown error')}")
-		print_message(f"Skipping cache update for '{show_name}' Season {season} due to error: {episode_info.get('Error', 'Unknown error')}")
+		if omdb_client.is_fatal_error(episode_info):
+			OMDB_API_ERROR = True
+			report(f"OMDB API error encountered. Stopping API calls and using cache only: {episode_info.get('Error', 'Unknown error')}")
+		report(f"Skipping cache update for '{show_name}' Season {season} due to error: {episode_info.get('Error', 'Unknown error')}")
 		# Check if we have stale cache to use
-		if cache_key in SHOW_CACHE and 'episodes' in SHOW_CACHE[cache_key] and season_key in SHOW_CACHE[cache_key]['episodes']:
-			print_message(f"Using stale cached episode info for '{show_name}' Season {season} due to API error")
-			return SHOW_CACHE[cache_key]['episodes'][season_key]
+		if cached is not None:
+			report(f"Using stale cached episode info for '{show_name}' Season {season} due to API error")
+			return cached[0]
 		return episode_info
 	
 	# Only update cache if the response is successful (no errors)
 	if episode_info.get("Response") == "True" and "Error" not in episode_info:
-		if cache_key not in SHOW_CACHE:
-			SHOW_CACHE[cache_key] = {'episodes': {}}
-		if 'episodes' not in SHOW_CACHE[cache_key]:
-			SHOW_CACHE[cache_key]['episodes'] = {}
-		SHOW_CACHE[cache_key]['episodes'][season_key] = episode_info
-		SHOW_CACHE[cache_key]['last_updated'] = datetime.datetime.now().isoformat()
+		cache_store.put(SEASON_NAMESPACE, season_key, episode_info)
 	
 	return episode_info
 
-def analyze_local_shows() -> Dict[str, Dict[int, Set[str]]]:
+def analyze_local_shows() -> Dict[str, dict]:
 	"""
 	Analyze local TV show folders and return show/season/episode structure.
 	
-	This function scans the local TV show directory and builds a dictionary
-	representing the structure of shows, seasons, and episodes.
+	This function scans the local TV show directory with library_scanner and builds
+	the local library index, parsing episode numbers from the filenames as it goes.
 	
 	Returns:
-		A dictionary with show names as keys and nested dictionaries as values.
-		The nested dictionaries have season numbers as keys and sets of episode filenames as values.
+		A dictionary with show names as keys and dictionaries as values, holding:
+		- seasons: season numbers as keys and sets of episode numbers as values
+		- absolute: the set of absolute episode numbers of the show
+		- fingerprint: a sorted list of [season folder, mtime, episode file count]
 	"""
-	local_shows = {}
-	
 	print_message(f"Looking for TV shows in: {PLEX_GLOBALS['TV_SHOWS_PATH']}")
 	
-	for show_path in PLEX_GLOBALS['TV_SHOWS_PATH'].iterdir():
-		if not show_path.is_dir():
-			continue
-			
-		show_name = show_path.name
-		print_message(f"Found show: {show_name}")
-		local_shows[show_name] = {}
-		
-		for season_path in show_path.iterdir():
-			if not season_path.is_dir():
-				continue
-				
-			# Extract season number from folder name
-			match = re.match(r"Season (\d+)", season_path.name)
-			if not match:
-				continue
-				
-			season_num = int(match.group(1))
-			episodes = set()
-			
-			for episode_file in season_path.glob("*.mkv"):
-				episodes.add(episode_file.stem)
-				
-			local_shows[show_name][season_num] = episodes
-			print_message(f"  Season {season_num}: {len(episodes)} episodes")
-			
+	local_shows = library_scanner.scan_shows(PLEX_GLOBALS['TV_SHOWS_PATH'])
+	
+	season_count = sum(len(local_show['seasons']) for local_show in local_shows.values())
+	print_message(f"Found {len(local_shows)} shows with {season_count} seasons")
 	return local_shows
 
-def analyze_show(show_name: str, local_data: Dict[int, Set[str]]) -> List[Tuple[str, str, str]]:
+def get_compared_seasons(local_show: dict, total_seasons: int) -> List[int]:
+	"""
+	Get the OMDB seasons whose episode lists are compared with the local files.
+	
+	Seasons missing locally are reported as a whole without a lookup, unless the show uses
+	absolute episode numbers, since those files may cover any season.
 	"""
-	Compare local show data with OMDB data and return missing episodes.
+	return [season for season in range(1, total_seasons + 1) if season in local_show['seasons'] or local_show['absolute']]
+
+def get_show_cache_state(show_name: str, local_show: dict) -> Optional[float]:
+	"""
+	Get the state of the OMDB cache entries an analysis of the show depends on.
+	
+	The analysis reads the show info and every season returned by get_compared_seasons.
+	
+	Args:
+		show_name: The name of the show
+		local_show: The show's entry in the local library index
+		
+	Returns:
+		The latest last_updated time of those entries, or None if any of them is
+		missing or has expired, in which case the show must be analyzed again
+	"""
+	cache_key = get_cache_key(show_name)
+	cached_show = cache_store.get(SHOW_INFO_NAMESPACE, cache_key)
+	if cached_show is None or not is_cache_fresh(cached_show[1], get_show_info_ttl_days(cached_show[0])):
+		return None
+	
+	latest_update = cached_show[1]
+	total_seasons = int(cached_show[0].get("totalSeasons", 0))
+	for season in get_compared_seasons(local_show, total_seasons):
+		cached_season = cache_store.get(SEASON_NAMESPACE, f"{cache_key}/season_{season}")
+		if cached_season is None or not is_cache_fresh(cached_season[1], get_season_ttl_days(cached_season[0], cached_show[0])):
+			return None
+		latest_update = max(latest_update, cached_season[1])
+	
+	return latest_update
+
+def get_stored_analysis(show_name: str, local_show: dict) -> Optional[dict]:
+	"""
+	Get the persisted analysis of a show if neither its folder nor its OMDB cache entries changed.
+	
+	Returns:
+		The analyze_show result, or None if the show must be analyzed again
+	"""
+	stored = cache_store.get(ANALYSIS_NAMESPACE, show_name)
+	if stored is None:
+		return None
+	
+	analysis = stored[0]
+	if analysis.get('version') != ANALYSIS_VERSION or analysis['fingerprint'] != local_show['fingerprint']:
+		return None
+	if analysis['cache_updated_at'] != get_show_cache_state(show_name, local_show):
+		return None
+	
+	return analysis['result']
+
+def store_analysis(show_name: str, local_show: dict, result: dict):
+	"""
+	Persist the analysis of a show so later runs can reuse it.
+	Results that contain lookup errors are not stored, so the show is retried next run.
+	"""
+	if result['error'] or any(season['error'] for season in result['seasons']):
+		return
+	
+	cache_updated_at = get_show_cache_state(show_name, local_show)
+	if cache_updated_at is None:
+		return
+	
+	cache_store.put(ANALYSIS_NAMESPACE, show_name, {
+		'version': ANALYSIS_VERSION,
+		'fingerprint': local_show['fingerprint'],
+		'cache_updated_at': cache_updated_at,
+		'result': result
+	})
+
+def analyze_show(show_name: str, local_show: dict, messages: list = None) -> dict:
+	"""
+	Compare local show data with OMDB data and return the missing episodes of every season.
 	
 	This function compares the local TV show data with information from the OMDB API
-	to identify missing episodes and seasons.
+	to identify missing episodes and seasons. An episode counts as present if its number
+	was found in its season folder, or if its absolute number (its position counted
+	across all seasons) was found anywhere in the show.
 	
 	Args:
 		show_name: The name of the show to analyze
-		local_data: A dictionary with season numbers as keys and sets of episode filenames as values
+		local_show: The show's entry in the local library index
+		messages: (Optional) A list to append progress messages to instead of printing them
 		
 	Returns:
-		A list of tuples containing (show_name, season, missing_item) for each missing episode or season
+		A dictionary with the show name, an error message if the show could not be found (otherwise None),
+		and a list of per-season dictionaries in season order, each holding:
+		- season: the season number
+		- total: the number of episodes OMDB lists for the season (0 if unknown)
+		- present: the number of those episodes found locally
+		- missing: a list of [episode number, episode title] for the missing episodes
+		- entire_missing: True if the season has no local folder
+		- error: an error message if the season's episodes could not be looked up, otherwise None
 	"""
-	missing_items = []
+	report = messages.append if messages is not None else print_message
+	result = {'show': show_name, 'error': None, 'seasons': []}
 	
 	# Get show info from OMDB
-	show_info = get_show_info(show_name)
-	print_message(f"OMDB search for '{show_name}' returned: {show_info.get('Response', 'Unknown')}")
+	show_info = get_show_info(show_name, messages)
+	report(f"OMDB search for '{show_name}' returned: {show_info.get('Response', 'Unknown')}")
 	
-	if "Error" in show_info:
-		missing_items.append((show_name, "Error", f"Could not find show: {show_info['Error']}"))
-		return missing_items
-		
-	if show_info.get("Response") == "False":
-		missing_items.append((show_name, "Error", f"Could not find show: {show_info.get('Error', 'Unknown error')}"))
-		return missing_items
+	if "Error" in show_info or show_info.get("Response") == "False":
+		result['error'] = show_info.get('Error', 'Unknown error')
+		return result
 		
 	total_seasons = int(show_info.get("totalSeasons", 0))
-	print_message(f"  Total seasons according to OMDB: {total_seasons}")
+	report(f"  Total seasons according to OMDB: {total_seasons}")
+	
+	compared_seasons = get_compared_seasons(local_show, total_seasons)
+	absolute_offset = 0
 	
 	# Check for missing seasons
 	for season in range(1, total_seasons + 1):
-		if season not in local_data:
-			missing_items.append((show_name, f"Season {season:02d}", "Entire season missing"))
+		season_result = {'season': season, 'total': 0, 'present': 0, 'missing': [], 'entire_missing': False, 'error': None}
+		result['seasons'].append(season_result)
+		
+		if season not in compared_seasons:
+			season_result['entire_missing'] = True
 			continue
 			
 		# Get episode info for this season
-		episode_info = get_episode_info(show_name, season)
-		print_message(f"  Season {season} info: {episode_info.get('Response', 'Unknown')}")
+		episode_info = get_episode_info(show_name, season, messages)
+		report(f"  Season {season} info: {episode_info.get('Response', 'Unknown')}")
 		
-		if "Error" in episode_info:
-			missing_items.append((show_name, f"Season {season:02d}", f"Could not get episode info: {episode_info['Error']}"))
-			continue
-			
-		if episode_info.get("Response") == "False":
-			missing_items.append((show_name, f"Season {season:02d}", f"Could not get episode info: {episode_info.get('Error', 'Unknown error')}"))
+		if "Error" in episode_info or episode_info.get("Response") == "False":
+			season_result['error'] = episode_info.get('Error', 'Unknown error')
 			continue
 			
 		# Check for missing episodes
-		local_episodes = local_data[season]
-		print_message(f"  Local episodes in season {season}: {len(local_episodes)}")
-		print_message(f"  OMDB episodes in season {season}: {len(episode_info.get('Episodes', []))}")
+		local_episodes = local_show['seasons'].get(season, set())
+		omdb_episodes = episode_info.get("Episodes", [])
+		report(f"  Local episodes in season {season}: {len(local_episodes)}")
+		report(f"  OMDB episodes in season {season}: {len(omdb_episodes)}")
 		
-		# Create a mapping of episode numbers to their filenames
-		local_episode_map = {}
-		for ep in local_episodes:
-			# Try to extract episode number from filename using multiple patterns
-			# Pattern 1: "E01" format
-			match = re.match(r"E(\d+)", ep)
-			if match:
-				ep_num = int(match.group(1))
-				local_episode_map[ep_num] = ep
-				continue
-				
-			# Pattern 2: "s01e01" format
-			match = re.search(r"s\d+e(\d+)", ep.lower())
-			if match:
-				ep_num = int(match.group(1))
-				local_episode_map[ep_num] = ep
-				continue
-				
-			# Pattern 3: Just look for any number after "e" or "E"
-			match = re.search(r"[eE](\d+)", ep)
-			if match:
-				ep_num = int(match.group(1))
-				local_episode_map[ep_num] = ep
-		
-		for episode in episode_info.get("Episodes", []):
+		season_result['total'] = len(omdb_episodes)
+		for episode in omdb_episodes:
 			episode_num = int(episode["Episode"])
-			episode_name = f"E{episode_num:02d} - {episode['Title']}"
 			
 			# Check if we have this episode number in our local files
-			if episode_num not in local_episode_map:
-				missing_items.append((show_name, f"Season {season:02d}", episode_name))
+			if episode_num not in local_episodes and absolute_offset + episode_num not in local_show['absolute']:
+				season_result['missing'].append([episode_num, episode['Title']])
+		
+		season_result['present'] = season_result['total'] - len(season_result['missing'])
+		absolute_offset += len(omdb_episodes)
 				
-	return missing_items
+	return result
+
+def get_missing_rows(result: dict) -> List[Tuple[str, str, str]]:
+	"""
+	Get the report table rows (show, season, missing item) for an analyze_show result.
+	"""
+	show_name = result['show']
+	if result['error']:
+		return [(show_name, "Error", f"Could not find show: {result['error']}")]
+	
+	rows = []
+	for season_result in result['seasons']:
+		season_label = f"Season {season_result['season']:02d}"
+		if season_result['entire_missing']:
+			rows.append((show_name, season_label, "Entire season missing"))
+		elif season_result['error']:
+			rows.append((show_name, season_label, f"Could not get episode info: {season_result['error']}"))
+		else:
+			rows.extend((show_name, season_label, f"E{episode_num:02d} - {title}") for episode_num, title in season_result['missing'])
+	return rows
+
+def summarize_show(result: dict) -> List[str]:
+	"""
+	Get the summary line parts, one per season with missing content, for an analyze_show result.
+	"""
+	parts = []
+	for season_result in result['seasons']:
+		season_num = season_result['season']
+		if season_result['entire_missing']:
+			parts.append(f"Season {season_num}")
+			continue
+		
+		episode_nums = sorted(episode_num for episode_num, _ in season_result['missing'])
+		if not episode_nums:
+			continue
+		
+		total_episodes = season_result['total']
+		# If we have no episode info or all episodes are missing
+		if total_episodes == 0 or len(episode_nums) >= total_episodes:
+			parts.append(f"Season {season_num}")
+		# If more than half of the episodes are missing
+		elif len(episode_nums) > total_episodes / 2:
+			parts.append(f"Season {season_num} (most episodes missing)")
+		elif len(episode_nums) == 1:
+			parts.append(f"Season {season_num} missing episode {episode_nums[0]}")
+		else:
+			parts.append(f"Season {season_num} missing episodes {', '.join(map(str, episode_nums))}")
+	return parts
 
 def analyze_local_movies() -> List[Tuple[str, str, str]]:
 	"""
@@ -507,61 +639,21 @@ def analyze_local_movies() -> List[Tuple[str, str, str]]:
 	Returns:
 		A list of tuples containing (movie_name, "Movie", issue_description) for each problematic movie folder
 	"""
-	missing_items = []
-	
 	print_message(f"Looking for movies in: {PLEX_GLOBALS['MOVIES_PATH']}")
 	
-	for movie_path in PLEX_GLOBALS['MOVIES_PATH'].iterdir():
-		if not movie_path.is_dir():
-			continue
-			
-		movie_name = movie_path.name
-		print_message(f"Found movie: {movie_name}")
-		
-		# Check if folder is empty
-		if not any(movie_path.iterdir()):
-			missing_items.append((movie_name, "Movie", "Empty folder"))
-			continue
-			
-		# Check if folder only contains non-MKV files
-		has_mkv = False
-		for file in movie_path.iterdir():
-			if file.suffix.lower() == '.mkv':
-				has_mkv = True
-				break
-				
-		if not has_mkv:
-			missing_items.append((movie_name, "Movie", "No MKV files found"))
-			
-	return missing_items
+	return [(movie_name, "Movie", issue) for movie_name, issue in library_scanner.scan_movies(PLEX_GLOBALS['MOVIES_PATH'])]
 
 def print_message(message):
 	if log_only:
 		return
 	print(message)
 
-def log_cron_message(script_name, args=None):
-	"""
-	Log a basic message to cron.log with script name and arguments.
-	This is used for cron job logging.
+def setup_analyzer(args, file_location) -> Path:
 	"""
-	timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-	cron_log = PLEX_GLOBALS['logs_dir'] / "cron.log"
-	
-	# Only include non-None arguments that were actually passed
-	args_str = ' '.join(f"{k}={v}" for k, v in args.items() if v is not None) if args else ''
-	message = f"[{timestamp}] Running {script_name} with args: {args_str}"
+	Initialize the globals, paths and show cache used by the analyzer.
 	
-	with open(cron_log, 'a') as f:
-		f.write(f"{message}\n")
-
-def run_media_library_analyzer(args, file_location):
-	"""
-	Main function that orchestrates the media library analysis.
-	
-	Arguments:
-		--log-only, -l: If specified, only log the script execution without performing analysis
-		--force: If specified, ignore freshness checks and always regenerate reports
+	Returns:
+		The logs directory
 	"""
 	# Initialize PLEX_GLOBALS
 	initialize_plex_globals()
@@ -570,6 +662,10 @@ def run_media_library_analyzer(args, file_location):
 	global log_only
 	log_only = args.log_only
 
+	# Only answer OMDB lookups from the local mirror if requested
+	if getattr(args, "offline", False):
+		omdb_client.set_offline()
+
 	# Adjust paths to use file_location
 	logs_dir = file_location / 'logs'
 	logs_dir.mkdir(exist_ok=True)
@@ -583,131 +679,179 @@ def run_media_library_analyzer(args, file_location):
 	
 	# Load existing cache
 	load_show_cache()
+	return logs_dir
+
+def get_show_mirror_entries(show_name: str, local_show: dict) -> List[Tuple[str, str]]:
+	"""
+	Check the cached OMDB entries an analysis of the show needs.
+	
+	Returns:
+		A list of (entry description, "missing" or "stale") for every entry that is not fresh.
+		Seasons are only listed once the show info is cached, since it tells which seasons exist.
+	"""
+	cache_key = get_cache_key(show_name)
+	cached_show = cache_store.get(SHOW_INFO_NAMESPACE, cache_key)
+	if cached_show is None:
+		return [(f"{show_name} - show info", "missing")]
+	
+	entries = []
+	if not is_cache_fresh(cached_show[1], get_show_info_ttl_days(cached_show[0])):
+		entries.append((f"{show_name} - show info", "stale"))
+	
+	total_seasons = int(cached_show[0].get("totalSeasons", 0))
+	for season in get_compared_seasons(local_show, total_seasons):
+		cached_season = cache_store.get(SEASON_NAMESPACE, f"{cache_key}/season_{season}")
+		if cached_season is None:
+			entries.append((f"{show_name} - season {season}", "missing"))
+		elif not is_cache_fresh(cached_season[1], get_season_ttl_days(cached_season[0], cached_show[0])):
+			entries.append((f"{show_name} - season {season}", "stale"))
+	return entries
+
+def get_mirror_status(local_shows: Dict[str, dict]) -> Dict[str, List[str]]:
+	"""
+	Check which cached OMDB entries needed to analyze the local shows are missing or stale.
+	
+	Returns:
+		A dictionary with "missing" and "stale" lists of entry descriptions
+	"""
+	status = {'missing': [], 'stale': []}
+	for show_name, local_show in local_shows.items():
+		for entry, state in get_show_mirror_entries(show_name, local_show):
+			status[state].append(entry)
+	return status
+
+def prefetch_show(show_name: str, local_show: dict, messages: list = None):
+	"""
+	Fetch every OMDB entry an analysis of the show needs that is missing or stale.
+	Fresh entries are served from the cache, so they cost no requests.
+	Progress is appended to messages if given, otherwise printed.
+	"""
+	show_info = get_show_info(show_name, messages)
+	if "Error" in show_info or show_info.get("Response") == "False":
+		return
+	
+	for season in get_compared_seasons(local_show, int(show_info.get("totalSeasons", 0))):
+		if OMDB_API_ERROR:
+			return
+		get_episode_info(show_name, season, messages)
+
+def write_mirror_report(status: Dict[str, List[str]]):
+	"""
+	Write the missing and stale OMDB mirror entries to omdb-mirror.md in the logs directory.
+	"""
+	report_file = PLEX_GLOBALS['logs_dir'] / "omdb-mirror.md"
+	with open(report_file, "w") as f:
+		f.write("# OMDB Mirror Status\n")
+		for state in ('missing', 'stale'):
+			f.write(f"\n## {state.capitalize()} entries ({len(status[state])})\n\n")
+			f.writelines(f"* {entry}\n" for entry in sorted(status[state]))
+		f.write(f"\n---\nLast updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+	
+	print_message(f"OMDB mirror: {len(status['missing'])} missing and {len(status['stale'])} stale entries, see {report_file}")
+
+def run_media_library_analyzer(args, file_location):
+	"""
+	Main function that orchestrates the media library analysis.
+	
+	Arguments:
+		--log-only, -l: If specified, only log the script execution without performing analysis
+		--force: If specified, ignore freshness checks and always regenerate reports
+		--offline: If specified, answer every OMDB lookup from the local mirror only
+	"""
+	logs_dir = setup_analyzer(args, file_location)
+	run = run_log.start_run(logs_dir, 'media_library_analyzer', vars(args))
 
-	# Log script execution to cron.log
-	log_cron_message("media_library_analyzer.py", vars(args))
+	# Use a fixed filename that will be overwritten each time
+	output_file = logs_dir / "missing-episodes.md"
 
+	# Check if file was updated less than a day ago before doing any work
+	force = getattr(args, "force", False)
+	if output_file.exists() and not force:
+		file_mtime = datetime.datetime.fromtimestamp(output_file.stat().st_mtime)
+		time_diff = datetime.datetime.now() - file_mtime
+		if time_diff.total_seconds() < 86400:  # 86400 seconds = 1 day
+			message = f"{output_file} was updated less than a day ago ({time_diff.total_seconds()/3600:.1f} hours ago)"
+			print_message(f"\nSkipping update: {message}")
+			run_log.finish_run(run, 'skipped', message)
+			return
+
+	try:
+		write_missing_media_report(run, output_file, force)
+	except Exception as e:
+		run_log.finish_run(run, 'error', f"{type(e).__name__}: {e}")
+		raise
+	run_log.finish_run(run, 'updated')
+
+def write_missing_media_report(run, output_file, force):
+	"""
+	Compares the local shows and movies with OMDB and writes the missing media report,
+	timing each phase and counting the items processed on the run record.
+	"""
 	# Analyze local shows
 	print_message("Analyzing local TV shows...")
-	local_shows = analyze_local_shows()
+	with run_log.phase(run, 'scan_shows'):
+		local_shows = analyze_local_shows()
 
-	# Compare with OMDB data
+	# Compare with OMDB data, reusing the stored result of every show whose folder and OMDB cache entries are unchanged
 	print_message("Comparing with OMDB data...")
-	all_missing_items = []
-
-	for show_name, seasons in local_shows.items():
-		print_message(f"Analyzing {show_name}...")
-		missing_items = analyze_show(show_name, seasons)
-		all_missing_items.extend(missing_items)
+	show_results = {}
+	shows_to_analyze = []
+	for show_name, local_show in local_shows.items():
+		stored_result = None if force else get_stored_analysis(show_name, local_show)
+		if stored_result is None:
+			shows_to_analyze.append(show_name)
+		else:
+			show_results[show_name] = stored_result
+	print_message(f"Reusing stored results for {len(show_results)} shows, analyzing {len(shows_to_analyze)}")
+
+	def analyze_show_item(show_name):
+		# Collect the show's progress so it prints as one block rather than interleaved with other shows
+		messages = [f"Analyzing {show_name}..."]
+		result = analyze_show(show_name, local_shows[show_name], messages)
+		store_analysis(show_name, local_shows[show_name], result)
+		return result, messages
+
+	# Shows are independent, so their OMDB lookups run concurrently within the rate limit
+	with run_log.phase(run, 'compare_shows'):
+		for show_name, (result, messages) in omdb_client.imap_concurrent(analyze_show_item, shows_to_analyze):
+			for message in messages:
+				print_message(message)
+			show_results[show_name] = result
 
 	# Analyze local movies
 	print_message("\nAnalyzing local movies...")
-	movie_missing_items = analyze_local_movies()
-	all_missing_items.extend(movie_missing_items)
+	with run_log.phase(run, 'scan_movies'):
+		movie_missing_items = analyze_local_movies()
+
+	# Build the table rows and the summary from the structured results in one pass
+	all_missing_items = []
+	episode_summaries = {}
+	for show_name in local_shows:
+		result = show_results[show_name]
+		all_missing_items.extend(get_missing_rows(result))
+		parts = summarize_show(result)
+		if parts:
+			episode_summaries[show_name] = parts
+
+	movie_summaries = {}
+	for movie_name, _, issue in movie_missing_items:
+		all_missing_items.append((movie_name, "Movie", issue))
+		movie_summaries.setdefault(movie_name, []).append(issue)
 
 	# Create markdown report
 	headers = ["Show", "Season", "Missing Item"]
 	markdown_table = tabulate(all_missing_items, headers=headers, tablefmt="pipe")
 
-	# Generate summary section
-	show_summary = {}
-	for show, season, item in all_missing_items:
-		if show not in show_summary:
-			show_summary[show] = {}
-
-		if season == "Error":
-			continue
-
-		if season == "Movie":
-			if "Movie" not in show_summary[show]:
-				show_summary[show]["Movie"] = []
-			show_summary[show]["Movie"].append(item)
-			continue
-
-		season_num = int(season.split()[1])
-		if season_num not in show_summary[show]:
-			show_summary[show][season_num] = []
-
-		if item == "Entire season missing":
-			show_summary[show][season_num] = ["Entire season missing"]
-		else:
-			show_summary[show][season_num].append(item)
-
 	# Format summary as markdown
 	summary_lines = ["\n## Summary of Missing Content\n"]
 
-	# Create separate lists for shows with missing episodes and movies
-	shows_with_missing_episodes = []
-	shows_with_missing_movies = []
-
-	for show in sorted(show_summary.keys()):
-		episode_summary = []
-		movie_summary = []
-
-		# Handle movies first
-		if "Movie" in show_summary[show]:
-			movie_summary.append(f"{', '.join(show_summary[show]['Movie'])}")
-
-		# Then handle TV show seasons
-		for season_num in sorted(show_summary[show].keys()):
-			if season_num == "Movie":
-				continue
-
-			items = show_summary[show][season_num]
-			if items == ["Entire season missing"]:
-				episode_summary.append(f"Season {season_num}")
-			else:
-				episode_nums = []
-				for item in items:
-					match = re.match(r"E(\d+)", item)
-					if match:
-						episode_nums.append(int(match.group(1)))
-
-				if episode_nums:
-					# Get the total number of episodes in this season from OMDB
-					episode_info = get_episode_info(show, season_num)
-					total_episodes = len(episode_info.get("Episodes", [])) if episode_info.get("Response") == "True" else 0
-
-					# If we have no episode info or all episodes are missing
-					if total_episodes == 0 or len(episode_nums) >= total_episodes:
-						episode_summary.append(f"Season {season_num}")
-					# If more than half of the episodes are missing
-					elif len(episode_nums) > total_episodes / 2:
-						episode_summary.append(f"Season {season_num} (most episodes missing)")
-					else:
-						if len(episode_nums) == 1:
-							episode_summary.append(f"Season {season_num} missing episode {episode_nums[0]}")
-						else:
-							episode_summary.append(f"Season {season_num} missing episodes {', '.join(map(str, sorted(episode_nums)))}")
-
-		if episode_summary:
-			shows_with_missing_episodes.append(f"* `{show}` - {'; '.join(episode_summary)}")
-
-		if movie_summary:
-			shows_with_missing_movies.append(f"* `{show}` - {'; '.join(movie_summary)}")
-
-	# Add the sections to the summary
-	if shows_with_missing_episodes:
+	if episode_summaries:
 		summary_lines.append("\n### Missing Episodes")
-		summary_lines.extend(shows_with_missing_episodes)
+		summary_lines.extend(f"* `{show}` - {'; '.join(episode_summaries[show])}" for show in sorted(episode_summaries))
 
-	if shows_with_missing_movies:
+	if movie_summaries:
 		summary_lines.append("\n### Missing Movies")
-		summary_lines.extend(shows_with_missing_movies)
-
-	# Use a fixed filename that will be overwritten each time
-	output_file = logs_dir / "missing-episodes.md"
-
-	# Check if file was updated less than a day ago
-	force = getattr(args, "force", False)
-	if output_file.exists() and not force:
-		file_mtime = datetime.datetime.fromtimestamp(output_file.stat().st_mtime)
-		time_diff = datetime.datetime.now() - file_mtime
-		if time_diff.total_seconds() < 86400:  # 86400 seconds = 1 day
-			print_message(f"\nSkipping update: {output_file} was updated less than a day ago ({time_diff.total_seconds()/3600:.1f} hours ago)")
-			# Save cache after all updates
-			save_show_cache()
-			return
+		summary_lines.extend(f"* `{movie}` - {', '.join(movie_summaries[movie])}" for movie in sorted(movie_summaries))
 
 	# Write to file
 	with open(output_file, "w") as f:
@@ -716,8 +860,14 @@ def run_media_library_analyzer(args, file_location):
 		f.write("\n".join(summary_lines))
 		f.write(f"\n\n---\nLast updated: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
-	# Save cache after all updates
-	save_show_cache()
+	# Report the entries the run could not serve fresh, so quota and offline gaps are visible
+	write_mirror_report(get_mirror_status(local_shows))
+
+	run['items'] = {
+		'shows': len(local_shows),
+		'shows_analyzed': len(shows_to_analyze),
+		'missing_items': len(all_missing_items)
+	}
 
 	print_message(f"\nAnalysis complete! Results written to {output_file}")
 
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+
+"""
+Shared OMDB API client.
+
+Every OMDB lookup (media_library_analyzer, create_plex_folders and tvstation) goes through
+query(), which provides:
+- one pooled requests session, so connections are reused
+- a token bucket sized to the daily quota, persisted between runs, so bursts are allowed
+  but the quota is never exceeded
+- retries with exponential backoff on connection errors, timeouts, 429 and 5xx responses
+- a response cache in the cache store (cache/media_cache.db), one entry per query, written as
+  each response arrives, so startup cost does not grow with the cache and a crash loses nothing.
+  "Not found" answers are cached too, for a shorter time, so titles OMDB does not know are not
+  looked up again on every run; only fatal errors (quota, key or network problems) are never cached
+
+map_concurrent() runs lookups on a small thread pool so throughput is bounded by the
+quota rather than by serial round trips. imap_concurrent() does the same but hands each
+result back as soon as it is ready, so callers can act on it while other lookups run.
+
+In offline mode (set_offline(), or the omdb_offline environment variable) no request is sent:
+every query is answered from the response cache whatever its age, and the queries that were
+missing from it or answered with a stale response are recorded in MIRROR_REPORT.
+
+Setup:
+	Fill the variables in the .env file or set them as environment variables:
+		omdb_api_key: Your OMDB API key
+		omdb_api_url: (Optional) The OMDB API URL. Defaults to http://www.omdbapi.com/.
+		omdb_daily_limit: (Optional) Requests allowed per day by your OMDB plan. Defaults to 1000.
+		omdb_max_workers: (Optional) Number of concurrent OMDB requests. Defaults to 4.
+		omdb_cache_days: (Optional) Days a cached response is reused. Defaults to 30.
+		omdb_negative_cache_days: (Optional) Days a cached "not found" response is reused. Defaults to 7.
+		omdb_offline: (Optional) Set to 1 to answer every query from the response cache only.
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import cache_store
+
+# Cache store namespaces for responses (keyed by get_cache_key) and the rate limit bucket
+RESPONSE_NAMESPACE = 'omdb_response'
+STATE_NAMESPACE = 'omdb_state'
+
+# Monolithic response cache used before the cache store, imported once and then removed
+LEGACY_CACHE_FILE = Path(__file__).parent.parent / 'cache' / 'omdb_responses.json'
+
+# Retry settings for transient failures
+MAX_RETRIES = 3
+BACKOFF_SECONDS = 1.0
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Longest a caller waits for a rate limit token before the request is treated as over quota
+MAX_TOKEN_WAIT_SECONDS = 5.0
+
+# OMDB errors that mean no further request can succeed this run
+FATAL_ERRORS = ('Request limit reached!', 'Invalid API key!', 'No API key provided.')
+
+OMDB_GLOBALS = {
+	'api_key': None,
+	'api_url': None,
+	'daily_limit': 1000,
+	'max_workers': 4,
+	'cache_days': 30,
+	'negative_cache_days': 7,
+	'session': None,
+	'disabled_reason': None,
+	'offline': False
+}
+
+MIRROR_REPORT = {'missing': set(), 'stale': set()}
+RATE_LIMIT = {'tokens': None, 'updated_at': 0}
+
+# Requests sent to OMDB and queries answered from the response cache, for the run log
+REQUEST_STATS = {'omdb': 0, 'omdb_cached': 0}
+
+_lock = threading.Lock()
+_state_loaded = False
+
+def get_int_env(name, default):
+	"""
+	Reads a positive integer environment variable, falling back to the default.
+	"""
+	try:
+		value = int(os.getenv(name, default))
+		return value if value > 0 else default
+	except ValueError:
+		return default
+
+def configure():
+	"""
+	Reads the OMDB settings from the environment and sets up the shared session.
+	Called automatically on first use.
+	"""
+	OMDB_GLOBALS['api_key'] = os.getenv('omdb_api_key')
+	OMDB_GLOBALS['api_url'] = os.getenv('omdb_api_url') or 'http://www.omdbapi.com/'
+	OMDB_GLOBALS['daily_limit'] = get_int_env('omdb_daily_limit', 1000)
+	OMDB_GLOBALS['max_workers'] = get_int_env('omdb_max_workers', 4)
+	OMDB_GLOBALS['cache_days'] = get_int_env('omdb_cache_days', 30)
+	OMDB_GLOBALS['negative_cache_days'] = get_int_env('omdb_negative_cache_days', 7)
+	OMDB_GLOBALS['offline'] = OMDB_GLOBALS['offline'] or os.getenv('omdb_offline', '') in ('1', 'true', 'yes')
+
+	ssn = requests.Session()
+	adapter = HTTPAdapter(pool_connections=1, pool_maxsize=OMDB_GLOBALS['max_workers'])
+	ssn.mount('http://', adapter)
+	ssn.mount('https://', adapter)
+	OMDB_GLOBALS['session'] = ssn
+
+def load_state():
+	"""
+	Sets up the session and loads the rate limit state from the cache store. Only the first call does any work.
+	"""
+	global _state_loaded
+	if _state_loaded:
+		return
+	_state_loaded = True
+
+	if OMDB_GLOBALS['session'] is None:
+		configure()
+
+	if cache_store.get('meta', 'legacy_omdb_cache_imported') is None:
+		import_legacy_cache()
+
+	stored = cache_store.get(STATE_NAMESPACE, 'rate_limit')
+	if stored is not None:
+		RATE_LIMIT.update(stored[0])
+
+def import_legacy_cache():
+	"""
+	Imports the legacy omdb_responses.json into the cache store, keeping each response's fetch time,
+	then deletes the file. The import runs once.
+	"""
+	legacy_cache = {}
+	if LEGACY_CACHE_FILE.exists():
+		try:
+			with open(LEGACY_CACHE_FILE, 'r', encoding='utf-8') as f:
+				legacy_cache = json.load(f)
+		except (json.JSONDecodeError, IOError):
+			legacy_cache = {}
+
+	entries = [
+		(RESPONSE_NAMESPACE, key, entry['response'], entry['fetched_at'])
+		for key, entry in legacy_cache.get('responses', {}).items()
+		if 'response' in entry and 'fetched_at' in entry
+	]
+	if legacy_cache.get('rate_limit'):
+		entries.append((STATE_NAMESPACE, 'rate_limit', legacy_cache['rate_limit'], None))
+
+	# Record the import in the same transaction so it is never half done
+	entries.append(('meta', 'legacy_omdb_cache_imported', True, None))
+	cache_store.put_many(entries)
+	if LEGACY_CACHE_FILE.exists():
+		LEGACY_CACHE_FILE.unlink()
+
+def set_offline(offline=True):
+	"""
+	Turns offline mode on or off for the rest of the run.
+	"""
+	OMDB_GLOBALS['offline'] = offline
+
+def is_offline():
+	"""
+	Checks whether queries are answered from the response cache only.
+	"""
+	load_state()
+	return OMDB_GLOBALS['offline']
+
+def get_available_tokens():
+	"""
+	Returns roughly how many requests the daily quota still allows right now.
+	"""
+	load_state()
+	capacity = OMDB_GLOBALS['daily_limit']
+	with _lock:
+		if RATE_LIMIT['tokens'] is None:
+			return capacity
+		elapsed = time.time() - RATE_LIMIT['updated_at']
+		return int(min(capacity, RATE_LIMIT['tokens'] + elapsed * capacity / 86400))
+
+def get_cache_key(params):
+	"""
+	Builds a stable cache key from the query parameters, leaving out the API key.
+	"""
+	return '&'.join(f'{k}={params[k]}' for k in sorted(params) if k != 'apikey')
+
+def get_cached_response(params, max_age_days=None):
+	"""
+	Returns a cached response for the query if it is younger than max_age_days, otherwise None.
+	Cached "not found" responses expire after omdb_negative_cache_days if that is sooner.
+	"""
+	load_state()
+	if max_age_days is None:
+		max_age_days = OMDB_GLOBALS['cache_days']
+
+	cached = cache_store.get(RESPONSE_NAMESPACE, get_cache_key(params))
+	if cached is None:
+		return None
+	response, fetched_at = cached
+	if response.get('Response') != 'True':
+		max_age_days = min(max_age_days, OMDB_GLOBALS['negative_cache_days'])
+	if time.time() - fetched_at >= max_age_days * 86400:
+		return None
+	return response
+
+def acquire_token():
+	"""
+	Takes one token from the daily quota bucket, waiting briefly for a refill if it is empty.
+	The bucket holds a full day's quota and refills continuously, so runs can burst until the quota is spent.
+
+	Returns:
+		True if a token was taken, False if the quota is exhausted
+	"""
+	capacity = OMDB_GLOBALS['daily_limit']
+	refill_per_second = capacity / 86400
+	deadline = time.time() + MAX_TOKEN_WAIT_SECONDS
+
+	while True:
+		with _lock:
+			now = time.time()
+			tokens = RATE_LIMIT['tokens'] if RATE_LIMIT['tokens'] is not None else capacity
+			tokens = min(capacity, tokens + (now - RATE_LIMIT['updated_at']) * refill_per_second)
+			RATE_LIMIT['updated_at'] = now
+			taken = tokens >= 1
+			RATE_LIMIT['tokens'] = tokens - 1 if taken else tokens
+			rate_limit = dict(RATE_LIMIT)
+
+		# Persist the bucket with every request so an interrupted run still counts against the quota
+		cache_store.put(STATE_NAMESPACE, 'rate_limit', rate_limit)
+		if taken:
+			return True
+		wait = (1 - rate_limit['tokens']) / refill_per_second
+
+		if now + wait > deadline:
+			return False
+		time.sleep(wait)
+
+def is_fatal_error(response):
+	"""
+	Checks whether an OMDB response means no further request can succeed (quota, key or network problems),
+	as opposed to a lookup that simply found nothing.
+	"""
+	if response.get('Response') != 'False':
+		return False
+	error = response.get('Error', '')
+	return error in FATAL_ERRORS or error.startswith('Request failed')
+
+def disable(reason):
+	"""
+	Stops all further network requests for this run. Cached responses are still served.
+	"""
+	OMDB_GLOBALS['disabled_reason'] = reason
+
+def get_request_stats():
+	"""
+	Returns a copy of the OMDB request counters for this process.
+	"""
+	with _lock:
+		return dict(REQUEST_STATS)
+
+def fetch(params):
+	"""
+	Sends one OMDB request, retrying transient failures with exponential backoff.
+	"""
+	request_params = dict(params, apikey=OMDB_GLOBALS['api_key'])
+	for attempt in range(MAX_RETRIES + 1):
+		with _lock:
+			REQUEST_STATS['omdb'] += 1
+		try:
+			response = OMDB_GLOBALS['session'].get(OMDB_GLOBALS['api_url'], params=request_params, timeout=15)
+			if response.status_code not in RETRY_STATUS_CODES:
+				return response.json()
+			error = f'HTTP {response.status_code}'
+		except ValueError as e:
+			# Non-JSON body, usually an error page from a proxy
+			error = f'Invalid response: {e}'
+		except requests.exceptions.RequestException as e:
+			error = str(e)
+
+		if attempt < MAX_RETRIES:
+			time.sleep(BACKOFF_SECONDS * (2 ** attempt))
+
+	return {'Response': 'False', 'Error': f'Request failed: {error}'}
+
+def query(params, max_age_days=None):
+	"""
+	Runs an OMDB query, serving it from the response cache when possible.
+
+	Args:
+		params: OMDB query parameters without the API key (for example {'s': 'Title', 'type': 'series'})
+		max_age_days: How old a cached response may be. Defaults to omdb_cache_days; 0 always refetches.
+
+	Returns:
+		The OMDB response as a dictionary. Failures are returned in OMDB's own
+		{"Response": "False", "Error": ...} format so callers handle them uniformly.
+	"""
+	cached = get_cached_response(params, max_age_days)
+	if cached is not None:
+		with _lock:
+			REQUEST_STATS['omdb_cached'] += 1
+		return cached
+
+	if OMDB_GLOBALS['offline']:
+		cached = get_cached_response(params, float('inf'))
+		with _lock:
+			MIRROR_REPORT['missing' if cached is None else 'stale'].add(get_cache_key(params))
+		if cached is not None:
+			return cached
+		return {'Response': 'False', 'Error': 'Not in the offline OMDB mirror'}
+
+	if OMDB_GLOBALS['disabled_reason']:
+		return {'Response': 'False', 'Error': OMDB_GLOBALS['disabled_reason']}
+	if not OMDB_GLOBALS['api_key']:
+		return {'Response': 'False', 'Error': 'No API key provided.'}
+	if not acquire_token():
+		disable('Request limit reached!')
+		return {'Response': 'False', 'Error': 'Request limit reached!'}
+
+	response = fetch(params)
+	if is_fatal_error(response):
+		disable(response['Error'])
+	else:
+		cache_store.put(RESPONSE_NAMESPACE, get_cache_key(params), response)
+
+	return response
+
+def map_concurrent(func, items):
+	"""
+	Applies func to every item on a bounded thread pool, preserving order.
+	Use it for independent lookups; the rate limiter is shared across threads.
+	"""
+	load_state()
+	items = list(items)
+	if len(items) < 2:
+		return [func(item) for item in items]
+	with ThreadPoolExecutor(max_workers=OMDB_GLOBALS['max_workers']) as executor:
+		return list(executor.map(func, items))
+
+def imap_concurrent(func, items):
+	"""
+	Applies func to every item on a bounded thread pool and yields (item, result) pairs
+	in the order the results complete.
+	"""
+	load_state()
+	items = list(items)
+	with ThreadPoolExecutor(max_workers=OMDB_GLOBALS['max_workers']) as executor:
+		futures = {executor.submit(func, item): item for item in items}
+		for future in as_completed(futures):
+			yield futures[future], future.result()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+
+"""
+OMDB mirror prefetch.
+
+Warms the local OMDB mirror so that the missing media analyzer and the folder creator can run
+with --offline. Every local show, every season the analyzer compares, and every wishlist title is
+looked up when its cached entry is missing or stale; fresh entries cost nothing.
+
+Shows with entries that are missing entirely are fetched before shows that are only stale, and the
+prefetch stops once only omdb_prefetch_reserve requests of the daily quota are left, so daytime
+runs still have quota. It is meant to run during quiet hours, for example from cron at night.
+
+When it finishes, logs/omdb-mirror.md lists the entries that are still missing or stale.
+
+Setup:
+	Fill the variables in the .env file or set them as environment variables:
+		plex_tv_folder, plex_movies_folder and the omdb_* variables used by omdb_client
+		omdb_prefetch_reserve: (Optional) Requests of the daily quota to leave unused. Defaults to 100.
+"""
+
+import create_plex_folders
+import media_library_analyzer
+import omdb_client
+import run_log
+
+def has_quota(reserve):
+	"""
+	Checks whether the prefetch may still spend requests.
+	"""
+	return not media_library_analyzer.OMDB_API_ERROR and omdb_client.get_available_tokens() > reserve
+
+def get_wishlist_lookups(file_location):
+	"""
+	Returns the (lookup function, title) pairs for every wishlist title.
+	"""
+	lookups = []
+	wishlists = (
+		(create_plex_folders.get_movie_info, create_plex_folders.PLEX_GLOBALS['MOVIE_WISHLIST_FILE']),
+		(create_plex_folders.get_show_info, create_plex_folders.PLEX_GLOBALS['TV_WISHLIST_FILE'])
+	)
+	for lookup, wishlist_file in wishlists:
+		if (file_location / wishlist_file).exists():
+			lookups.extend((lookup, title) for title in create_plex_folders.read_wishlist(file_location / wishlist_file))
+	return lookups
+
+def get_wishlist_mirror_status(wishlist_lookups):
+	"""
+	Replays the wishlist lookups against the mirror only and returns the queries it could not answer fresh.
+	"""
+	omdb_client.set_offline(True)
+	omdb_client.MIRROR_REPORT['missing'].clear()
+	omdb_client.MIRROR_REPORT['stale'].clear()
+	try:
+		# Only the mirror report matters here, so the lookup messages are discarded
+		for lookup, title in wishlist_lookups:
+			lookup(title, [])
+	finally:
+		omdb_client.set_offline(False)
+
+	return {state: [f"wishlist query {key}" for key in omdb_client.MIRROR_REPORT[state]] for state in ('missing', 'stale')}
+
+def run_omdb_prefetch(args, file_location):
+	"""
+	Fetches every missing or stale OMDB entry needed by the analyzer and the wishlists, within quota.
+	"""
+	logs_dir = media_library_analyzer.setup_analyzer(args, file_location)
+	create_plex_folders.set_plex_globals()
+	run = run_log.start_run(logs_dir, 'omdb_prefetch', vars(args))
+
+	if omdb_client.is_offline():
+		media_library_analyzer.print_message("Prefetch needs network access; ignoring --offline")
+		omdb_client.set_offline(False)
+
+	try:
+		quota_reached = prefetch_mirror(run, file_location)
+	except Exception as e:
+		run_log.finish_run(run, 'error', f"{type(e).__name__}: {e}")
+		raise
+	run_log.finish_run(run, 'quota_reached' if quota_reached else 'updated')
+
+def prefetch_mirror(run, file_location):
+	"""
+	Prefetches the shows and then the wishlist titles, and writes the mirror report.
+
+	Returns:
+		True if the daily quota reserve was reached
+	"""
+	reserve = omdb_client.get_int_env('omdb_prefetch_reserve', 100)
+	local_shows = media_library_analyzer.analyze_local_shows()
+
+	# Shows with nothing cached first, then shows that are only stale
+	shows_by_state = {'missing': [], 'stale': []}
+	for show_name, local_show in local_shows.items():
+		states = {state for _, state in media_library_analyzer.get_show_mirror_entries(show_name, local_show)}
+		if states:
+			shows_by_state['missing' if 'missing' in states else 'stale'].append(show_name)
+	media_library_analyzer.print_message(f"Prefetching {len(shows_by_state['missing'])} shows with missing entries and {len(shows_by_state['stale'])} with stale entries")
+
+	def prefetch_show(show_name):
+		# Collect the show's progress so it prints as one block rather than interleaved with other shows
+		messages = []
+		if has_quota(reserve):
+			media_library_analyzer.prefetch_show(show_name, local_shows[show_name], messages)
+		return messages
+
+	with run_log.phase(run, 'prefetch_shows'):
+		for _, messages in omdb_client.imap_concurrent(prefetch_show, shows_by_state['missing'] + shows_by_state['stale']):
+			for message in messages:
+				media_library_analyzer.print_message(message)
+
+	# Wishlist titles go through create_plex_folders' own lookups so the exact queries it makes are cached
+	wishlist_lookups = get_wishlist_lookups(file_location)
+
+	def prefetch_wishlist_title(wishlist_lookup):
+		lookup, title = wishlist_lookup
+		if has_quota(reserve):
+			lookup(title, [])
+
+	with run_log.phase(run, 'prefetch_wishlist'):
+		omdb_client.map_concurrent(prefetch_wishlist_title, wishlist_lookups)
+
+	run['items'] = {
+		'shows_missing': len(shows_by_state['missing']),
+		'shows_stale': len(shows_by_state['stale']),
+		'wishlist_titles': len(wishlist_lookups)
+	}
+
+	quota_reached = not has_quota(reserve)
+	if quota_reached:
+		media_library_analyzer.print_message("The daily OMDB quota reserve was reached; entries left over are fetched on the next prefetch")
+
+	status = media_library_analyzer.get_mirror_status(local_shows)
+	wishlist_status = get_wishlist_mirror_status(wishlist_lookups)
+	for state in ('missing', 'stale'):
+		status[state].extend(wishlist_status[state])
+	media_library_analyzer.write_mirror_report(status)
+	return quota_reached
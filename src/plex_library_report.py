@@ -18,9 +18,17 @@ import time
 import datetime
 import requests
 
+import plex_metadata
+import title_matcher
 from media_library_analyzer import PLEX_GLOBALS
 from utils import build_genres_set, test_plex_connectivity_with_fallback
 
+# Lowest title_matcher score accepted when a Plex title has no exact folder match
+FOLDER_MATCH_CUTOFF = 0.6
+
+# title_matcher indexes of the media folders, keyed by directory
+FOLDER_INDEXES = {}
+
 def initialize_plex_globals(file_location):
 	"""
 	Initialize the PLEX_GLOBALS dictionary with environment variables and other global settings.
@@ -124,6 +132,40 @@ def get_section_keys(ssn):
 
 	return PLEX_GLOBALS['movies_section_key'], PLEX_GLOBALS['tv_section_key']
 
+def get_folder_index(directory):
+	"""
+	Returns the title_matcher index of the folders in a media directory, listing the directory once per run.
+	Each candidate's value is the folder path.
+	"""
+	directory_key = str(directory)
+	if directory_key not in FOLDER_INDEXES:
+		candidates = []
+		try:
+			with os.scandir(directory) as entries:
+				for entry in entries:
+					if entry.is_dir():
+						candidates.append(title_matcher.prepare_candidate(
+							title_matcher.strip_years(entry.name), title_matcher.get_start_year(entry.name), entry.path
+						))
+		except OSError:
+			pass
+		FOLDER_INDEXES[directory_key] = title_matcher.build_index(candidates)
+	return FOLDER_INDEXES[directory_key]
+
+def find_media_folder(directory, title, year=None):
+	"""
+	Finds the folder in a media directory that holds a Plex title, or None.
+	An exact title match is preferred (closest year first), then the best fuzzy match that is not a sequel.
+	When the year is known (movies), a folder named with a different year never matches, so remakes
+	and same-title films do not take each other's folders.
+	"""
+	folder_index = get_folder_index(directory)
+	require_year = year is not None
+	match = title_matcher.find_exact_match(title, folder_index, year, require_year=require_year)
+	if match is None:
+		match = title_matcher.find_best_match(title, folder_index, FOLDER_MATCH_CUTOFF, year, reject_sequels=True, require_year=require_year)
+	return match['value'] if match else None
+
 def calculate_directory_size(directory, title=None, year=None):
 	"""
 	Calculate the total size of a directory recursively.
@@ -138,71 +180,13 @@ def calculate_directory_size(directory, title=None, year=None):
 		Total size in bytes
 	"""
 	total_size = 0
-	movies_path = PLEX_GLOBALS['MOVIES_PATH']
-	tv_show_path = PLEX_GLOBALS['TV_SHOWS_PATH']
 	
 	# If title is provided, first find the matching directory
 	if title is not None:
-		# Check if this is a movies path (use Path comparison for accuracy)
-		# Convert both to Path objects and compare
-		dir_path = Path(directory)
-		movies_path_obj = Path(movies_path)
-		tv_show_path_obj = Path(tv_show_path)
-		
-		# Resolve paths to handle symlinks and get absolute paths
-		try:
-			dir_resolved = dir_path.resolve()
-			movies_resolved = movies_path_obj.resolve()
-			tv_resolved = tv_show_path_obj.resolve()
-		except (OSError, RuntimeError):
-			# If resolve fails, use the paths as-is
-			dir_resolved = dir_path
-			movies_resolved = movies_path_obj
-			tv_resolved = tv_show_path_obj
-		
-		is_movies_path = dir_resolved == movies_resolved or str(movies_resolved) in str(dir_resolved)
-		is_tv_path = dir_resolved == tv_resolved or str(tv_resolved) in str(dir_resolved)
-		
-		if year is not None and is_movies_path:
-			# For movies: look for "Title (Year)" format
-			movie_dir_pattern = f"{title} ({year})"
-			for item in Path(directory).iterdir():
-				if item.is_dir() and item.name == movie_dir_pattern:
-					directory = item
-					break
-			else:
-				# Fallback: try partial match
-				for item in Path(directory).iterdir():
-					if item.is_dir() and item.name.startswith(title) and f"({year})" in item.name:
-						directory = item
-						break
-				else:
-					# No match found
-					return 0
-		elif is_tv_path:
-			# For TV shows: look for directories starting with the title
-			# Try exact match first, then startswith
-			matched_dir = None
-			for item in Path(directory).iterdir():
-				if item.is_dir():
-					# Try exact match first
-					if item.name == title:
-						matched_dir = item
-						break
-					# Then try startswith (but be more careful)
-					elif item.name.startswith(title):
-						# Make sure it's not a partial word match
-						# Check if next character is space, parenthesis, or end of string
-						if len(item.name) == len(title) or item.name[len(title)] in (' ', '(', '-', '_'):
-							if matched_dir is None:
-								matched_dir = item
-							# Prefer shorter matches (more exact)
-							elif len(item.name) < len(matched_dir.name):
-								matched_dir = item
-			if matched_dir is None:
-				# No match found
-				return 0
-			directory = matched_dir
+		directory = find_media_folder(directory, title, year)
+		if directory is None:
+			# No match found
+			return 0
 	
 	# Recursively calculate size of all files in the directory
 	for dirpath, dirnames, filenames in walk(directory):
@@ -223,10 +207,7 @@ def get_movie_stats(ssn):
 	base_url = get_base_url()
 	movie_section_key, _ = get_section_keys(ssn)
 	
-	results = ssn.get(f'{base_url}/library/sections/{movie_section_key}/all', params={})
-	results.raise_for_status()
-	results_json = results.json()
-	movie_list = results_json['MediaContainer']['Metadata']
+	movie_list = plex_metadata.get_section_items(ssn, base_url, movie_section_key)
 	
 	total_movies = len(movie_list)
 	watched_movies = len([m for m in movie_list if m.get('viewCount', 0) > 0])
@@ -265,17 +246,15 @@ def get_movie_stats(ssn):
 		'genre_counts': genre_counts
 	}
 
-def get_tv_stats(ssn):
+def get_tv_stats(ssn, full_stats=False):
 	"""
 	Retrieves statistics about TV shows in the library, including file sizes from disk.
+	Episode counts come from the Plex aggregates unless full_stats is set.
 	"""
 	base_url = get_base_url()
 	_, tv_section_key = get_section_keys(ssn)
 	
-	results = ssn.get(f'{base_url}/library/sections/{tv_section_key}/all', params={})
-	results.raise_for_status()
-	results_json = results.json()
-	series_list = results_json['MediaContainer']['Metadata']
+	series_list = plex_metadata.get_section_items(ssn, base_url, tv_section_key)
 	
 	total_shows = len(series_list)
 	total_episodes = 0
@@ -286,33 +265,20 @@ def get_tv_stats(ssn):
 	genre_counts = {}  # Track genre counts
 	
 	for series in series_list:
-		series_key = series['ratingKey']
-		
-		# Get detailed series info including genres
-		series_details = ssn.get(f'{base_url}/library/metadata/{series_key}', params={}).json()['MediaContainer']['Metadata'][0]
-		
-		# Track genres
+		# Genres and episode counts come straight from the section listing,
+		# so no per-show metadata or season/episode requests are needed
+		# unless full stats were requested or the counts look inconsistent
 		series_genres = []
-		for genre_name in build_genres_set(series_details.get('Genre', [])):
+		for genre_name in build_genres_set(series.get('Genre', [])):
 			genre_counts[genre_name] = genre_counts.get(genre_name, 0) + 1
 			series_genres.append(genre_name)
 		
-		seasons = ssn.get(f'{base_url}/library/metadata/{series_key}/children', params={}).json()['MediaContainer']['Metadata']
-		
-		show_episodes = 0
-		show_watched = 0
+		show_episodes, show_watched = plex_metadata.get_watch_counts(ssn, base_url, series, full_stats)
 		
 		# Calculate file size from disk for the entire show (once, not per episode!)
 		tv_show_path = PLEX_GLOBALS['TV_SHOWS_PATH']
 		show_size = calculate_directory_size(tv_show_path, series['title'])
 		
-		for season in seasons:
-			season_key = season['ratingKey']
-			episodes = ssn.get(f'{base_url}/library/metadata/{season_key}/children', params={}).json()['MediaContainer']['Metadata']
-			
-			show_episodes += len(episodes)
-			show_watched += len([e for e in episodes if e.get('viewCount', 0) > 0])
-		
 		total_episodes += show_episodes
 		watched_episodes += show_watched
 		
@@ -348,7 +314,7 @@ def format_size(size_bytes):
 		size_bytes /= 1024.0
 	return f"{size_bytes:.2f} PB"
 
-def generate_report(ssn, force=False):
+def generate_report(ssn, force=False, full_stats=False):
 	"""
 	Generates a comprehensive report of the Plex library, including file sizes.
 	"""
@@ -401,7 +367,7 @@ def generate_report(ssn, force=False):
 		write_markdown(f"| {movie['title']} | {movie['year']} | {watched_status} | {movie['file_size']} | {genres_str} |")
 	
 	# Get TV show statistics
-	tv_stats = get_tv_stats(ssn)
+	tv_stats = get_tv_stats(ssn, full_stats=full_stats)
 	log_message("\n=== TV Shows ===")
 	write_markdown("\n## TV Shows\n")
 	
@@ -496,7 +462,7 @@ def generate_report(ssn, force=False):
 		log_message(f"{genre}: {count}")
 		write_markdown(f"| {genre} | {count} |")
 
-def run_plex_report(file_location, force=False):
+def run_plex_report(file_location, force=False, full_stats=False):
 	# Initialize PLEX_GLOBALS
 	global PLEX_GLOBALS
 	PLEX_GLOBALS = initialize_plex_globals(file_location)
@@ -510,4 +476,7 @@ def run_plex_report(file_location, force=False):
 	test_plex_connectivity_with_fallback(ssn, PLEX_GLOBALS)
 
 	# Generate the report
-	generate_report(ssn, force=force)
\ No newline at end of file
+	generate_report(ssn, force=force, full_stats=full_stats)
+
+	# Persist the library crawl so later steps of the pipeline can reuse it
+	plex_metadata.save_metadata_cache()
\ No newline at end of file
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+
+"""
+Shared Plex library metadata layer.
+
+All actions read section listings and season/episode children through this module so that a
+library crawl is made once and then reused. The crawl is kept in memory for the life of the
+process and persisted to cache/plex_metadata.json so that later processes can reuse it.
+
+A persisted crawl is reused when either:
+- the plex_crawl_session environment variable matches the session the crawl was recorded under.
+  full_update.sh and tv.sh export one, so every step of the pipeline shares a single crawl.
+- the crawl is younger than plex_metadata_ttl seconds (defaults to 0, which disables the TTL).
+
+Anything that changes watched state on the server (for example marking a series unwatched)
+must call invalidate() so later readers do not see stale view counts. It drops the item's own
+children and the children listings of its parents, which carry its viewCount and the
+viewedLeafCount aggregates.
+
+Section items carry a genreMask (see utils.get_genre_mask) so genre filters are a bitwise AND.
+Genre bits are assigned per process, so the masks are recomputed whenever a crawl is loaded.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+from utils import get_genre_mask
+
+# Cache file at project root, next to the OMDB cache
+CACHE_FILE = Path(__file__).parent.parent / 'cache' / 'plex_metadata.json'
+
+# Number of items requested per page when listing a library section
+SECTION_PAGE_SIZE = 1000
+
+# Keys that Plex returns on items but that no action reads; dropped to keep the cache small
+BULKY_KEYS = ('Media', 'summary', 'Role', 'Director', 'Writer', 'Producer', 'Country', 'Similar', 'Image', 'UltraBlurColors')
+
+METADATA_CACHE = {
+	'session': None,
+	'created_at': 0,
+	'sections': {},
+	'children': {}
+}
+
+# Parent ratingKey of every item in a cached children listing, so invalidate() can walk up the tree
+PARENT_KEYS = {}
+
+_cache_loaded = False
+_cache_dirty = False
+
+def get_crawl_session():
+	"""
+	Returns the crawl session id exported by the calling pipeline, or None.
+	"""
+	return os.getenv('plex_crawl_session') or None
+
+def get_cache_ttl():
+	"""
+	Returns the configured metadata TTL in seconds. Invalid values disable the TTL.
+	"""
+	try:
+		return max(int(os.getenv('plex_metadata_ttl', '0')), 0)
+	except ValueError:
+		return 0
+
+def is_crawl_reusable(cache_data):
+	"""
+	Checks whether a persisted crawl can be reused by this process.
+	"""
+	session = get_crawl_session()
+	if session is not None and cache_data.get('session') == session:
+		return True
+
+	ttl = get_cache_ttl()
+	age = time.time() - cache_data.get('created_at', 0)
+	return ttl > 0 and age < ttl
+
+def reset_metadata_cache():
+	"""
+	Starts a new, empty crawl for the current session.
+	"""
+	global METADATA_CACHE, _cache_dirty
+	METADATA_CACHE = {
+		'session': get_crawl_session(),
+		'created_at': time.time(),
+		'sections': {},
+		'children': {}
+	}
+	PARENT_KEYS.clear()
+	_cache_dirty = False
+
+def load_metadata_cache():
+	"""
+	Loads the persisted crawl if it is still reusable, otherwise starts a new one.
+	Only the first call in a process touches the disk.
+	"""
+	global METADATA_CACHE, _cache_loaded
+	if _cache_loaded:
+		return METADATA_CACHE
+	_cache_loaded = True
+
+	reset_metadata_cache()
+	if not CACHE_FILE.exists():
+		return METADATA_CACHE
+
+	try:
+		with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+			cache_data = json.load(f)
+	except (json.JSONDecodeError, IOError):
+		return METADATA_CACHE
+
+	if is_crawl_reusable(cache_data):
+		METADATA_CACHE = {
+			'session': cache_data.get('session'),
+			'created_at': cache_data.get('created_at', 0),
+			'sections': cache_data.get('sections', {}),
+			'children': cache_data.get('children', {})
+		}
+		for items in METADATA_CACHE['sections'].values():
+			add_genre_masks(items)
+		for parent_key, children in METADATA_CACHE['children'].items():
+			index_children(parent_key, children)
+
+	return METADATA_CACHE
+
+def save_metadata_cache():
+	"""
+	Persists the crawl so later steps of the pipeline can reuse it.
+	Nothing is written when no session or TTL is configured, since no one could reuse it.
+	"""
+	global _cache_dirty
+	if not _cache_dirty:
+		return
+	if get_crawl_session() is None and get_cache_ttl() == 0:
+		return
+
+	CACHE_FILE.parent.mkdir(exist_ok=True)
+	tmp_file = CACHE_FILE.with_suffix('.tmp')
+	try:
+		with open(tmp_file, 'w', encoding='utf-8') as f:
+			json.dump(METADATA_CACHE, f, ensure_ascii=False)
+		os.replace(tmp_file, CACHE_FILE)
+		_cache_dirty = False
+	except IOError:
+		pass
+
+def add_genre_masks(items):
+	"""
+	Stores the genre bitmask of every item on the item itself.
+	"""
+	for item in items:
+		item['genreMask'] = get_genre_mask(item.get('Genre'))
+
+def index_children(parent_key, children):
+	"""
+	Records the parent of every item in a children listing.
+	"""
+	for child in children:
+		if 'ratingKey' in child:
+			PARENT_KEYS[str(child['ratingKey'])] = parent_key
+
+def compact_item(item):
+	"""
+	Drops the bulky fields of a Plex metadata item that no action reads.
+	"""
+	return {k: v for k, v in item.items() if k not in BULKY_KEYS}
+
+def fetch_metadata_list(ssn, url):
+	"""
+	Fetches a Plex endpoint and returns its MediaContainer.Metadata list.
+	"""
+	response = ssn.get(url, params={})
+	response.raise_for_status()
+	items = response.json()['MediaContainer'].get('Metadata', [])
+	return [compact_item(item) for item in items]
+
+def fetch_section_pages(ssn, url):
+	"""
+	Fetches a library section listing in pages of SECTION_PAGE_SIZE items.
+	Show items in the listing already carry Genre tags and leafCount/viewedLeafCount,
+	so a whole TV section costs a handful of requests regardless of its size.
+	"""
+	items = []
+	for page in iter_section_pages(ssn, url):
+		items.extend(page)
+	return items
+
+def iter_section_pages(ssn, url):
+	"""
+	Yields a library section listing one page of SECTION_PAGE_SIZE compacted items at a time.
+	"""
+	start = 0
+	while True:
+		params = {'X-Plex-Container-Start': start, 'X-Plex-Container-Size': SECTION_PAGE_SIZE}
+		response = ssn.get(url, params=params)
+		response.raise_for_status()
+		container = response.json()['MediaContainer']
+		page = container.get('Metadata', [])
+		yield [compact_item(item) for item in page]
+
+		start += len(page)
+		total_size = container.get('totalSize', start)
+		if not page or start >= total_size:
+			break
+
+def get_section_items(ssn, base_url, section_key):
+	"""
+	Returns every item in a library section (movies or shows), fetching it at most once per crawl.
+	"""
+	global _cache_dirty
+	cache = load_metadata_cache()
+	section_key = str(section_key)
+
+	if section_key not in cache['sections']:
+		cache['sections'][section_key] = fetch_section_pages(ssn, f'{base_url}/library/sections/{section_key}/all')
+		add_genre_masks(cache['sections'][section_key])
+		_cache_dirty = True
+
+	return cache['sections'][section_key]
+
+def iter_section_items(ssn, base_url, section_key):
+	"""
+	Yields every item in a library section. A section already in the crawl is served from it;
+	otherwise it is streamed page by page without being kept, so memory use does not grow with the library.
+	"""
+	cache = load_metadata_cache()
+	section_key = str(section_key)
+
+	if section_key in cache['sections']:
+		yield from cache['sections'][section_key]
+		return
+
+	for page in iter_section_pages(ssn, f'{base_url}/library/sections/{section_key}/all'):
+		yield from page
+
+def get_children(ssn, base_url, rating_key):
+	"""
+	Returns the children of a metadata item (seasons of a show, episodes of a season),
+	fetching them at most once per crawl.
+	"""
+	global _cache_dirty
+	cache = load_metadata_cache()
+	rating_key = str(rating_key)
+
+	if rating_key not in cache['children']:
+		cache['children'][rating_key] = fetch_metadata_list(ssn, f'{base_url}/library/metadata/{rating_key}/children')
+		index_children(rating_key, cache['children'][rating_key])
+		_cache_dirty = True
+
+	return cache['children'][rating_key]
+
+def invalidate(rating_key):
+	"""
+	Drops everything cached for a metadata item after its watched state was changed on the server:
+	its descendants, and the children listings of its parent and grandparent, since an episode's season
+	listing carries its viewCount and the show's season listing carries the viewedLeafCount aggregates.
+	Section listings are dropped too, since they carry view counts for every item.
+	"""
+	global _cache_dirty
+	cache = load_metadata_cache()
+	rating_key = str(rating_key)
+
+	pending = [rating_key]
+	while pending:
+		key = pending.pop()
+		children = cache['children'].pop(key, None)
+		if children:
+			pending.extend(str(child['ratingKey']) for child in children if 'ratingKey' in child)
+
+	parent_key = PARENT_KEYS.get(rating_key)
+	while parent_key is not None:
+		cache['children'].pop(parent_key, None)
+		parent_key = PARENT_KEYS.get(parent_key)
+
+	cache['sections'] = {}
+	_cache_dirty = True
+
+def has_consistent_counts(item):
+	"""
+	Checks whether the leafCount/viewedLeafCount aggregates on a show or season can be trusted.
+	"""
+	leaf_count = item.get('leafCount')
+	viewed_leaf_count = item.get('viewedLeafCount')
+	if not isinstance(leaf_count, int) or not isinstance(viewed_leaf_count, int):
+		return False
+	return 0 <= viewed_leaf_count <= leaf_count
+
+def count_episodes(ssn, base_url, show_key):
+	"""
+	Counts the episodes and watched episodes of a show by enumerating every season.
+	"""
+	total_episodes = 0
+	watched_episodes = 0
+	for season in get_children(ssn, base_url, show_key):
+		episodes = get_children(ssn, base_url, season['ratingKey'])
+		total_episodes += len(episodes)
+		watched_episodes += len([e for e in episodes if e.get('viewCount', 0) > 0])
+	return total_episodes, watched_episodes
+
+def get_watch_counts(ssn, base_url, show, full_stats=False):
+	"""
+	Returns (total episodes, watched episodes) for a show.
+	Uses the leafCount/viewedLeafCount aggregates Plex returns on the show, and only
+	enumerates every episode when full_stats is set or the aggregates look inconsistent.
+	"""
+	if not full_stats and has_consistent_counts(show):
+		return show['leafCount'], show['viewedLeafCount']
+	return count_episodes(ssn, base_url, show['ratingKey'])
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+
+"""
+Structured run log.
+
+Every run of tvstation, the analyzer and the OMDB prefetch appends one JSON line to
+logs/runs.jsonl when it finishes:
+
+	{"started_at": "2025-01-31 04:00:01", "script": "tvstation", "station": "TV Station",
+	 "args": {...}, "outcome": "updated", "duration": 12.4,
+	 "phases": {"load_globals": 0.8, "build_series": 6.1, ...},
+	 "requests": {"plex": 212, "omdb": 3, "omdb_cached": 41},
+	 "items": {"series": 8, "playlist_episodes": 120}, "message": null}
+
+The file rotates itself when a record is appended: once it is larger than RUN_LOG_MAX_BYTES or its
+first record is older than RUN_LOG_ROTATE_DAYS, it is renamed to runs-<timestamp>.jsonl and a new
+file is started. Cleaning up is then deleting whole rotated files, without reading any of them.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+import omdb_client
+
+RUN_LOG_NAME = 'runs.jsonl'
+ROTATED_PREFIX = 'runs-'
+
+# Rotate the current file once it is this large or its first record is this old
+RUN_LOG_MAX_BYTES = 5 * 1024 * 1024
+RUN_LOG_ROTATE_DAYS = 1
+
+# Rotated files older than this are deleted by the clean action
+RUN_LOG_RETENTION_DAYS = 30
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def start_run(logs_dir, script, args=None, station=None):
+	"""
+	Starts timing a run.
+
+	Args:
+		logs_dir: The logs directory that holds runs.jsonl
+		script: The script name, e.g. "tvstation"
+		args: (Optional) The parsed arguments as a dict; None values are dropped
+		station: (Optional) The playlist name for tvstation runs
+
+	Returns:
+		The run record, to pass to phase(), count_session_requests() and finish_run()
+	"""
+	omdb_stats = omdb_client.get_request_stats()
+	return {
+		'logs_dir': logs_dir,
+		'started': time.time(),
+		'script': script,
+		'station': station,
+		'args': {k: v for k, v in (args or {}).items() if v is not None},
+		'phases': {},
+		'requests': {},
+		'items': {},
+		'omdb_baseline': omdb_stats
+	}
+
+@contextmanager
+def phase(run, name):
+	"""
+	Times the enclosed block as a named phase of the run. Repeated phases add up.
+	"""
+	started = time.perf_counter()
+	try:
+		yield
+	finally:
+		run['phases'][name] = run['phases'].get(name, 0) + time.perf_counter() - started
+
+def count_session_requests(run, ssn, name):
+	"""
+	Counts every response received on a requests session under requests[name].
+	"""
+	run['requests'].setdefault(name, 0)
+
+	def count_response(response, *args, **kwargs):
+		run['requests'][name] += 1
+
+	ssn.hooks['response'].append(count_response)
+
+def finish_run(run, outcome, message=None, **items):
+	"""
+	Appends the run's record to runs.jsonl, rotating the file first if it is due.
+
+	Args:
+		run: The record returned by start_run()
+		outcome: A short outcome such as "updated", "skipped" or "error"
+		message: (Optional) Free text explaining the outcome
+		**items: Counts of items processed, e.g. series=8
+	"""
+	omdb_stats = omdb_client.get_request_stats()
+	requests = dict(run['requests'])
+	for key, value in omdb_stats.items():
+		used = value - run['omdb_baseline'].get(key, 0)
+		if used:
+			requests[key] = used
+
+	record = {
+		'started_at': time.strftime(TIMESTAMP_FORMAT, time.localtime(run['started'])),
+		'script': run['script'],
+		'station': run['station'],
+		'args': run['args'],
+		'outcome': outcome,
+		'duration': round(time.time() - run['started'], 3),
+		'phases': {name: round(seconds, 3) for name, seconds in run['phases'].items()},
+		'requests': requests,
+		'items': dict(run['items'], **items),
+		'message': message
+	}
+
+	run_log = run['logs_dir'] / RUN_LOG_NAME
+	rotate_run_log(run['logs_dir'])
+	with open(run_log, 'a', encoding='utf-8') as f:
+		f.write(json.dumps(record, default=str) + '\n')
+
+def get_first_record_time(run_log):
+	"""
+	Returns the start time of the first record in a run log as a timestamp, or None.
+	"""
+	try:
+		with open(run_log, 'r', encoding='utf-8') as f:
+			first_line = f.readline()
+		return time.mktime(time.strptime(json.loads(first_line)['started_at'], TIMESTAMP_FORMAT))
+	except (IOError, ValueError, KeyError, TypeError):
+		return None
+
+def get_rotated_path(logs_dir, prefix, suffix):
+	"""
+	Returns an unused <prefix><timestamp><suffix> path in the logs directory for a rotated log.
+	"""
+	stem = f"{prefix}{time.strftime('%Y%m%d-%H%M%S')}"
+	rotated = logs_dir / f"{stem}{suffix}"
+	counter = 1
+	while rotated.exists():
+		rotated = logs_dir / f"{stem}-{counter}{suffix}"
+		counter += 1
+	return rotated
+
+def rotate_run_log(logs_dir, force=False):
+	"""
+	Renames runs.jsonl to runs-<timestamp>.jsonl when it is too large or too old, or always when forced.
+	Only the file size and its first line are read.
+
+	Returns:
+		The rotated file's path, or None if nothing was rotated
+	"""
+	run_log = logs_dir / RUN_LOG_NAME
+	try:
+		size = run_log.stat().st_size
+	except FileNotFoundError:
+		return None
+	if size == 0:
+		return None
+
+	if not force and size < RUN_LOG_MAX_BYTES:
+		first_time = get_first_record_time(run_log)
+		if first_time is not None and time.time() - first_time < RUN_LOG_ROTATE_DAYS * 86400:
+			return None
+
+	rotated = get_rotated_path(logs_dir, ROTATED_PREFIX, '.jsonl')
+	os.replace(run_log, rotated)
+	return rotated
+
+def clean_run_logs(logs_dir, retention_days=RUN_LOG_RETENTION_DAYS):
+	"""
+	Rotates runs.jsonl if it is due and deletes rotated run logs last written more than retention_days ago.
+
+	Returns:
+		The number of rotated files deleted
+	"""
+	rotate_run_log(logs_dir)
+	cutoff = time.time() - retention_days * 86400
+	deleted = 0
+	for rotated in logs_dir.glob(f'{ROTATED_PREFIX}*.jsonl'):
+		if rotated.stat().st_mtime < cutoff:
+			rotated.unlink()
+			deleted += 1
+	return deleted
@@ -5,6 +5,19 @@
 This script lists all TV shows and movies from a Plex server along with their slugs.
 The slugs are used by tvstation.py for playlist management and filtering.
 
+Output formats (--format):
+	text: A table of titles and slugs (the default)
+	jsonl: One JSON object per item with title, slug, ratingKey, type, year, genres and franchise
+	csv: The same fields as jsonl, with genres joined by "|"
+Use --output to write to a file instead of stdout. Sections are read page by page, so the
+export works on large libraries without holding them in memory.
+
+With --slug-index the slugs and resolved franchises are also written to cache/slug_index.jsonl.
+tvstation.py loads the franchise of each slug from it instead of resolving franchises on every run,
+and "config compile" checks local_config.json slugs against it. The index records a hash of the
+local_config.json metadata and franchises, and its franchises are ignored once they change. Slugs
+themselves are always computed from the current Plex title, so renamed items are never stale.
+
 Requirements (python3 -m pip install [requirement]):
 	requests
 
@@ -15,9 +28,20 @@ Setup:
 		plex_api_token: The api token for your plex server. This can be found by opening the plex web interface, opening the browser dev tools,
 		and finding the value of the X-Plex-Token query parameter on any plex request.
 """
+import csv
+import json
+import sys
 from os import getenv
+from pathlib import Path
 import requests
-from utils import test_plex_connectivity_with_fallback
+import plex_metadata
+from utils import build_genres_set, create_slug, get_franchise_config_hash, resolve_franchise, test_plex_connectivity_with_fallback
+
+# Slug index at project root, next to the other caches
+SLUG_INDEX_FILE = Path(__file__).parent.parent / 'cache' / 'slug_index.jsonl'
+
+# Fields of the jsonl and csv exports
+EXPORT_FIELDS = ('title', 'slug', 'ratingKey', 'type', 'year', 'genres', 'franchise')
 
 PLEX_GLOBALS = {
 	'plex_ip': '',
@@ -66,29 +90,92 @@ def get_section_keys(ssn):
 
 	return movie_section_key, tv_section_key
 
-def get_movies(ssn, movie_section_key):
+def load_franchise_config(file_location):
 	"""
-	Retrieves all movies from the Plex server.
+	Reads the metadata and franchise slugs that franchise resolution uses from local_config.json.
 	"""
-	base_url = get_base_url()
-	results = ssn.get(f'{base_url}/library/sections/{movie_section_key}/all', params={})
-	results.raise_for_status()
-	results_json = results.json()
-	return results_json['MediaContainer']['Metadata']
+	try:
+		with open(file_location / 'local_config.json', 'r') as f:
+			local_config = json.load(f)
+	except (FileNotFoundError, json.JSONDecodeError):
+		local_config = {}
+	metadata = local_config.get('metadata', [])
+	known_franchises = [create_slug(f) for f in local_config.get('franchises', [])]
+	return metadata, known_franchises
+
+def load_slug_index(config_hash):
+	"""
+	Loads the franchises from the slug index written by --slug-index if it was built with the same franchise configuration.
+	A franchise only depends on the slug and that configuration, so entries stay valid when items are renamed;
+	a renamed item simply has a new slug that is not in the index.
 
-def get_tv_shows(ssn, tv_section_key):
+	Returns:
+		The franchise by slug, empty when there is no usable index
 	"""
-	Retrieves all TV shows from the Plex server.
+	franchise_by_slug = {}
+	try:
+		with open(SLUG_INDEX_FILE, 'r', encoding='utf-8') as f:
+			header = json.loads(f.readline() or '{}')
+			if header.get('config_hash') != config_hash:
+				return {}
+			for line in f:
+				entry = json.loads(line)
+				franchise_by_slug[entry['slug']] = entry['franchise']
+	except (IOError, json.JSONDecodeError, KeyError):
+		return {}
+	return franchise_by_slug
+
+def load_indexed_slugs():
 	"""
-	base_url = get_base_url()
-	results = ssn.get(f'{base_url}/library/sections/{tv_section_key}/all', params={})
-	results.raise_for_status()
-	results_json = results.json()
-	return results_json['MediaContainer']['Metadata']
+	Returns the set of every slug in the slug index, whatever config it was built with, or None if there is no index.
+	"""
+	try:
+		with open(SLUG_INDEX_FILE, 'r', encoding='utf-8') as f:
+			f.readline()
+			return {json.loads(line)['slug'] for line in f}
+	except (IOError, json.JSONDecodeError, KeyError):
+		return None
+
+def iter_export_rows(ssn, section_key, metadata, known_franchises):
+	"""
+	Yields the export row of every item in a library section, streaming the section page by page.
+	"""
+	for item in plex_metadata.iter_section_items(ssn, get_base_url(), section_key):
+		slug = item.get('slug') or create_slug(item['title'])
+		yield {
+			'title': item['title'],
+			'slug': slug,
+			'ratingKey': item.get('ratingKey'),
+			'type': item.get('type'),
+			'year': item.get('year'),
+			'genres': sorted(build_genres_set(item.get('Genre'))),
+			'franchise': resolve_franchise(slug, metadata, known_franchises)
+		}
+
+def get_row_writer(output_format, out):
+	"""
+	Returns a function that writes one export row in the requested format.
+	"""
+	if output_format == 'jsonl':
+		return lambda row: out.write(json.dumps(row, ensure_ascii=False) + '\n')
+	if output_format == 'csv':
+		writer = csv.DictWriter(out, fieldnames=EXPORT_FIELDS)
+		writer.writeheader()
+		return lambda row: writer.writerow(dict(row, genres='|'.join(row['genres'])))
+	return lambda row: out.write(f"{row['title']:<50} {row['slug']:<30}\n")
+
+def write_text_header(out, heading):
+	"""
+	Writes the table header of a section in the text format.
+	"""
+	out.write(f"\n{heading}:\n")
+	out.write("-" * 80 + "\n")
+	out.write(f"{'Title':<50} {'Slug':<30}\n")
+	out.write("-" * 80 + "\n")
 
-def run_slug_list(file_location):
+def run_slug_list(args, file_location):
 	"""
-	Main function to print the list of all items and their slugs.
+	Main function to list all items and their slugs, and optionally write the slug index.
 	"""
 	# Adjust paths to use file_location
 	logs_dir = file_location / 'logs'
@@ -97,6 +184,10 @@ def run_slug_list(file_location):
 	# Call the function to initialize PLEX_GLOBALS
 	set_plex_globals()
 
+	output_format = getattr(args, 'format', None) or 'text'
+	output_path = getattr(args, 'output', None)
+	write_index = getattr(args, 'slug_index', False)
+
 	# Setup session
 	ssn = requests.Session()
 	ssn.headers.update({'Accept': 'application/json'})
@@ -107,35 +198,45 @@ def run_slug_list(file_location):
 	
 	# Get section keys
 	movie_section_key, tv_section_key = get_section_keys(ssn)
-
-	# Get all movies and TV shows
-	movies = get_movies(ssn, movie_section_key)
-	tv_shows = get_tv_shows(ssn, tv_section_key)
-
-	# Print header
-	print("\nMovies:")
-	print("-" * 80)
-	print(f"{'Title':<50} {'Slug':<30}")
-	print("-" * 80)
-
-	# Print movies
-	for movie in movies:
-		title = movie['title']
-		slug = movie.get('slug', 'MISSING SLUG')
-		print(f"{title:<50} {slug:<30}")
-
-	# Print TV shows
-	print("\nTV Shows:")
-	print("-" * 80)
-	print(f"{'Title':<50} {'Slug':<30}")
-	print("-" * 80)
-
-	for show in tv_shows:
-		title = show['title']
-		slug = show.get('slug', 'MISSING SLUG')
-		print(f"{title:<50} {slug:<30}")
-
-	# Print summary
-	print("\nSummary:")
-	print(f"Total Movies: {len(movies)}")
-	print(f"Total TV Shows: {len(tv_shows)}")
+	metadata, known_franchises = load_franchise_config(file_location)
+
+	out = open(output_path, 'w', encoding='utf-8', newline='') if output_path else sys.stdout
+	index_file = None
+	if write_index:
+		SLUG_INDEX_FILE.parent.mkdir(exist_ok=True)
+		index_tmp_file = SLUG_INDEX_FILE.with_suffix('.tmp')
+		index_file = open(index_tmp_file, 'w', encoding='utf-8')
+		index_file.write(json.dumps({'config_hash': get_franchise_config_hash(metadata, known_franchises)}) + '\n')
+
+	counts = {}
+	try:
+		write_row = get_row_writer(output_format, out)
+		for heading, section_key in (('Movies', movie_section_key), ('TV Shows', tv_section_key)):
+			if output_format == 'text':
+				write_text_header(out, heading)
+			counts[heading] = 0
+			for row in iter_export_rows(ssn, section_key, metadata, known_franchises):
+				write_row(row)
+				counts[heading] += 1
+				if index_file:
+					index_file.write(json.dumps({'ratingKey': row['ratingKey'], 'slug': row['slug'], 'franchise': row['franchise']}, ensure_ascii=False) + '\n')
+	finally:
+		if output_path:
+			out.close()
+		if index_file:
+			index_file.close()
+
+	if index_file:
+		index_tmp_file.replace(SLUG_INDEX_FILE)
+
+	# Print summary; machine-readable output on stdout is kept clean
+	if output_format == 'text' or output_path:
+		summary = sys.stdout if output_path else out
+		summary.write("\nSummary:\n")
+		summary.write(f"Total Movies: {counts['Movies']}\n")
+		summary.write(f"Total TV Shows: {counts['TV Shows']}\n")
+		if write_index:
+			summary.write(f"Slug index written to {SLUG_INDEX_FILE}\n")
+
+	# Persist the library crawl so later steps of the pipeline can reuse it
+	plex_metadata.save_metadata_cache()
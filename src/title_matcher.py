@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+
+"""
+Fuzzy title matching.
+
+Used to pick the right OMDB search result for a wishlist title (create_plex_folders) and to
+find the folder on disk that holds a Plex item (plex_library_report).
+
+Candidates are prepared once: each gets its normalized title, its token set and its
+character trigrams. An index over the candidates answers exact matches with one dictionary
+lookup and only scores the candidates that share a token with the title, so matching many
+titles against a large folder stays fast.
+
+Scores are between 0 and 1: the mean of the token and trigram Jaccard similarities, blended
+with how close the release years are when both are known. Candidates whose extra words are
+numbers (sequels such as "Alien 3" or "Rocky II") can be rejected.
+"""
+
+import re
+from functools import lru_cache
+
+# Trailing release years of a title or folder name: "Title 2006", "Title 2006-2013", "Title 2006-" or "Title (2006)"
+YEAR_SUFFIX_PATTERN = re.compile(r'\s+\(?(?P<year>\d{4})(?:\s*[-–]\s*(?:\d{4})?)?\)?\s*$')
+
+# First four digit number of an OMDB year such as "2004–2010"
+YEAR_PATTERN = re.compile(r'\d{4}')
+
+NON_ALPHANUMERIC_PATTERN = re.compile(r'[^a-z0-9\s]')
+
+# Words that make a candidate a sequel or alternate cut when the title does not have them
+ROMAN_NUMERALS = frozenset(('ii', 'iii', 'iv', 'v', 'vi', 'vii', 'viii', 'ix', 'x'))
+
+# Share of the score that comes from year proximity, and the year gap at which it reaches zero
+YEAR_WEIGHT = 0.2
+YEAR_WINDOW = 5
+
+@lru_cache(maxsize=None)
+def normalize_title(title: str) -> str:
+	"""Normalize a title by removing non-alphanumeric characters and converting to lowercase"""
+	# Replace hyphens and apostrophes with spaces to preserve word boundaries
+	title = title.lower().replace('-', ' ').replace("'", ' ')
+
+	# Remove all other non-alphanumeric characters and collapse the spaces
+	return ' '.join(NON_ALPHANUMERIC_PATTERN.sub('', title).split())
+
+def strip_years(title: str) -> str:
+	"""Remove the trailing release years from a title or folder name"""
+	return YEAR_SUFFIX_PATTERN.sub('', title)
+
+def get_start_year(title: str):
+	"""Return the first trailing release year of a title or folder name, or None"""
+	match = YEAR_SUFFIX_PATTERN.search(title)
+	return match.group('year') if match else None
+
+def parse_year(year):
+	"""Return the first year in an OMDB or Plex year value as an int, or None"""
+	if isinstance(year, int):
+		return year
+	match = YEAR_PATTERN.search(str(year or ''))
+	return int(match.group()) if match else None
+
+def get_trigrams(normalized: str) -> frozenset:
+	"""Return the character trigrams of a normalized title, padded so short titles still have some"""
+	padded = f'  {normalized} '
+	return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+def prepare_candidate(title: str, year=None, value=None) -> dict:
+	"""
+	Precompute everything needed to score a candidate title.
+
+	Args:
+		title: The candidate title, without its years
+		year: The candidate's release year, in any form parse_year accepts
+		value: What the caller wants back when this candidate matches (defaults to the title)
+	"""
+	normalized = normalize_title(title)
+	return {
+		'title': title,
+		'normalized': normalized,
+		'tokens': frozenset(normalized.split()),
+		'trigrams': get_trigrams(normalized),
+		'year': parse_year(year),
+		'value': title if value is None else value
+	}
+
+def build_index(candidates) -> dict:
+	"""Index prepared candidates by normalized title and by token"""
+	index = {'candidates': list(candidates), 'by_normalized': {}, 'by_token': {}}
+	for position, candidate in enumerate(index['candidates']):
+		candidate['position'] = position
+		index['by_normalized'].setdefault(candidate['normalized'], []).append(candidate)
+		for token in candidate['tokens']:
+			index['by_token'].setdefault(token, []).append(candidate)
+	return index
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+	"""Return the Jaccard similarity of two sets"""
+	if not a and not b:
+		return 1.0
+	return len(a & b) / len(a | b)
+
+def get_year_score(year, candidate_year) -> float:
+	"""Return 1 for the same year, falling to 0 at YEAR_WINDOW years apart"""
+	return max(0.0, 1 - abs(year - candidate_year) / YEAR_WINDOW)
+
+def score(query: dict, candidate: dict) -> float:
+	"""Score how well a prepared candidate matches a prepared query, between 0 and 1"""
+	text_score = (jaccard(query['tokens'], candidate['tokens']) + jaccard(query['trigrams'], candidate['trigrams'])) / 2
+	if query['year'] is None or candidate['year'] is None:
+		return text_score
+	return (1 - YEAR_WEIGHT) * text_score + YEAR_WEIGHT * get_year_score(query['year'], candidate['year'])
+
+def is_sequel(query: dict, candidate: dict) -> bool:
+	"""Check whether the candidate adds numbers to the query title, as sequels and alternate cuts do"""
+	extra_tokens = candidate['tokens'] - query['tokens']
+	return any(token.isdigit() or token in ROMAN_NUMERALS for token in extra_tokens)
+
+def is_year_mismatch(year, candidate: dict) -> bool:
+	"""Check whether the candidate has a release year and it differs from a known year"""
+	return year is not None and candidate['year'] is not None and candidate['year'] != year
+
+def find_exact_match(title: str, index: dict, year=None, require_year: bool = False):
+	"""
+	Return the candidate whose normalized title equals the title, or None.
+	When several match, the one closest to the year wins, otherwise the first.
+	With require_year, candidates with a different known year never match.
+	"""
+	matches = index['by_normalized'].get(normalize_title(title))
+	year = parse_year(year)
+	if matches and require_year:
+		matches = [candidate for candidate in matches if not is_year_mismatch(year, candidate)]
+	if not matches:
+		return None
+	if year is None:
+		return matches[0]
+	return min(matches, key=lambda candidate: abs(candidate['year'] - year) if candidate['year'] is not None else YEAR_WINDOW)
+
+def find_best_match(title: str, index: dict, cutoff: float = 0.6, year=None, reject_sequels: bool = False, require_year: bool = False):
+	"""
+	Return the best scoring candidate for a title, or None if none reaches the cutoff.
+	Only candidates sharing at least one word with the title are scored; ties go to the earlier candidate.
+	With require_year, candidates with a different known year are skipped.
+	"""
+	query = prepare_candidate(title, year)
+	seen = set()
+	best, best_key = None, None
+	for token in query['tokens']:
+		for candidate in index['by_token'].get(token, ()):
+			if candidate['position'] in seen:
+				continue
+			seen.add(candidate['position'])
+			if reject_sequels and is_sequel(query, candidate):
+				continue
+			if require_year and is_year_mismatch(query['year'], candidate):
+				continue
+			candidate_score = score(query, candidate)
+			key = (candidate_score, -candidate['position'])
+			if candidate_score >= cutoff and (best_key is None or key > best_key):
+				best, best_key = candidate, key
+	return best
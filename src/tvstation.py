@@ -32,6 +32,7 @@ Setup:
 		max_episodes: The maximum number of episodes that will be included in the playlist.
 		omdb_api_key: (Optional) Your OMDB API key for fetching movie years.
 		omdb_api_url: (Optional) The OMDB API URL. Defaults to http://www.omdbapi.com/.
+		plex_metadata_ttl: (Optional) Seconds a Plex library crawl may be reused by later runs. Defaults to 0 (only reused within a tv.sh or full_update.sh run).
 
 	Create a local_config.json file to customize rewatch delays and metadata. You can use the provided local_config-example.json as a starting point:
 	{
@@ -63,90 +64,28 @@ import os
 import random
 import time
 import hashlib
-import json
+import math
 import requests
-import re
-from utils import build_genres_set, get_nested_json_value, get_local_ip
+import omdb_client
+import plex_metadata
+import run_log
+from config_compiler import build_restricted_slug_matcher, load_compiled_config
+from slug_list import load_slug_index
+from utils import build_genres_set, create_slug, get_franchise_config_hash, get_genre_bit, get_nested_json_value, get_local_ip, resolve_franchise
 
 # Global variables
 log_file = None
 local_config_file = None
 PLEX_GLOBALS = {}
 
-# Load genre mappings from file
-GENRE_MAPPINGS_PATH = '/home/rob/repos/plex-tvstation/src/genre_mappings.json'
-try:
-	with open(GENRE_MAPPINGS_PATH, 'r') as f:
-		GENRE_MAPPINGS = json.load(f)
-except Exception:
-	GENRE_MAPPINGS = {}
-
-def parse_duration_to_days(duration):
-	"""
-	Parse a duration string or integer into days.
-	
-	Args:
-		duration: Either an integer representing days, or a string in the format "{number} {unit}"
-			where unit is one of: day, days, month, months, year, years
-			
-	Returns:
-		int: The number of days the duration represents
-	"""
-	if isinstance(duration, int):
-		return duration
-		
-	if not isinstance(duration, str):
-		log_message(f"Warning: Invalid duration format: {duration}. Using default of 1 year.")
-		return 365
-		
-	# Parse the duration string
-	match = re.match(r'^(\d+)\s+(day|days|month|months|year|years)$', duration.lower())
-	if not match:
-		log_message(f"Warning: Invalid duration format: {duration}. Using default of 1 year.")
-		return 365
-		
-	number = int(match.group(1))
-	unit = match.group(2)
-	
-	# Convert to days
-	if unit in ['day', 'days']:
-		return number
-	elif unit in ['month', 'months']:
-		return number * 30
-	elif unit in ['year', 'years']:
-		return number * 365
-		
-	return 365  # Default to 1 year if something goes wrong
-
 def set_plex_globals(args, local_config_file, log_dir):
 	"""
 	Set the PLEX_GLOBALS dictionary with values from the local_config.json file.
 	"""
 	global PLEX_GLOBALS
 	
-	# Load missing metadata from JSON file
-	try:
-		with open(local_config_file, 'r') as f:
-			LOCAL_CONFIG = json.load(f)
-	except FileNotFoundError:
-		LOCAL_CONFIG = {
-			"defaultRewatchDelay": {
-				"movies": "180 days",
-				"tv": "90 days"
-			},
-			"excluded_slugs": [],
-			"franchises": [],
-			"metadata": [],
-			"movie_series_slugs": [],
-			"restricted_play_months": {}
-		}
-
-	# Convert default rewatch delays to days
-	default_rewatch_delays = LOCAL_CONFIG.get('defaultRewatchDelay', {'movies': '180 days', 'tv': '90 days'})
-	default_rewatch_delays_days = {
-		'movies': parse_duration_to_days(default_rewatch_delays['movies']),
-		'tv': parse_duration_to_days(default_rewatch_delays['tv'])
-	}
+	# Load the compiled local_config.json, recompiling it if the file changed
+	local_config, config_problems = load_compiled_config(local_config_file)
 
 	# Set the base playlist name based on env var or default
 	playlist_name = getenv('playlist_name', 'TV Station')
@@ -159,7 +98,11 @@ def set_plex_globals(args, local_config_file, log_dir):
 	if args.franchise:
 		franchise = create_slug(args.franchise)
 	
-	known_franchises = [create_slug(f) for f in LOCAL_CONFIG.get('franchises', [])]
+	known_franchises = local_config['known_franchises']
+	metadata = local_config['metadata']
+
+	# Franchises precomputed by the slugs action, if they match the current config
+	franchise_by_slug = load_slug_index(get_franchise_config_hash(metadata, known_franchises))
 
 	# If franchise is set, use it for the playlist name and ignore genre
 	if franchise:
@@ -175,29 +118,6 @@ def set_plex_globals(args, local_config_file, log_dir):
 	# Log file name
 	log_file_name = f'{playlist_name.replace(" ", "-").lower()}.md'
 
-	# Build comfort slugs list from config (strings or objects with slug/title)
-	comfort_entries = LOCAL_CONFIG.get('comfortShows', [])
-	comfort_slugs = []
-	for entry in comfort_entries:
-		if isinstance(entry, str):
-			comfort_slugs.append(entry.strip().lower())
-		elif isinstance(entry, dict):
-			slug_val = entry.get('slug')
-			if slug_val:
-				comfort_slugs.append(str(slug_val).strip().lower())
-				continue
-			title_val = entry.get('title')
-			if title_val:
-				comfort_slugs.append(create_slug(title_val))
-
-	# Deduplicate while preserving order
-	seen_cs = set()
-	comfort_slugs_ordered = []
-	for s in comfort_slugs:
-		if s and s not in seen_cs:
-			seen_cs.add(s)
-			comfort_slugs_ordered.append(s)
-
 	# Initialize PLEX_GLOBALS dictionary
 	PLEX_GLOBALS = {
 		'log_only': args.log_only,
@@ -211,16 +131,21 @@ def set_plex_globals(args, local_config_file, log_dir):
 		'plex_api_token': getenv('plex_api_token', ''),
 		'user_id': getenv('user_id', '1'),
 		'max_episodes': int(getenv('max_episodes', 50)),
-		'excluded_slugs': LOCAL_CONFIG.get('excludedSlugs', []),
+		'excluded_slugs': local_config['excluded_slugs'],
 		'omdb_api_key': getenv('omdb_api_key', ''),
-		'omdb_api_url': getenv('omdb_api_url', 'http://www.omdbapi.com/'),
-		'defaultRewatchDelayDays': default_rewatch_delays_days,
-		'metadata': LOCAL_CONFIG.get('metadata', []),
-		'restricted_play_months': LOCAL_CONFIG.get('restrictedPlayMonths', {}),
-		'tv_show_limit': LOCAL_CONFIG.get('tvShowLimit', 0),
+		'defaultRewatchDelayDays': local_config['default_rewatch_delay_days'],
+		'metadata': metadata,
+		'metadata_by_slug': local_config['metadata_by_slug'],
+		'config_problems': config_problems,
+		'restricted_play_months': local_config['restricted_play_months'],
+		'restricted_slug_pattern': build_restricted_slug_matcher(local_config['restricted_play_months'], time.strftime("%B")),
+		'tv_show_limit': local_config['tv_show_limit'],
 		'genre': genre if not franchise else None,
+		'genre_bit': get_genre_bit(genre) if genre and not franchise else 0,
 		'franchise': franchise,
 		'known_franchises': known_franchises,
+		'slug_by_title': {},  # Slugs computed from titles this run
+		'franchise_by_slug': franchise_by_slug,
 
 		'base_url': None,
 		'machine_id': None,
@@ -231,9 +156,12 @@ def set_plex_globals(args, local_config_file, log_dir):
 		'series_keys': [],  # List of objects with {key, last_viewed_at} properties
 		'series_seasons': {},
 		'series_episodes': {},
+		'series_windows': {},  # Load cursors for series with episodes not yet paged in
 
 		'playlist_episode_keys': [],
-		'comfort_slugs': comfort_slugs_ordered
+		'comfort_slugs': local_config['comfort_slugs'],
+
+		'run': None  # Run record for logs/runs.jsonl, see run_log.start_run
 	}
 
 def log_message(*args):
@@ -253,24 +181,6 @@ def log_message(*args):
 	with open(PLEX_GLOBALS['log_file'], 'a') as f:
 		f.write(f"{message}\n")
 
-def log_cron_message(script_name, args=None, message=None):
-	"""
-	Log a basic message to cron.log with script name and arguments.
-	This is used for cron job logging.
-	"""
-	cron_log = PLEX_GLOBALS['log_dir'] / 'cron.log'
-	
-	# Get current timestamp
-	timestamp = time.strftime('%Y-%m-%d %H:%M:%S')
-	
-	# Only include non-None arguments that were actually passed
-	args_str = ' '.join(f"{k}={v}" for k, v in args.items() if v is not None) if args else ''
-	with open(cron_log, 'a') as f:
-		if message:
-			f.write(f"[{timestamp}] {message}\n")
-		else:
-			f.write(f"[{timestamp}] Running {script_name} with args: {args_str}\n")
-
 def load_globals(ssn):
 	"""
 	Initializes global variables by fetching the base URL, section keys for Movies and TV Shows,
@@ -280,7 +190,6 @@ def load_globals(ssn):
 	get_base_url()
 	# Test connectivity before attempting operations
 	test_plex_connectivity(ssn)
-	clean_restricted_play_months()
 	get_section_keys(ssn)
 	get_playlist_key(ssn)
 
@@ -500,6 +409,7 @@ def mark_as_unwatched(ssn, media_key):
 	"""
 	base_url = get_base_url()
 	ssn.get(f'{base_url}/:/unscrobble?identifier=com.plexapp.plugins.library&key={media_key}')
+	plex_metadata.invalidate(media_key)
 
 def is_partially_watched(episode):
 	"""
@@ -507,16 +417,17 @@ def is_partially_watched(episode):
 	"""
 	return not episode['isWatched'] and episode.get('lastViewedAt', 0) > 0
 
-def create_slug(title):
+def get_media_slug(media):
 	"""
-	Creates a slug from a title by converting to lowercase, replacing spaces with dashes,
-	and removing any characters that are not letters or dashes.
+	Returns the slug of a movie or series, from Plex or its current title, computed once per title per run.
 	"""
-	if title is None:
-		return None
-	
-	slug = re.sub(r'[^a-z0-9-]', '', re.sub(' ', '-', title.lower())).strip()
-	return slug
+	if 'slug' in media:
+		return media['slug']
+	slug_by_title = PLEX_GLOBALS['slug_by_title']
+	title = media['title']
+	if title not in slug_by_title:
+		slug_by_title[title] = create_slug(title)
+	return slug_by_title[title]
 
 def get_movie_year_from_imdb(movie_title):
 	"""
@@ -525,19 +436,17 @@ def get_movie_year_from_imdb(movie_title):
 	"""
 	
 	try:
-		# Use the OMDB API which is free and doesn't require authentication
-		api_key = PLEX_GLOBALS['omdb_api_key']
-		api_url = PLEX_GLOBALS['omdb_api_url']
-		if not api_key:
+		if not PLEX_GLOBALS['omdb_api_key']:
 			log_message(f"Warning: OMDB API key not found. Cannot fetch year for movie: {movie_title}")
 			return 0
 		
 		# Keep cutting off the last word until we get a response
 		adjusted_movie_title = movie_title
 		while adjusted_movie_title != '':
-			response = requests.get(f"{api_url}?s={adjusted_movie_title}&apikey={api_key}")
-			data = response.json() if response.status_code == 200 and response.json().get('Response') == 'True' else None
-			if data and len(data.get('Search', [])) > 0:
+			data = omdb_client.query({'s': adjusted_movie_title})
+			if omdb_client.is_fatal_error(data):
+				break
+			if data.get('Response') == 'True' and len(data.get('Search', [])) > 0:
 				return int(data.get('Search')[0].get('Year'), 0)
 			adjusted_movie_title = adjusted_movie_title.rsplit(' ', 1)[0] if len(adjusted_movie_title.split(' ')) > 1 else ''
 	except Exception as e:
@@ -569,15 +478,187 @@ def create_episode_entry(episode_key, overall_index, last_viewed_at, view_count,
 		'series_title': episode['grandparentTitle']
 	}
 
+def get_percent_complete(ssn, series, was_reset=False):
+	"""
+	Calculates how far through a series the next unwatched episode is, as a percentage.
+	Uses the leafCount/viewedLeafCount aggregates on the series and only enumerates its
+	episodes when those look inconsistent.
+	
+	Args:
+		ssn: The requests session object
+		series: The series object from the TV section listing
+		was_reset: True if the series was fully watched and has just been marked unwatched
+		
+	Returns:
+		float: The percent complete, where the next episode is episode 1 for a reset series
+	"""
+	total_episodes, watched_episodes = plex_metadata.get_watch_counts(ssn, get_base_url(), series)
+	if total_episodes == 0:
+		return 0
+	
+	next_episode_index = 1 if was_reset or watched_episodes >= total_episodes else watched_episodes + 1
+	return next_episode_index / total_episodes * 100
+
+def is_always_include(series_slug):
+	"""
+	Checks whether a series is configured with alwaysInclude in the local config metadata.
+	"""
+	if not series_slug:
+		return False
+	
+	series_config = PLEX_GLOBALS['metadata_by_slug'].get(series_slug, {})
+	always_include_value = series_config.get('alwaysInclude', False)
+	
+	# Handle different types of alwaysInclude values
+	if isinstance(always_include_value, bool):
+		return always_include_value
+	elif isinstance(always_include_value, int):
+		return always_include_value == 1
+	return False
+
+def get_series_rewatch_delay_days(series_slug):
+	"""
+	Returns the rewatch delay in days for a series, falling back to the default TV delay.
+	"""
+	series_config = PLEX_GLOBALS['metadata_by_slug'].get(series_slug, {})
+	return series_config.get('rewatchDelayDays', PLEX_GLOBALS['defaultRewatchDelayDays']['tv'])
+
+def get_window_size(series_count):
+	"""
+	Returns how many episodes the round-robin can take from each series,
+	given the playlist size and the number of series sharing it.
+	"""
+	_, _, _, max_episodes = get_playlist_globals()
+	return max(math.ceil(max_episodes / max(series_count, 1)), 1)
+
+def make_series_episode_entry(episode, season, overall_index, was_reset=False):
+	"""
+	Creates the series_episodes entry for an episode from a season's children.
+	Episodes of a series that was just reset keep no view time, since their watch history is from the previous run-through.
+	"""
+	episode = dict(episode)  # Copy since the crawl is shared with other readers
+	episode['index'] = overall_index
+	last_viewed_at = 0 if was_reset else episode.get('lastViewedAt', 0)
+	view_count = episode.get('viewCount', 0)
+	return create_episode_entry(episode['ratingKey'], overall_index, last_viewed_at, view_count, episode, season['title'], episode['title'])
+
+def read_series_window(ssn, series_key, window_size):
+	"""
+	Pages in at least window_size more episodes of a series from its load cursor and appends them to series_episodes.
+	Episodes are read a season at a time, so a window can run past window_size up to the end of a season.
+	
+	Returns:
+		int: The number of episodes added, 0 once the series has no more episodes
+	"""
+	cursor = PLEX_GLOBALS['series_windows'].get(series_key)
+	if cursor is None:
+		return 0
+
+	base_url = get_base_url()
+	entries = PLEX_GLOBALS['series_episodes'][series_key]
+	added = 0
+	while added < window_size and cursor['season_pos'] < len(cursor['seasons']):
+		season = cursor['seasons'][cursor['season_pos']]
+		cursor['season_pos'] += 1
+		for episode in plex_metadata.get_children(ssn, base_url, season['ratingKey']):
+			cursor['next_index'] += 1
+			entries.append(make_series_episode_entry(episode, season, cursor['next_index'], cursor['was_reset']))
+			added += 1
+
+	# Drop the cursor once every season has been read
+	if cursor['season_pos'] >= len(cursor['seasons']):
+		del PLEX_GLOBALS['series_windows'][series_key]
+
+	return added
+
+def has_more_episodes(series_key):
+	"""
+	Checks whether a series still has episodes that have not been paged in.
+	"""
+	return series_key in PLEX_GLOBALS['series_windows']
+
+def load_series_episodes(ssn, series_key, series_slug, was_reset=False, window_size=None):
+	"""
+	Loads the next episodes of a series and stores them in series_episodes.
+	Each series starts with the episode after the most recently watched episode.
+	Seasons that the season-level viewedLeafCount shows as fully watched are skipped without fetching their episodes,
+	and only about window_size episodes are paged in from the first unwatched episode on.
+	More can be paged in later with read_series_window if the playlist runs short.
+	"""
+	base_url = get_base_url()
+	series_keys, series_seasons, series_episodes = get_series_globals()
+	if window_size is None:
+		window_size = get_window_size(1)
+
+	seasons = plex_metadata.get_children(ssn, base_url, series_key)
+	series_seasons[series_key] = seasons
+
+	# Find the first unwatched episode, skipping fully watched seasons
+	episode_entries = []
+	episode_index = 0  # 1-indexed episode number of the last episode passed
+	most_recent_viewed_at = 0
+	season_pos = 0
+	found_unwatched = False
+
+	while season_pos < len(seasons) and not found_unwatched:
+		season = seasons[season_pos]
+		season_pos += 1
+
+		# A series that was just reset starts at its first episode
+		if not was_reset and plex_metadata.has_consistent_counts(season) and season['viewedLeafCount'] >= season['leafCount']:
+			episode_index += season['leafCount']
+			most_recent_viewed_at = max(most_recent_viewed_at, season.get('lastViewedAt', 0))
+			continue
+
+		for episode in plex_metadata.get_children(ssn, base_url, season['ratingKey']):
+			episode_index += 1
+			if found_unwatched:
+				episode_entries.append(make_series_episode_entry(episode, season, episode_index, was_reset))
+			elif was_reset or episode.get('viewCount', 0) == 0:
+				found_unwatched = True
+				episode_entries.append(make_series_episode_entry(episode, season, episode_index, was_reset))
+			else:
+				# Save the viewed time of the last watched episode before the first unwatched episode was found
+				# Don't consider watched episodes that are after the first unwatched episode
+				most_recent_viewed_at = max(most_recent_viewed_at, episode.get('lastViewedAt', 0))
+
+	# If all episodes are watched and the series was not already reset during planning,
+	# the show-level counts were out of date, so apply the rewatch delay here
+	if not found_unwatched:
+		if was_reset or (time.time() - most_recent_viewed_at) < (get_series_rewatch_delay_days(series_slug) * 24 * 60 * 60):  # Convert days to seconds
+			# If all episodes are watched but the rewatch delay has not passed, leave the series out of the playlist
+			return
+		mark_as_unwatched(ssn, series_key)
+		return load_series_episodes(ssn, series_key, series_slug, True, window_size)
+
+	# Add the series keys with the most recent viewed at time and the series length for progress reporting
+	series_keys.append({
+		'key': series_key,
+		'last_viewed_at': most_recent_viewed_at,
+		'slug': series_slug,
+		'total_episodes': sum(season.get('leafCount', 0) for season in seasons)
+	})
+	series_episodes[series_key] = episode_entries
+
+	# Page in the rest of the window from the following seasons
+	PLEX_GLOBALS['series_windows'][series_key] = {
+		'seasons': seasons,
+		'season_pos': season_pos,
+		'next_index': episode_index,
+		'was_reset': was_reset
+	}
+	read_series_window(ssn, series_key, window_size - len(episode_entries))
+
 def build_series_episodes(ssn):
 	"""
-	Builds the series episodes for the Plex server.
-	Retrieves all series and their seasons from the Plex server and builds a list of episodes for each series.
-	Each series is then sorted by the date of the most recently watched episode, starting with the episode after the most recently watched episode.
+	Builds the series episodes for the Plex server in two phases.
+	First every eligible series is ranked using only the show-level fields from the section listing
+	(leafCount/viewedLeafCount, lastViewedAt and alwaysInclude), which also decides the rewatch delay for fully watched series.
+	Then episodes are loaded only for the series that survive the TV show limit, and only as many as the playlist can use.
+	Each series starts with the episode after the most recently watched episode.
 	"""
 	base_url = get_base_url()
 	_, tv_section_key = get_section_keys(ssn)
-	series_keys, series_seasons, series_episodes = get_series_globals()
 
 	# Validate tv_show_limit is a positive integer
 	tv_show_limit = PLEX_GLOBALS.get('tv_show_limit', 0)
@@ -586,19 +667,17 @@ def build_series_episodes(ssn):
 		tv_show_limit = 0
 		PLEX_GLOBALS['tv_show_limit'] = 0
 
-	series_list = ssn.get(f'{base_url}/library/sections/{tv_section_key}/all', params={}).json()['MediaContainer']['Metadata']
+	series_list = plex_metadata.get_section_items(ssn, base_url, tv_section_key)
 	series_list = sorted(series_list, key=lambda x: hashlib.md5(x['title'].encode()).hexdigest())
 
-	# Get all series and their seasons
+	# Phase 1: rank the eligible series using show-level fields only
 	total_series = 0
+	candidates = []
 	for s in series_list:
-		series_slug = s.get('slug', create_slug(s['title']))
+		series_slug = get_media_slug(s)
 		if series_slug in PLEX_GLOBALS['excluded_slugs']:
 			continue
 
-		# Get the genres for the series
-		series_genres = build_genres_set(s.get('Genre'))
-
 		# Check if series has the requested franchise or genre
 		if PLEX_GLOBALS['franchise']:
 			# If franchise is set, check if this series belongs to that franchise
@@ -609,74 +688,37 @@ def build_series_episodes(ssn):
 			# Only include series explicitly listed in comfortShows
 			if series_slug not in PLEX_GLOBALS.get('comfort_slugs', []):
 				continue
-		elif PLEX_GLOBALS['genre'] and PLEX_GLOBALS['genre'] not in series_genres:
+		elif PLEX_GLOBALS['genre'] and not s['genreMask'] & PLEX_GLOBALS['genre_bit']:
 			continue
 		
 		total_series += 1
 
 		series_key = s['ratingKey']
-		series_seasons[series_key] = ssn.get(f'{base_url}/library/metadata/{series_key}/children', params={}).json()['MediaContainer']['Metadata']
-		series_episodes[series_key] = []
-
-		# Get all episodes and their watched status
-		# Track episode keys and whether they are watched or not
-		first_unwatched_episode = None
-		start_index = 0
-		episode_index = 0  # Changed from -1 to 0 to make it 1-indexed
-		most_recent_viewed_at = 0
-
-		for season in series_seasons[series_key]:
-			season_title = season['title']
-			season_key = season["ratingKey"]
-
-			episodes = ssn.get(f'{base_url}/library/metadata/{season_key}/children', params={}).json()['MediaContainer']['Metadata']
-			for episode in episodes:
-				episode_index += 1  # Increment first to make it 1-indexed to represent the episode number
-				episode_key = episode['ratingKey']
-				episode_title = episode['title']
-				last_viewed_at = episode.get('lastViewedAt', 0)
-				view_count = episode.get('viewCount', 0)
-				episode['index'] = episode_index
-				
-				series_episodes[series_key].append(
-					create_episode_entry(episode_key, episode_index, last_viewed_at, view_count, episode, season_title, episode_title)
-				)
-				if first_unwatched_episode is None and view_count == 0:
-					first_unwatched_episode = episode
-					start_index = episode_index - 1  # Subtract 1 to make it 0-indexed to represent the episode number
-				elif first_unwatched_episode is None:
-					# Save the viewed time of the last watched episode before the first unwatched episode was found
-					# Don't consider watched episodes that are after the first unwatched episode
-					if last_viewed_at > most_recent_viewed_at:
-						most_recent_viewed_at = last_viewed_at
-
-		# Add the series keys with the most recent viewed at time
-		series_keys.append({
-			'key': series_key,
-			'last_viewed_at': most_recent_viewed_at,
-			'slug': series_slug
-		})
+		total_episodes, watched_episodes = plex_metadata.get_watch_counts(ssn, base_url, s)
+		if total_episodes == 0:
+			continue
 
-		# If all episodes are watched, mark them as unwatched
-		all_watched = first_unwatched_episode is None
-		if all_watched:
-			# Get the rewatch delay from LOCAL_CONFIG
-			series_config = next((item for item in PLEX_GLOBALS['metadata'] if item.get('slug') == series_slug), {})
-			rewatch_delay = series_config.get('rewatchDelay', PLEX_GLOBALS['defaultRewatchDelayDays']['tv'])
-			rewatch_delay_days = parse_duration_to_days(rewatch_delay)
-			
-			if (time.time() - most_recent_viewed_at) >= (rewatch_delay_days * 24 * 60 * 60):  # Convert days to seconds
+		# If all episodes are watched, mark them as unwatched once the rewatch delay has passed.
+		# The show's lastViewedAt is the most recent view of any of its episodes.
+		was_reset = False
+		if watched_episodes >= total_episodes:
+			most_recent_viewed_at = s.get('lastViewedAt', 0)
+			if (time.time() - most_recent_viewed_at) >= (get_series_rewatch_delay_days(series_slug) * 24 * 60 * 60):  # Convert days to seconds
 				mark_as_unwatched(ssn, series_key)
+				was_reset = True
 			else:
 				# If all episodes are watched but the rewatch delay has not passed, remove the series from the playlist
-				series_keys = [obj for obj in series_keys if obj['key'] != series_key]
-				del series_episodes[series_key]
+				continue
 
-		if start_index > 0 and series_episodes.get(series_key) is not None:
-			series_episodes[series_key] = series_episodes[series_key][start_index:]
-	
-		# If no movies found after filtering, log a message and return
-	
+		candidates.append({
+			'key': series_key,
+			'slug': series_slug,
+			'percent_complete': get_percent_complete(ssn, s, was_reset),
+			'always_include': is_always_include(series_slug),
+			'was_reset': was_reset
+		})
+
+	# If no series found after filtering, log a message and return
 	if total_series == 0:
 		if PLEX_GLOBALS['franchise']:
 			log_message(f"\nNo series found in franchise: {PLEX_GLOBALS['franchise']}")
@@ -688,57 +730,14 @@ def build_series_episodes(ssn):
 		return
 
 	# Apply TV show limit if enabled
+	series_to_load = candidates
 	if tv_show_limit > 0:
-		# Create a list to store series with their percent_complete values
-		series_with_percent = []
-		
-		# Calculate percent_complete for each series
-		for series_key in series_episodes:
-			if series_key == 'movies':  # Skip the movies series
-				continue
-			
-			# Get the index of the first episode and the total number of episodes
-			if series_episodes[series_key]:
-				first_episode_index = series_episodes[series_key][0]['index']
-				last_episode_index = series_episodes[series_key][-1]['index']
-				
-				# Calculate percent_complete
-				percent_complete = (first_episode_index / last_episode_index * 100) if last_episode_index > 0 else 0
-				
-				# Get the series slug from series_keys
-				series_slug = None
-				for s in series_keys:
-					if s['key'] == series_key:
-						series_slug = s['slug']
-						break
-				
-				# Check if this series should always be included
-				always_include = False
-				if series_slug:
-					series_config = next((item for item in PLEX_GLOBALS['metadata'] if item.get('slug') == series_slug), {})
-					always_include_value = series_config.get('alwaysInclude', False)
-					
-					# Handle different types of alwaysInclude values
-					if isinstance(always_include_value, bool):
-						always_include = always_include_value
-					elif isinstance(always_include_value, int):
-						always_include = always_include_value == 1
-					else:
-						always_include = False
-				
-				# Add to the list with percent_complete and always_include flag
-				series_with_percent.append({
-					'key': series_key,
-					'percent_complete': percent_complete,
-					'always_include': always_include
-				})
-		
 		# Sort by percent_complete in descending order
-		series_with_percent.sort(key=lambda x: x['percent_complete'], reverse=True)
+		ranked_series = sorted(candidates, key=lambda x: x['percent_complete'], reverse=True)
 		
 		# Separate always_include series from others
-		always_include_series = [s for s in series_with_percent if s['always_include']]
-		other_series = [s for s in series_with_percent if not s['always_include']]
+		always_include_series = [s for s in ranked_series if s['always_include']]
+		other_series = [s for s in ranked_series if not s['always_include']]
 		
 		# Check if we have more always_include series than the limit
 		if len(always_include_series) > tv_show_limit:
@@ -746,31 +745,24 @@ def build_series_episodes(ssn):
 			log_message("All 'always include' shows will be included in the playlist. Consider increasing the tv_show_limit setting.")
 			
 			# Keep only the always_include series
-			series_to_keep = [s['key'] for s in always_include_series]
+			series_to_keep = always_include_series
 		else:
 			# Calculate how many other series to keep
 			remaining_slots = tv_show_limit - len(always_include_series)
 			
 			# Keep always_include series plus the top remaining_slots from other_series
-			series_to_keep = [s['key'] for s in always_include_series] + [s['key'] for s in other_series[:remaining_slots]]
-		
-		# Remove series that are not in series_to_keep
-		series_keys = [obj for obj in series_keys if obj['key'] == 'movies' or obj['key'] in series_to_keep]
+			series_to_keep = always_include_series + other_series[:remaining_slots]
 
-		# Remove series episodes that are not in series_to_keep
-		for key in list(series_episodes.keys()):
-			if key != 'movies' and key not in series_to_keep:
-				del series_episodes[key]
+		# Load in listing order so the playlist rotation is unchanged
+		keep_keys = {s['key'] for s in series_to_keep}
+		series_to_load = [s for s in candidates if s['key'] in keep_keys]
 
-		# Verify that the series_episodes keys match the series_keys keys
-		# Check that the length of series_episodes is equal to the length of series_keys
-		# Verify that the series_keys and the series_episodes keys are the same
-		if len(series_episodes.keys()) != len(series_keys) or not all(obj['key'] in series_episodes for obj in series_keys):
-			log_message(f"Warning: The series_episodes keys do not match the series_keys keys. Current value: {series_episodes.keys()}. Expected value: {series_keys}.")
-
-		# Update the series_keys and series_episodes in PLEX_GLOBALS
-		PLEX_GLOBALS['series_keys'] = series_keys
-		PLEX_GLOBALS['series_episodes'] = series_episodes
+	# Phase 2: load episodes only for the series that made the playlist.
+	# Movies share the playlist as one more series unless this is the comfort station.
+	series_count = len(series_to_load) + (0 if PLEX_GLOBALS.get('genre') == 'comfort' else 1)
+	window_size = get_window_size(series_count)
+	for candidate in series_to_load:
+		load_series_episodes(ssn, candidate['key'], candidate['slug'], candidate['was_reset'], window_size)
 
 
 def build_movie_list(ssn):
@@ -788,13 +780,8 @@ def build_movie_list(ssn):
 	movie_section_key, _ = get_section_keys(ssn)
 	series_keys, _, series_episodes = get_series_globals()
 
-	# Get current month for restricted play check
-	current_month = time.strftime("%B").lower()
-
-	results = ssn.get(f'{base_url}/library/sections/{movie_section_key}/all', params={})
-	results.raise_for_status()
-	results_json = results.json()
-	movie_list = results_json['MediaContainer']['Metadata']
+	# Work on copies since the movie entries are modified below and the crawl is shared
+	movie_list = [dict(m) for m in plex_metadata.get_section_items(ssn, base_url, movie_section_key)]
 
 	movie_list = sorted(movie_list, key=lambda x: hashlib.md5(x['title'].encode()).hexdigest())
 	for movie in movie_list:
@@ -806,30 +793,14 @@ def build_movie_list(ssn):
 	# Filter out movies whose slugs are in the excluded_slugs list or restricted by month
 	filtered_movie_list = []
 	for movie in movie_list:
-		movie_slug = movie.get('slug', create_slug(movie['title']))
+		movie_slug = get_media_slug(movie)
 		if movie_slug in PLEX_GLOBALS['excluded_slugs']:
 			continue
 			
 		# Check if movie is restricted by month
-		is_restricted = False
-		for month, slugs in PLEX_GLOBALS['restricted_play_months'].items():
-			# Ensure slugs is a list, defaulting to empty if not present
-			slugs_list = slugs if isinstance(slugs, list) else []
-			if month.lower() != current_month.lower():
-				# Check if any of the partial slugs are contained within the movie's slug
-				for partial_slug in slugs_list:
-					if partial_slug.lower() in movie_slug:
-						is_restricted = True
-						break
-				if is_restricted:
-					break
-				
-		if is_restricted:
+		if is_restricted_this_month(movie_slug):
 			continue
 
-		# Get the genres for the series
-		movie_genres = build_genres_set(movie.get('Genre'))
-
 		# Check if movie has the requested franchise or genre
 		if PLEX_GLOBALS['franchise']:
 			# If franchise is set, check if this movie belongs to that franchise
@@ -840,7 +811,7 @@ def build_movie_list(ssn):
 			# Only include movies explicitly listed in comfortShows
 			if movie_slug not in PLEX_GLOBALS.get('comfort_slugs', []):
 				continue
-		elif PLEX_GLOBALS['genre'] and PLEX_GLOBALS['genre'] not in movie_genres:
+		elif PLEX_GLOBALS['genre'] and not movie['genreMask'] & PLEX_GLOBALS['genre_bit']:
 			continue
 
 		filtered_movie_list.append(movie)
@@ -863,6 +834,7 @@ def build_movie_list(ssn):
 		return
 
 	most_recent_viewed_at = 0
+	imdb_lookups = []
 
 	for movie in movie_list:
 		# Track the most recent viewed movie
@@ -872,18 +844,21 @@ def build_movie_list(ssn):
 
 		if movie.get('year', 0) == 0:
 			# Use existing slug or create new one
-			movie_slug = movie.get('slug', create_slug(movie['title']))
-			movie_config = next((item for item in PLEX_GLOBALS['metadata'] if item.get('slug') == movie_slug), {})
+			movie_slug = get_media_slug(movie)
+			movie_config = PLEX_GLOBALS['metadata_by_slug'].get(movie_slug, {})
 			if movie_config and movie_config.get('year', 0) > 0:
 				movie['year'] = movie_config.get('year', 0)
 				movie['slug'] = movie_config.get('slug', movie_slug)
 			else:
-				# Try to get the year from IMDB API
 				# Use title from local config if available, otherwise use movie title
-				imdb_title = movie_config.get('title', movie['title'])
-				movie['year'] = get_movie_year_from_imdb(imdb_title)
-				if movie['year'] == 0:
-					log_message(f"Warning: Could not determine year for movie: {movie['title']}")
+				imdb_lookups.append((movie, movie_config.get('title', movie['title'])))
+
+	# Fetch the remaining years from the IMDB API concurrently
+	years = omdb_client.map_concurrent(get_movie_year_from_imdb, [imdb_title for _, imdb_title in imdb_lookups])
+	for (movie, _), year in zip(imdb_lookups, years):
+		movie['year'] = year
+		if movie['year'] == 0:
+			log_message(f"Warning: Could not determine year for movie: {movie['title']}")
 
 	# Check if we've reached the threshold (33% or less unwatched)
 	unwatched_count = len([m for m in movie_list if m.get('viewCount', 0) == 0])
@@ -894,10 +869,9 @@ def build_movie_list(ssn):
 		# Go through all movies and check rewatch delays for watched ones
 		for movie in movie_list:
 			if movie.get('viewCount', 0) > 0:  # If movie is watched
-				movie_slug = movie.get('slug', create_slug(movie['title']))
-				movie_config = next((item for item in PLEX_GLOBALS['metadata'] if item.get('slug') == movie_slug), {})
-				rewatch_delay = movie_config.get('rewatchDelay', PLEX_GLOBALS['defaultRewatchDelayDays']['movies'])
-				rewatch_delay_days = parse_duration_to_days(rewatch_delay)
+				movie_slug = get_media_slug(movie)
+				movie_config = PLEX_GLOBALS['metadata_by_slug'].get(movie_slug, {})
+				rewatch_delay_days = movie_config.get('rewatchDelayDays', PLEX_GLOBALS['defaultRewatchDelayDays']['movies'])
 				
 				last_viewed_at = movie.get('lastViewedAt', 0)
 				if last_viewed_at > 0 and (time.time() - last_viewed_at) >= (rewatch_delay_days * 24 * 60 * 60):
@@ -911,7 +885,7 @@ def build_movie_list(ssn):
 			movie['title'] = movie['title'].rsplit(' ', 1)[0]
 		movie['title'] = f'{movie["title"]} ({str(movie["year"])})'
 		movie['series_title'] = 'Movies'
-		movie_slug = movie.get('slug', create_slug(movie['title']))
+		movie_slug = get_media_slug(movie)
 		key_word_parts = filter_common_words(movie_slug)
 		
 		# Check if the movie slug starts with any of the movie series slugs from PLEX_GLOBALS
@@ -953,13 +927,14 @@ def build_movie_list(ssn):
 	series_keys.append({'key': 'movies', 'last_viewed_at': most_recent_viewed_at, 'slug': 'movies'})
 	series_episodes['movies'] = unwatched_movies
 
-def build_playlist_episode_keys():
+def build_playlist_episode_keys(ssn):
 	"""
 	Builds the playlist episode keys for the Plex server.
 	Retrieves all series and their episodes from the Plex server and builds a list of episode keys for the playlist.
 	An episode is selected from each series and added to the playlist, alternating between series.
 	This results in a playlist that rotates between all series, with each series being watched in order, starting with the most recently watched episode.
 	If there is a partially watched episode or movie, it will be the first item in the playlist.
+	Series that run out of paged-in episodes before the playlist is full have their window extended.
 	"""
 	series_keys, _, series_episodes = get_series_globals()
 	_, _, playlist_episode_keys, max_episodes = get_playlist_globals()
@@ -979,31 +954,21 @@ def build_playlist_episode_keys():
 			# Get the series title from the first episode
 			series_title = series_episodes[series_key][0]['series_title']
 			
-			# Calculate percent complete
-			first_episode_index = series_episodes[series_key][0]['index']
-			last_episode_index = series_episodes[series_key][-1]['index']
-			percent_complete = (first_episode_index / last_episode_index * 100) if last_episode_index > 0 else 0
-			
-			# Get the series slug from series_keys
+			# Get the series slug and length from series_keys
 			series_slug = None
+			last_episode_index = series_episodes[series_key][-1]['index']
 			for s in series_keys:
 				if s['key'] == series_key:
 					series_slug = s['slug']
+					last_episode_index = s.get('total_episodes', last_episode_index)
 					break
 			
+			# Calculate percent complete
+			first_episode_index = series_episodes[series_key][0]['index']
+			percent_complete = (first_episode_index / last_episode_index * 100) if last_episode_index > 0 else 0
+			
 			# Check if this series should always be included
-			always_include = False
-			if series_slug:
-				series_config = next((item for item in PLEX_GLOBALS['metadata'] if item.get('slug') == series_slug), {})
-				always_include_value = series_config.get('alwaysInclude', False)
-				
-				# Handle different types of alwaysInclude values
-				if isinstance(always_include_value, bool):
-					always_include = always_include_value
-				elif isinstance(always_include_value, int):
-					always_include = always_include_value == 1
-				else:
-					always_include = False
+			always_include = is_always_include(series_slug)
 			
 			included_series.append({
 				'key': series_key,
@@ -1039,6 +1004,7 @@ def build_playlist_episode_keys():
 	log_message('--------------------------')
 
 	episode_indexes = {}
+	window_size = get_window_size(len(sorted_series))
 	while len(playlist_episode_keys) < max_episodes:
 		for series_obj in sorted_series:
 			series_key = series_obj['key']
@@ -1049,7 +1015,7 @@ def build_playlist_episode_keys():
 				continue
 			
 			next_index = episode_indexes.get(series_key, episode_indexes.get(series_key, 0))
-			if next_index >= len(series_episodes[series_key]):
+			if next_index >= len(series_episodes[series_key]) and read_series_window(ssn, series_key, window_size) == 0:
 				continue
 
 			ekey = series_episodes[series_key][next_index]['ratingKey']
@@ -1062,7 +1028,7 @@ def build_playlist_episode_keys():
 		all_episodes_added = True
 		for series_key in series_episodes:
 			next_index = episode_indexes.get(series_key, episode_indexes.get(series_key, 0))
-			if next_index < len(series_episodes[series_key]):
+			if next_index < len(series_episodes[series_key]) or has_more_episodes(series_key):
 				all_episodes_added = False
 				break
 
@@ -1154,18 +1120,14 @@ def reset_watched_status(ssn):
 	movie_section_key, tv_section_key = get_section_keys(ssn)
 	
 	# Reset movies
-	movie_results = ssn.get(f'{base_url}/library/sections/{movie_section_key}/all', params={})
-	movie_results.raise_for_status()
-	movie_list = movie_results.json()['MediaContainer']['Metadata']
+	movie_list = plex_metadata.get_section_items(ssn, base_url, movie_section_key)
 	
 	# Reset TV shows
-	tv_results = ssn.get(f'{base_url}/library/sections/{tv_section_key}/all', params={})
-	tv_results.raise_for_status()
-	tv_list = tv_results.json()['MediaContainer']['Metadata']
+	tv_list = plex_metadata.get_section_items(ssn, base_url, tv_section_key)
 	
 	# Process movies
 	for movie in movie_list:
-		movie_slug = movie.get('slug', create_slug(movie['title']))
+		movie_slug = get_media_slug(movie)
 		
 		# Skip if movie is in excluded slugs
 		if movie_slug in PLEX_GLOBALS['excluded_slugs']:
@@ -1176,10 +1138,8 @@ def reset_watched_status(ssn):
 			franchise = determine_franchise(movie_slug)
 			if franchise != PLEX_GLOBALS['franchise']:
 				continue
-		elif PLEX_GLOBALS['genre']:
-			movie_genres = build_genres_set(movie.get('Genre'))
-			if PLEX_GLOBALS['genre'] not in movie_genres:
-				continue
+		elif PLEX_GLOBALS['genre'] and not movie['genreMask'] & PLEX_GLOBALS['genre_bit']:
+			continue
 		
 		# Reset watched status
 		if movie.get('viewCount', 0) > 0:
@@ -1188,7 +1148,7 @@ def reset_watched_status(ssn):
 	
 	# Process TV shows
 	for show in tv_list:
-		show_slug = show.get('slug', create_slug(show['title']))
+		show_slug = get_media_slug(show)
 		
 		# Skip if show is in excluded slugs
 		if show_slug in PLEX_GLOBALS['excluded_slugs']:
@@ -1199,18 +1159,16 @@ def reset_watched_status(ssn):
 			franchise = determine_franchise(show_slug)
 			if franchise != PLEX_GLOBALS['franchise']:
 				continue
-		elif PLEX_GLOBALS['genre']:
-			show_genres = build_genres_set(show.get('Genre'))
-			if PLEX_GLOBALS['genre'] not in show_genres:
-				continue
+		elif PLEX_GLOBALS['genre'] and not show['genreMask'] & PLEX_GLOBALS['genre_bit']:
+			continue
 		
 		# Get all episodes for this show
 		show_key = show['ratingKey']
-		seasons = ssn.get(f'{base_url}/library/metadata/{show_key}/children', params={}).json()['MediaContainer']['Metadata']
+		seasons = plex_metadata.get_children(ssn, base_url, show_key)
 		
 		for season in seasons:
 			season_key = season['ratingKey']
-			episodes = ssn.get(f'{base_url}/library/metadata/{season_key}/children', params={}).json()['MediaContainer']['Metadata']
+			episodes = plex_metadata.get_children(ssn, base_url, season_key)
 			
 			for episode in episodes:
 				if episode.get('viewCount', 0) > 0:
@@ -1218,40 +1176,49 @@ def reset_watched_status(ssn):
 					mark_as_unwatched(ssn, episode['ratingKey'])
 
 def my_tv_station(ssn, args):
-	# Convert to dict and filter out None values
-	args_dict = {k: v for k, v in vars(args).items() if v is not None}
+	run = PLEX_GLOBALS['run']
 
 	# Initialize global variables
-	load_globals(ssn)
-	
-	# Get series and playlist information
-	get_series_globals()
-	get_playlist_globals()
+	with run_log.phase(run, 'load_globals'):
+		load_globals(ssn)
+		
+		# Get series and playlist information
+		get_series_globals()
+		get_playlist_globals()
 	
 	# If reset flag is set, reset watched status and return
 	if args.reset:
 		log_message("## **Resetting watched status**")
 		log_message("--------------------------")
-		reset_watched_status(ssn)
+		with run_log.phase(run, 'reset'):
+			reset_watched_status(ssn)
 		log_message("\n## **Reset complete**\n")
 		return None
 	
 	# Build the playlist
-	build_series_episodes(ssn)
+	with run_log.phase(run, 'build_series'):
+		build_series_episodes(ssn)
 	# In comfort mode, skip movies entirely
 	if PLEX_GLOBALS.get('genre') != 'comfort':
-		build_movie_list(ssn)
-	build_playlist_episode_keys()
+		with run_log.phase(run, 'build_movies'):
+			build_movie_list(ssn)
+	with run_log.phase(run, 'build_playlist'):
+		build_playlist_episode_keys(ssn)
+
+	series_episodes = PLEX_GLOBALS['series_episodes']
+	run['items'] = {
+		'series': len(series_episodes) - ('movies' in series_episodes),
+		'movies': len(series_episodes.get('movies', ())),
+		'playlist_episodes': len(PLEX_GLOBALS['playlist_episode_keys'])
+	}
 
 	# Check if any media is being watched
 	if is_media_being_watched(ssn):
-		log_cron_message(PLEX_GLOBALS['log_file'], args_dict, "Playlist update skipped - media is currently being watched")
 		return None
-	else:
-		log_cron_message(PLEX_GLOBALS['log_file'], args_dict)
 
 	# Update the playlist
-	return replace_playlist_items(ssn)
+	with run_log.phase(run, 'update_playlist'):
+		return replace_playlist_items(ssn)
 
 def find_index(lst, predicate):
 	"""
@@ -1259,40 +1226,6 @@ def find_index(lst, predicate):
 	"""
 	return next((i for i, x in enumerate(lst) if predicate(x)), -1)
 
-def clean_restricted_play_months():
-	"""
-	Cleans the restricted_play_months dictionary to ensure all keys are valid month names in lowercase.
-	This function validates the month names in the restricted_play_months configuration and ensures they are in lowercase.
-	It also ensures that the values are lists, defaulting to empty lists if not.
-	This is used to restrict certain movies to only play during specific months of the year.
-	"""
-	valid_months = [
-		"january", "february", "march", "april", "may", "june",
-		"july", "august", "september", "october", "november", "december"
-	]
-	
-	validated_months = {}
-	
-	# Process each month in the input dictionary
-	for month, slugs in PLEX_GLOBALS['restricted_play_months'].items():
-		# Convert month to lowercase
-		month_lower = month.lower()
-		
-		# Check if it's a valid month
-		if month_lower in valid_months:
-			# Ensure slugs is a list
-			slugs_list = slugs if isinstance(slugs, list) else []
-			validated_months[month_lower] = slugs_list
-		else:
-			log_message(f"Warning: Invalid month '{month}' in restricted_play_months. Skipping...")
-	
-	# Add any missing months with empty lists
-	for month in valid_months:
-		if month not in validated_months:
-			validated_months[month] = []
-	
-	return validated_months
-
 def filter_common_words(slug):
 	"""
 	Filters out common words from a slug.
@@ -1300,23 +1233,22 @@ def filter_common_words(slug):
 	"""
 	return list(filter(lambda x: x != 'the' and x != 'a' and x != 'an', slug.split('-')))
 
+def is_restricted_this_month(media_slug):
+	"""
+	Checks whether a slug contains a partial slug that restrictedPlayMonths limits to another month.
+	"""
+	pattern = PLEX_GLOBALS['restricted_slug_pattern']
+	return pattern is not None and pattern.search(media_slug) is not None
+
 def determine_franchise(media_slug):
 	"""
 	Determine the franchise of a media item based on its slug.
+	Franchises come from the slug index when it matches the current config, and are resolved once per slug otherwise.
 	"""
-	for item in PLEX_GLOBALS['metadata']:
-		if item.get('slug') == media_slug and item.get('franchise'):
-			return create_slug(item['franchise'])
-	
-	for f in PLEX_GLOBALS['known_franchises']:
-		# if the franchise appears at the beginning of the slug with a dash afterwards,
-		# the end of the slug with a dash before it,
-		# or in the middle of the slug with dashes before and after it,
-		# then return the franchise slug
-		if media_slug.startswith(f'{f}-') or f'-{f}-' in media_slug or media_slug.endswith(f'-{f}'):
-			return create_slug(f)
-	
-	return None
+	franchise_by_slug = PLEX_GLOBALS['franchise_by_slug']
+	if media_slug not in franchise_by_slug:
+		franchise_by_slug[media_slug] = resolve_franchise(media_slug, PLEX_GLOBALS['metadata'], PLEX_GLOBALS['known_franchises'])
+	return franchise_by_slug[media_slug]
 
 # ------------------------------------------
 # Main
@@ -1343,18 +1275,41 @@ def run_tvstation(args, file_location):
 	with open(PLEX_GLOBALS['log_file'], 'w') as f:
 		f.write(f"# {PLEX_GLOBALS['playlist_name']} Log\n\nCreated at {time.strftime('%Y-%m-%d %H:%M:%S')}\n\n")
 
+	# Report local_config.json problems found when it was compiled
+	for problem in PLEX_GLOBALS['config_problems']:
+		log_message(f"Warning: {problem}")
+
 	#setup vars
 	ssn = requests.Session()
 	ssn.headers.update({'Accept': 'application/json'})
 	ssn.params.update({'X-Plex-Token': PLEX_GLOBALS['plex_api_token']})
 
+	# Time the run and count its Plex requests for logs/runs.jsonl
+	run = run_log.start_run(log_dir, 'tvstation', vars(args), station=PLEX_GLOBALS['playlist_name'])
+	run_log.count_session_requests(run, ssn, 'plex')
+	PLEX_GLOBALS['run'] = run
+
 	#call function and process result
-	response = my_tv_station(ssn=ssn, args=args)
+	try:
+		response = my_tv_station(ssn=ssn, args=args)
+	except Exception as e:
+		run_log.finish_run(run, 'error', f"{type(e).__name__}: {e}")
+		raise
+
+	# Persist the library crawl so the next station or report can reuse it
+	plex_metadata.save_metadata_cache()
 
 	# If the response is None, the playlist was not updated
 	if response is None:
 		log_message("## **Playlist not updated**\n")
+		if args.reset:
+			run_log.finish_run(run, 'reset')
+		else:
+			run_log.finish_run(run, 'skipped', "Playlist update skipped - media is currently being watched")
 	elif response.status_code != 200:
 		log_message("## **ERROR: Playlist could not be updated!**\n")
-	elif not args.log_only:
-		log_message(f'## **Playlist {PLEX_GLOBALS["playlist_name"]} updated successfully!**\n')
+		run_log.finish_run(run, 'error', f"Playlist update failed with HTTP {response.status_code}")
+	else:
+		if not args.log_only:
+			log_message(f'## **Playlist {PLEX_GLOBALS["playlist_name"]} updated successfully!**\n')
+		run_log.finish_run(run, 'updated')
@@ -1,8 +1,11 @@
+import hashlib
 import json
 import re
 import socket
 import requests
 import sys
+import threading
+from functools import lru_cache
 
 # Load genre mappings from file
 GENRE_MAPPINGS_PATH = '/home/rob/repos/plex-tvstation/src/genre_mappings.json'
@@ -12,6 +15,10 @@ try:
 except Exception:
 	GENRE_MAPPINGS = {}
 
+# Bit assigned to each normalized genre name, in order of first use within the process
+GENRE_BITS = {}
+_genre_bits_lock = threading.Lock()
+
 def clean_genre_string(genres):
 	genre_string = None
 	if isinstance(genres, str):
@@ -34,6 +41,38 @@ def clean_genre_string(genres):
 	return ''.join(c.lower() if c.isalnum() or c in ' ,-' else '' for c in genre_string).strip()
 
 
+def get_genre_key(genres):
+	"""
+	Returns a hashable key for a genre input (a string, a list of strings, a list of Plex tag objects, or None),
+	so that identical genre lists are normalized only once.
+	"""
+	if genres is None:
+		return None
+	if isinstance(genres, str):
+		return genres
+	if isinstance(genres, list) and all(isinstance(g, dict) and 'tag' in g for g in genres):
+		return tuple(g['tag'] for g in genres)
+	if isinstance(genres, list) and all(isinstance(g, str) for g in genres):
+		return tuple(genres)
+	raise TypeError(f'Unsupported genre input: {genres!r}')
+
+@lru_cache(maxsize=None)
+def normalize_genres(genre_key):
+	"""
+	Normalizes a genre key from get_genre_key into a frozenset of short genre names. Memoized.
+	"""
+	if genre_key is None:
+		return frozenset()
+
+	# get cleaned comma separated genres
+	genre_string = clean_genre_string(genre_key if isinstance(genre_key, str) else list(genre_key))
+
+	# map genres to consistent short forms
+	mapped_parts = {GENRE_MAPPINGS.get(part.strip(), part.strip()) for part in genre_string.split(',')}
+
+	# remove empty strings
+	return frozenset(part for part in mapped_parts if part is not None and part != '')
+
 def build_genres_set(genres):
 	"""
 	Cleans a genre input which can be a string, list of strings, or None.
@@ -41,22 +80,73 @@ def build_genres_set(genres):
 	2. If a string, processes it by replacing 'and' or '&' with a comma, removing non-alphanumeric characters (except spaces and commas), and splitting by commas.
 	3. If a list of strings, processes each string individually.
 	4. Maps fully spelled out genres to their short forms if present.
+	The normalization is memoized on the input, so repeated genre lists cost a dictionary lookup.
 	"""
-	if genres is None:
-		return set()
+	return set(normalize_genres(get_genre_key(genres)))
 
+def get_genre_bit(genre):
+	"""
+	Returns the bitmask bit of a normalized genre name, assigning the next free bit on first use.
+	Bits are only meaningful within one process and must not be persisted.
+	"""
+	bit = GENRE_BITS.get(genre)
+	if bit is None:
+		with _genre_bits_lock:
+			bit = GENRE_BITS.setdefault(genre, 1 << len(GENRE_BITS))
+	return bit
 
-	# get cleaned comma separated genres
-	genre_string = clean_genre_string(genres)
+@lru_cache(maxsize=None)
+def get_genre_mask_for_key(genre_key):
+	"""
+	Returns the genre bitmask for a genre key from get_genre_key. Memoized.
+	"""
+	mask = 0
+	for genre in normalize_genres(genre_key):
+		mask |= get_genre_bit(genre)
+	return mask
 
-	# map genres to consistent short forms
-	mapped_parts = {GENRE_MAPPINGS.get(part.strip(), part.strip()) for part in genre_string.split(',')}
+def get_genre_mask(genres):
+	"""
+	Returns an integer with the bit of every genre in a genre input set, so genre filters are a bitwise AND.
+	"""
+	return get_genre_mask_for_key(get_genre_key(genres))
 
-	# remove empty strings
-	mapped_parts = {part for part in mapped_parts if part is not None and part != ''}
+def create_slug(title):
+	"""
+	Creates a slug from a title by converting to lowercase, replacing spaces with dashes,
+	and removing any characters that are not letters or dashes.
+	"""
+	if title is None:
+		return None
+	
+	slug = re.sub(r'[^a-z0-9-]', '', re.sub(' ', '-', title.lower())).strip()
+	return slug
 
-	# return as a set
-	return mapped_parts
+def resolve_franchise(media_slug, metadata, known_franchises):
+	"""
+	Determine the franchise of a media item from its slug, the local_config.json metadata and the known franchise slugs.
+	"""
+	for item in metadata:
+		if item.get('slug') == media_slug and item.get('franchise'):
+			return create_slug(item['franchise'])
+	
+	for f in known_franchises:
+		# if the franchise appears at the beginning of the slug with a dash afterwards,
+		# the end of the slug with a dash before it,
+		# or in the middle of the slug with dashes before and after it,
+		# then return the franchise slug
+		if media_slug.startswith(f'{f}-') or f'-{f}-' in media_slug or media_slug.endswith(f'-{f}'):
+			return create_slug(f)
+	
+	return None
+
+def get_franchise_config_hash(metadata, known_franchises):
+	"""
+	Returns a hash of the configuration that franchise resolution depends on,
+	so precomputed franchises can be checked against the current local_config.json.
+	"""
+	config = json.dumps([metadata, known_franchises], sort_keys=True, ensure_ascii=False)
+	return hashlib.sha1(config.encode('utf-8')).hexdigest()
 
 def get_nested_json_value(response, keys, default={}):
 	json_data = response.json()
@@ -0,0 +1,64 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from library_scanner import parse_episode_numbers, scan_show
+
+
+def make_show(tmp_path, seasons):
+	show_path = tmp_path / 'Show'
+	for season, filenames in seasons.items():
+		season_path = show_path / season
+		season_path.mkdir(parents=True)
+		for filename in filenames:
+			(season_path / filename).touch()
+	return show_path
+
+
+def test_season_markers():
+	assert parse_episode_numbers('Show - S01E05 - Title') == ([5], False)
+	assert parse_episode_numbers('Show 2x07') == ([7], False)
+	assert parse_episode_numbers('Show - S01E01-E03') == ([1, 2, 3], False)
+
+
+def test_episode_words_are_season_markers():
+	assert parse_episode_numbers('Show - Episode 5') == ([5], False)
+	assert parse_episode_numbers('Ep 05') == ([5], False)
+
+
+def test_codec_is_not_an_episode():
+	assert parse_episode_numbers('Show 2x264') == ([], False)
+	assert parse_episode_numbers('Show - S01E04 - Title x265') == ([4], False)
+
+
+def test_numbers_in_titles_are_not_absolute():
+	assert parse_episode_numbers('Show - Catch 22') == ([], False)
+	assert parse_episode_numbers('Show - The 4400 Return') == ([], False)
+	assert parse_episode_numbers('Apollo 13 Story') == ([], False)
+
+
+def test_absolute_numbers_in_leading_or_separator_position():
+	assert parse_episode_numbers('057 - Title') == ([57], True)
+	assert parse_episode_numbers('Show - 057 - Title') == ([57], True)
+	assert parse_episode_numbers('Show - 057') == ([57], True)
+	assert parse_episode_numbers('Show - 1999 - Title') == ([], False)
+
+
+def test_absolute_numbers_used_when_most_files_lack_markers(tmp_path):
+	show_path = make_show(tmp_path, {
+		'Season 1': ['Show - 001 - Pilot.mkv', 'Show - 002 - Second.mkv', 'Show - S01E03 - Third.mkv']
+	})
+	show = scan_show(show_path)
+	assert show['absolute'] == {1, 2}
+	assert show['seasons'][1] == {3}
+
+
+def test_absolute_numbers_ignored_when_most_files_have_markers(tmp_path):
+	show_path = make_show(tmp_path, {
+		'Season 1': ['Show - S01E01 - Pilot.mkv', 'Show - S01E02 - Second.mkv'],
+		'Season 2': ['Show - 24 - Hours.mkv']
+	})
+	show = scan_show(show_path)
+	assert show['absolute'] == set()
+	assert show['seasons'] == {1: {1, 2}, 2: set()}
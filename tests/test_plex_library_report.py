@@ -0,0 +1,41 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import plex_library_report
+
+
+def make_folders(directory, *names):
+	for name in names:
+		(directory / name).mkdir()
+
+
+def test_same_title_movies_match_their_own_year(tmp_path):
+	make_folders(tmp_path, 'Dune (1984)', 'Dune (2021)')
+	plex_library_report.FOLDER_INDEXES.clear()
+
+	assert plex_library_report.find_media_folder(tmp_path, 'Dune', 1984) == str(tmp_path / 'Dune (1984)')
+	assert plex_library_report.find_media_folder(tmp_path, 'Dune', 2021) == str(tmp_path / 'Dune (2021)')
+
+
+def test_movie_does_not_take_a_folder_from_another_year(tmp_path):
+	make_folders(tmp_path, 'The Thing (1982)', 'The Things We Said (2011)')
+	plex_library_report.FOLDER_INDEXES.clear()
+
+	assert plex_library_report.find_media_folder(tmp_path, 'The Thing', 2011) is None
+	assert plex_library_report.find_media_folder(tmp_path, 'The Thing: Prequel', 2011) is None
+
+
+def test_movie_matches_a_folder_without_a_year(tmp_path):
+	make_folders(tmp_path, 'Heat')
+	plex_library_report.FOLDER_INDEXES.clear()
+
+	assert plex_library_report.find_media_folder(tmp_path, 'Heat', 1995) == str(tmp_path / 'Heat')
+
+
+def test_show_matches_regardless_of_year(tmp_path):
+	make_folders(tmp_path, 'Doctor Who 2005-')
+	plex_library_report.FOLDER_INDEXES.clear()
+
+	assert plex_library_report.find_media_folder(tmp_path, 'Doctor Who') == str(tmp_path / 'Doctor Who 2005-')
@@ -0,0 +1,73 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import plex_metadata
+
+BASE_URL = 'http://plex'
+
+
+class FakeResponse:
+	def __init__(self, items):
+		self.items = items
+
+	def raise_for_status(self):
+		pass
+
+	def json(self):
+		return {'MediaContainer': {'Metadata': self.items}}
+
+
+class FakeSession:
+	"""Serves a show with one season of two episodes and records every request."""
+
+	def __init__(self):
+		self.requests = []
+		self.episode_views = {'3': 1, '4': 0}
+
+	def get(self, url, params=None):
+		self.requests.append(url)
+		if url.endswith('/library/metadata/1/children'):
+			viewed = sum(1 for count in self.episode_views.values() if count)
+			return FakeResponse([{'ratingKey': '2', 'leafCount': 2, 'viewedLeafCount': viewed}])
+		if url.endswith('/library/metadata/2/children'):
+			return FakeResponse([{'ratingKey': key, 'viewCount': count} for key, count in self.episode_views.items()])
+		return FakeResponse([])
+
+
+def start_crawl(monkeypatch, tmp_path):
+	monkeypatch.setattr(plex_metadata, 'CACHE_FILE', tmp_path / 'plex_metadata.json')
+	monkeypatch.setattr(plex_metadata, '_cache_loaded', False)
+	monkeypatch.delenv('plex_crawl_session', raising=False)
+	plex_metadata.load_metadata_cache()
+
+
+def test_unscrobbled_episode_refetches_season_and_show_listings(monkeypatch, tmp_path):
+	start_crawl(monkeypatch, tmp_path)
+	ssn = FakeSession()
+
+	assert plex_metadata.get_children(ssn, BASE_URL, '1')[0]['viewedLeafCount'] == 1
+	assert plex_metadata.get_children(ssn, BASE_URL, '2')[0]['viewCount'] == 1
+	assert len(ssn.requests) == 2
+
+	# Unscrobble episode 3 on the server, then invalidate it as tvstation.mark_as_unwatched does
+	ssn.episode_views['3'] = 0
+	plex_metadata.invalidate('3')
+
+	assert plex_metadata.get_children(ssn, BASE_URL, '2')[0]['viewCount'] == 0
+	assert plex_metadata.get_children(ssn, BASE_URL, '1')[0]['viewedLeafCount'] == 0
+	assert len(ssn.requests) == 4
+
+
+def test_invalidate_keeps_unrelated_listings(monkeypatch, tmp_path):
+	start_crawl(monkeypatch, tmp_path)
+	ssn = FakeSession()
+	plex_metadata.get_children(ssn, BASE_URL, '1')
+	plex_metadata.get_children(ssn, BASE_URL, '2')
+	plex_metadata.get_children(ssn, BASE_URL, '9')
+
+	plex_metadata.invalidate('3')
+
+	plex_metadata.get_children(ssn, BASE_URL, '9')
+	assert len(ssn.requests) == 3
@@ -2,6 +2,9 @@
 
 # $1 is the log-only flag (-l)
 
+# Share one Plex library crawl across all stations (reuses the pipeline's crawl when called from full_update.sh)
+export plex_crawl_session="${plex_crawl_session:-tv-$(date +%s)}"
+
 # All media tv station
 python3 src/main.py tvstation $1
 
@@ -11,14 +11,14 @@ python3 src/markdown_to_html.py
 # Ensure we're on the main branch
 git checkout main
 
-# Check if there are any changes in the web/ or cache/ folders
-if git diff --quiet --exit-code web/ cache/; then
+# Check if there are any changes in the web/ folder. cache/ is local state and is not committed
+if git diff --quiet --exit-code web/; then
 	# No changes, exit silently
 	exit 0
 fi
 
-# Stage all changes in the web/ and cache/ folders
-git add web/ cache/
+# Stage all changes in the web/ folder
+git add web/
 
 # Create a commit with a timestamp
 COMMIT_MSG="Update web files - $(date '+%Y-%m-%d %H:%M:%S')"